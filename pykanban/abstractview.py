@@ -1,6 +1,7 @@
 from pykanban.kanban import KanbanBoard, KanbanItem
 from PySide2.QtWidgets import QWidget, QFrame
 from pykanban.kanbanwidget import KanbanWidget
+from pykanban.query import Query
 from typing import *
 
 
@@ -28,43 +29,43 @@ class AbstractView(QWidget):
         """
         return self.findChildren(KanbanWidget)
 
-    def filterChanged(self, text: str) -> None:
+    def filterChanged(self, query: Union[str, Query]) -> None:
         """
         Update the filter, change the matching items, focus on them, etc
-        Handles things like incremental searching(that is, only checking the items that match)
 
-        :param text: The query text
+        :param query: The query, either as text or compiled once for all the views
         """
-
-        # In general, if the text is empty, then marking the widget as being the matching item isn't desirable
-        if text == '':
+        if isinstance(query, str):
+            query = Query.parse(query)
+        # In general, if the query is empty, then marking the widget as being the matching item isn't desirable
+        if query.is_empty():
             if self.currentSearchResult():
                 self.currentSearchResult().set_selected(False)
             self.last_filter = ''
             return
-        # Things to consider here if it ever proves too slow. There are a couple of improvements that can be
-        # applied relatively easily:
-        # 1. Make self.matching a set
-        # 2. If self.last_filter is a prefix of text, then you can search the current results instead
-        if text != self.last_filter:
+        # The board evaluates the query against its indexes and keeps the
+        # result, which is shared between all of the views, so all that
+        # is left here is picking out the widgets.
+        if query.text != self.last_filter:
             if self.matching:
                 self.apply_unselected_styling(self.currentSearchResult())
-            if self.last_filter and text.startswith(self.last_filter):
-                r = []
-                for i in self.matching:
-                    if i.item.matches(text):
-                        r.append(i)
-                self.matching = r
-            else:
-                self.matching.clear()
-                for i in self.get_eligible_widgets():
-                    if i.item.matches(text):
-                        self.matching.append(i)
-            self.last_filter = text
+            matches = self.board.matching_set(query)
+            self.page_in(matches)
+            self.matching = [i for i in self.get_eligible_widgets() if i.item in matches]
+            self.last_filter = query.text
             self.search_index = -1
         if self.matching:
             self.advance_search()
 
+    def page_in(self, matches: Container[KanbanItem]) -> None:
+        """
+        Make sure every matching item has a widget, for views that only make
+        them as they are scrolled to
+
+        :param matches: The items matching the search
+        """
+        pass
+
     def scroll_to_result(self, item: KanbanWidget) -> None:
         """
         Ensure the relevant widget is in the view
@@ -0,0 +1,367 @@
+from __future__ import annotations
+from typing import *
+from array import array
+from collections.abc import Sequence
+from functools import partial
+from itertools import accumulate
+import json
+import mmap
+import struct
+import sys
+
+if TYPE_CHECKING:
+    from pykanban.kanban import KanbanBoard
+    from pykanban.store import BoardStore
+
+#: The extension of boards saved in the binary format
+BINARY_EXTENSION = '.kbb'
+#: The version of the layout written, files from later versions aren't read
+FORMAT_VERSION = 1
+
+_MAGIC = b'KBRD'
+#: Magic, version, flags, then the number of items, strings, dependencies,
+#: item categories and blobs, then the offset of each section
+_HEADER = struct.Struct('<4sHHIIIII7Q')
+#: The id, name and description as string indices, the priority, whether
+#: it's completed, then the first and count of its dependencies and of its
+#: categories
+_ITEM = struct.Struct('<IIIBBxxIIII')
+_OFFSET = struct.Struct('<Q')
+
+
+def is_binary_file(filename: str) -> bool:
+    """
+    Whether a file, or its backup, is a board saved in the binary format
+    """
+    return filename.endswith(BINARY_EXTENSION) or filename.endswith(BINARY_EXTENSION + '.bak')
+
+
+def _pad(size: int) -> int:
+    return -size % 8
+
+
+def _little_endian(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _read_array(typecode: str, data: Union[bytes, mmap.mmap], offset: int, count: int) -> array:
+    result = array(typecode)
+    result.frombytes(data[offset:offset + count * result.itemsize])
+    if sys.byteorder == 'big':
+        result.byteswap()
+    return result
+
+
+class MappedStrings(Sequence):
+    """
+    One of the strings of every item in a :class:`BinaryBoardFile`, such as
+    their names, each decoded from the file when it is accessed
+    """
+    file: BinaryBoardFile
+    #: Which string of the item record, 0 for the id, 1 for the name and 2
+    #: for the description
+    field: int
+    __slots__ = ('file', 'field')
+
+    def __init__(self, file: BinaryBoardFile, field: int):
+        self.file = file
+        self.field = field
+
+    def __len__(self) -> int:
+        return self.file.item_count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        return self.file.string(self.file._record(index)[self.field])
+
+
+class BinaryBoardFile:
+    """
+    A board saved in a compact binary layout, which is, in order
+
+    * A header with a magic number, the :data:`FORMAT_VERSION`, the size of
+      each section and where it starts
+    * A string table, as the offset of each string followed by all of the
+      strings in UTF-8, each followed by a NUL. The first string is the
+      board's own settings as JSON, and each category name is only stored
+      once
+    * A fixed width record for each item, see :data:`_ITEM`
+    * The dependencies of all of the items, as item indices, in the order
+      of the items
+    * The categories of all of the items, as string indices, in the order
+      of the items
+    * A blob table holding each distinct icon once, laid out like the
+      string table
+
+    Every number is little endian and each section starts on a multiple of
+    eight bytes. Nothing in it names a Python module, so unlike a pickle it
+    can be read by other programs, and opening it runs no code.
+
+    Opening a file maps it into memory and only reads the header, after
+    which the ids and names of items can be read one at a time, see
+    :meth:`name`, or the file can be viewed as a read only store, see
+    :meth:`store`. :meth:`load` reads the whole board.
+    """
+    filename: str
+    #: The file contents, mapped into memory
+    data: mmap.mmap
+    version: int
+    item_count: int
+    string_count: int
+    edge_count: int
+    category_count: int
+    blob_count: int
+    _string_offsets: int
+    _string_data: int
+    _items: int
+    _edges: int
+    _categories: int
+    _blob_offsets: int
+    _blob_data: int
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        with open(filename, 'rb') as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._read_header(self.data)
+
+    def _read_header(self, data: Union[bytes, mmap.mmap]) -> None:
+        if len(data) < _HEADER.size:
+            raise ValueError(f"{self.filename} is too short to be a board")
+        (magic, self.version, _, self.item_count, self.string_count, self.edge_count, self.category_count,
+         self.blob_count, self._string_offsets, self._string_data, self._items, self._edges,
+         self._categories, self._blob_offsets, self._blob_data) = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.filename} is not a board in the binary format")
+        if self.version > FORMAT_VERSION:
+            raise ValueError(f"{self.filename} is from a later version, {self.version}, "
+                             f"only up to {FORMAT_VERSION} can be read")
+
+    def __len__(self) -> int:
+        return self.item_count
+
+    def string(self, index: int) -> str:
+        """
+        Read one string from the string table
+        """
+        start, end = struct.unpack_from('<2Q', self.data, self._string_offsets + index * _OFFSET.size)
+        return self.data[self._string_data + start:self._string_data + end - 1].decode()
+
+    def _record(self, index: int) -> Tuple[int, ...]:
+        if not 0 <= index < self.item_count:
+            raise IndexError(index)
+        return _ITEM.unpack_from(self.data, self._items + index * _ITEM.size)
+
+    def name(self, index: int) -> str:
+        """
+        Read the name of an item without reading anything else about it
+
+        :param index: The position of the item on the board
+        """
+        return self.string(self._record(index)[1])
+
+    def item_id(self, index: int) -> str:
+        """
+        Read the id of an item without reading anything else about it
+
+        :param index: The position of the item on the board
+        """
+        return self.string(self._record(index)[0])
+
+    def names(self) -> Iterator[str]:
+        """
+        The name of each item, in order, read as they are needed
+        """
+        return map(self.name, range(self.item_count))
+
+    def blob(self, index: int) -> bytes:
+        """
+        Read one icon from the blob table
+        """
+        start, end = struct.unpack_from('<2Q', self.data, self._blob_offsets + index * _OFFSET.size)
+        return self.data[self._blob_data + start:self._blob_data + end]
+
+    def store(self) -> BoardStore:
+        """
+        View the board as a read only :class:`pykanban.store.BoardStore`.
+        The numbers in the item records are read into the store's columns,
+        but the ids, names and descriptions are left in the file until they
+        are accessed, see :class:`MappedStrings`, as are the icons until they
+        are shown.
+
+        :returns: The store, which keeps the file open
+        """
+        from pykanban.store import BoardStore
+        from pykanban.taskcategory import CategoryData
+        store = BoardStore()
+        store.ids = MappedStrings(self, 0)
+        store.names = MappedStrings(self, 1)
+        store.descriptions = MappedStrings(self, 2)
+        data = self.data
+        # The dependencies and categories are stored in item order, so each
+        # item's end is the next one's start
+        category_numbers: Dict[int, int] = dict()
+        for (_, _, _, priority, completed, first_edge, edge_count, first_category,
+             category_count) in _ITEM.iter_unpack(data[self._items:self._items + self.item_count * _ITEM.size]):
+            store.priority.append(priority)
+            store.completed.append(completed)
+            store.dep_offsets.append(first_edge + edge_count)
+            store.cat_offsets.append(first_category + category_count)
+        store.dep_indices = array('l', _read_array('I', data, self._edges, self.edge_count))
+        for i in _read_array('I', data, self._categories, self.category_count):
+            number = category_numbers.get(i)
+            if number is None:
+                number = category_numbers[i] = store._intern(self.string(i))
+            store.cat_indices.append(number)
+        store._finish()
+        settings = json.loads(self.string(0))
+        for name, style in settings['category_data'].items():
+            category = store.category_data[name] = CategoryData(style['foreground'], style['background'])
+            if 'icon' in style:
+                category._load_icon = partial(self.blob, style['icon'])
+        store.categories = set(settings['categories'])
+        store.filename = settings['filename']
+        store.view_settings = settings['view_settings']
+        store.read_only = True
+        return store
+
+    def close(self) -> None:
+        self.data.close()
+
+    @staticmethod
+    def write(board: KanbanBoard, filename: str) -> None:
+        """
+        Save a board in the binary format
+
+        :param board: The board to save
+        :param filename: Where to save it
+        """
+        from pykanban.kanban import SCHEMA_VERSION
+        items = list(board.items)
+        positions = {item: n for n, item in enumerate(items)}
+        strings: List[str] = ['']
+        shared: Dict[str, int] = dict()
+        records = bytearray()
+        edges = array('I')
+        item_categories = array('I')
+        pack = _ITEM.pack
+        for item in items:
+            first_string = len(strings)
+            strings += (item.id, item.name, item.description)
+            first_edge, first_category = len(edges), len(item_categories)
+            # Dependencies on items that aren't on the board can't be saved
+            edges.extend(positions[d] for d in item.depends_on if d in positions)
+            for c in item.category:
+                index = shared.get(c)
+                if index is None:
+                    index = shared[c] = len(strings)
+                    strings.append(c)
+                item_categories.append(index)
+            records += pack(first_string, first_string + 1, first_string + 2, int(item.priority),
+                            item.completed, first_edge, len(edges) - first_edge,
+                            first_category, len(item_categories) - first_category)
+        blobs: List[bytes] = []
+        blob_index: Dict[str, int] = dict()
+        category_data = {}
+        for name, data in board.category_data.items():
+            encoded: Dict[str, Any] = {'foreground': data.foreground, 'background': data.background}
+            blob = data.icon_blob
+            if blob is not None:
+                if blob.digest not in blob_index:
+                    blob_index[blob.digest] = len(blobs)
+                    blobs.append(blob.data)
+                encoded['icon'] = blob_index[blob.digest]
+            category_data[name] = encoded
+        strings[0] = json.dumps({'categories': list(board.categories), 'category_data': category_data,
+                                 'filename': board.filename, 'view_settings': board.view_settings,
+                                 'schema_version': SCHEMA_VERSION})
+
+        encoded_strings = [i.encode() + b'\0' for i in strings]
+        string_offsets = array('Q', accumulate(map(len, encoded_strings), initial=0))
+        blob_offsets = array('Q', accumulate(map(len, blobs), initial=0))
+        sections = [_little_endian(string_offsets), b''.join(encoded_strings), bytes(records),
+                    _little_endian(edges), _little_endian(item_categories), _little_endian(blob_offsets),
+                    b''.join(blobs)]
+        offsets = []
+        position = _HEADER.size + _pad(_HEADER.size)
+        for section in sections:
+            offsets.append(position)
+            position += len(section) + _pad(len(section))
+        header = _HEADER.pack(_MAGIC, FORMAT_VERSION, 0, len(items), len(strings), len(edges),
+                              len(item_categories), len(blobs), *offsets)
+        with open(filename, 'wb') as f:
+            f.write(header + bytes(_pad(len(header))))
+            for section in sections:
+                f.write(section)
+                f.write(bytes(_pad(len(section))))
+
+    @staticmethod
+    def load(filename: str) -> KanbanBoard:
+        """
+        Read a whole board saved in the binary format
+
+        :param filename: The file to read
+        :returns: The board
+        """
+        from pykanban.kanban import KanbanBoard, KanbanItem, Priority
+        from pykanban.taskcategory import CategoryData, IconBlob
+        with open(filename, 'rb') as f:
+            data = f.read()
+        self = BinaryBoardFile.__new__(BinaryBoardFile)
+        self.filename = filename
+        self._read_header(data)
+        offsets = _read_array('Q', data, self._string_offsets, self.string_count + 1)
+        text = data[self._string_data:self._string_data + offsets[-1]]
+        # Splitting on the NULs is far quicker than cutting each string out,
+        # unless a string holds a NUL itself, which the count gives away
+        strings = text.decode().split('\0')
+        strings.pop()
+        if len(strings) != self.string_count:
+            strings = [text[a:b - 1].decode() for a, b in zip(offsets, offsets[1:])]
+        edges = _read_array('I', data, self._edges, self.edge_count)
+        item_categories = _read_array('I', data, self._categories, self.category_count)
+
+        board = KanbanBoard()
+        priorities = {int(i): i for i in Priority}
+        new = KanbanItem.__new__
+        items = []
+        for (item_id, name, description, priority, completed, first_edge, edge_count, first_category,
+             category_count) in _ITEM.iter_unpack(data[self._items:self._items + self.item_count * _ITEM.size]):
+            # Made without __init__, which would generate an id only for it
+            # to be replaced
+            item = new(KanbanItem)
+            item.id = strings[item_id]
+            item._name = strings[name]
+            item._description = strings[description]
+            item._priority = priorities[priority]
+            item._completed = bool(completed)
+            item.depends_on = edges[first_edge:first_edge + edge_count] if edge_count else []
+            item.category = {strings[i] for i in item_categories[first_category:first_category + category_count]} \
+                if category_count else set()
+            item.assigned = None
+            item.board = board
+            item._search_text = None
+            items.append(item)
+        for item in items:
+            if item.depends_on:
+                item.depends_on = [items[i] for i in item.depends_on]
+
+        settings = json.loads(strings[0])
+        blob_offsets = _read_array('Q', data, self._blob_offsets, self.blob_count + 1)
+        for name, style in settings['category_data'].items():
+            category = board.category_data[name] = CategoryData(style['foreground'], style['background'])
+            if 'icon' in style:
+                start, end = blob_offsets[style['icon']], blob_offsets[style['icon'] + 1]
+                category.icon_blob = IconBlob.from_data(data[self._blob_data + start:self._blob_data + end])
+        board.categories = set(settings['categories'])
+        board.filename = settings['filename']
+        board.view_settings = settings['view_settings']
+        board.schema_version = settings['schema_version']
+        board.items = items
+        return board
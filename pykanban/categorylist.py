@@ -3,6 +3,7 @@ from PySide2.QtGui import QBrush, QPixmap
 from PySide2.QtCore import Qt
 from pykanban.kanban import *
 from pykanban.taskcategory import CategoryData
+from pykanban.qtconvert import ColorToTuple, ColorFromTuple, PixmapToPng
 
 
 class CategoryEditor(QDialog):
@@ -13,10 +14,13 @@ class CategoryEditor(QDialog):
     """
     #: The board populated from
     board: KanbanBoard
+    #: The categories whose styling was edited in the dialog
+    changed_categories: Set[str]
 
     def __init__(self, board:KanbanBoard, parent:QWidget=None):
         super(CategoryEditor,self).__init__(parent)
         self.board = board
+        self.changed_categories = set()
         self.grd = QGridLayout()
 
         self.listView = QListWidget()
@@ -88,7 +92,7 @@ class CategoryEditor(QDialog):
             if data is not None:
                 self.clearforeground_button.setEnabled(data.foreground is not None)
                 self.clearbackground_button.setEnabled(data.background is not None)
-                self.clearicon.setEnabled(data.icon is not None)
+                self.clearicon.setEnabled(data.icon_blob is not None)
             else:
                 self.clearforeground_button.setEnabled(False)
                 self.clearbackground_button.setEnabled(False)
@@ -106,14 +110,15 @@ class CategoryEditor(QDialog):
         for i in self.board.categories:
             print(f"Found category {i}")
             item = QListWidgetItem(i,self.listView)
+            item.setToolTip(self.tr("Tasks: ") + str(self.board.category_count(i)))
             if i in self.board.category_data.keys():
                 data = copy(self.board.category_data[i])
                 brush = QBrush()
                 brush.setStyle(Qt.SolidPattern)
                 if data.foreground is not None:
-                    item.setTextColor(data.foreground)
+                    item.setTextColor(ColorFromTuple(data.foreground))
                 if data.background is not None:
-                    brush.setColor(data.background)
+                    brush.setColor(ColorFromTuple(data.background))
                     item.setBackground(brush)
                 item.setData(32,data)
 
@@ -136,16 +141,17 @@ class CategoryEditor(QDialog):
         item = self.listView.selectedItems()[0]
         data = item.data(32)
         initialColor = None
-        if data is not None:
-            initialColor = data.foreground
+        if data is not None and data.foreground is not None:
+            initialColor = ColorFromTuple(data.foreground)
         color = QColorDialog.getColor(initial=initialColor)
         if color.isValid():
             print(f"Got valid color {color.red()}, {color.green()},{color.blue()}")
+            self.changed_categories.add(item.text())
             item.setTextColor(color)
             data = item.data(32)
             if data is None:
-                data = CategoryData(color, None)
-            data.foreground = color
+                data = CategoryData(ColorToTuple(color), None)
+            data.foreground = ColorToTuple(color)
             item.setData(32, data)
         else:
             print("Got invalid color :(")
@@ -154,6 +160,7 @@ class CategoryEditor(QDialog):
         if 0==len(self.listView.selectedItems()):
             return
         item = self.listView.selectedItems()[0]
+        self.changed_categories.add(item.text())
         item.data(32).foreground=None
         item.setTextColor(self.palette().text().color())
 
@@ -161,6 +168,7 @@ class CategoryEditor(QDialog):
         if 0 == len(self.listView.selectedItems()):
             return
         item = self.listView.selectedItems()[0]
+        self.changed_categories.add(item.text())
         item.data(32).background = None
         item.setBackground(QBrush())
 
@@ -169,15 +177,18 @@ class CategoryEditor(QDialog):
         file = QFileDialog.getOpenFileName(self,"Open Icon","", "Images (*.png *.jpg *.svg)")
         if file[0] == "":
             return
+        self.changed_categories.add(item.text())
         if item.data(32) is None:
             item.setData(32,CategoryData())
         data=item.data(32)
-        data.icon=QPixmap()
-        data.icon.load(file[0])
+        pix = QPixmap()
+        pix.load(file[0])
+        data.icon = PixmapToPng(pix)
         item.setData(32,data)
 
     def clearIconClicked(self):
         item = self.listView.selectedItems()[0]
+        self.changed_categories.add(item.text())
         data = item.data(32)
         data.icon=None
 
@@ -186,18 +197,19 @@ class CategoryEditor(QDialog):
         item = self.listView.selectedItems()[0]
         initialColor=None
         data = item.data(32)
-        if data is not None:
-            initialColor=data.background
+        if data is not None and data.background is not None:
+            initialColor=ColorFromTuple(data.background)
         color = QColorDialog.getColor(initial=initialColor)
         if color.isValid():
             print(f"Got valid color {color.red()}, {color.green()},{color.blue()}")
+            self.changed_categories.add(item.text())
             brush:QBrush = QBrush()
             brush.setColor(color)
             brush.setStyle(Qt.SolidPattern)
             data = item.data(32)
             if data is None:
-                data = CategoryData(None, color)
-            data.background=color
+                data = CategoryData(None, ColorToTuple(color))
+            data.background=ColorToTuple(color)
             item.setData(32,data)
             item.setBackground(brush)
         else:
@@ -226,8 +238,9 @@ class CategoryEditor(QDialog):
             if data is None:
                 continue
             #Clean up unassociated color data.
-            if data.foreground is None and data.background is None and data.icon is None:
-                del self.board.category_data[name]
+            if data.foreground is None and data.background is None and data.icon_blob is None:
+                self.board.category_data.pop(name, None)
             else:
                 self.board.category_data[name]=data
+        self.board.category_styled(self.changed_categories)
         
@@ -0,0 +1,314 @@
+from __future__ import annotations
+from typing import *
+from functools import partial
+from itertools import chain
+import json
+import sqlite3
+
+from pykanban.events import ChangeSet
+
+if TYPE_CHECKING:
+    from pykanban.kanban import KanbanBoard, KanbanItem
+    from pykanban.taskcategory import CategoryData
+
+#: The extension of boards saved as a database
+DATABASE_EXTENSION = '.kbdb'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS board(key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS items(
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    state TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS edges(
+    item TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    dependency TEXT NOT NULL,
+    PRIMARY KEY(item, position));
+CREATE TABLE IF NOT EXISTS categories(name TEXT PRIMARY KEY);
+CREATE TABLE IF NOT EXISTS item_categories(
+    item TEXT NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY(item, category));
+CREATE TABLE IF NOT EXISTS category_styles(
+    category TEXT PRIMARY KEY,
+    foreground TEXT,
+    background TEXT,
+    icon BLOB);
+CREATE INDEX IF NOT EXISTS items_by_state ON items(state);
+CREATE INDEX IF NOT EXISTS items_by_priority ON items(priority);
+CREATE INDEX IF NOT EXISTS edges_by_dependency ON edges(dependency);
+CREATE INDEX IF NOT EXISTS item_categories_by_category ON item_categories(category);
+"""
+
+
+#: The most ids looked up in one query, under SQLite's limit on the
+#: number of parameters in a statement
+_BATCH_SIZE = 500
+
+
+def _select_descriptions(connection: sqlite3.Connection, item_ids: Collection[str]) -> Dict[str, str]:
+    """
+    Read the descriptions of some items, a batch of ids at a time
+    """
+    item_ids = list(item_ids)
+    result = dict()
+    for start in range(0, len(item_ids), _BATCH_SIZE):
+        batch = item_ids[start:start + _BATCH_SIZE]
+        result.update(connection.execute(
+            f"SELECT id, description FROM items WHERE id IN ({', '.join('?' * len(batch))})", batch))
+    return result
+
+
+def is_database_file(filename: str) -> bool:
+    """
+    Whether a file, or its backup, is a board saved as a database
+    """
+    return filename.endswith(DATABASE_EXTENSION) or filename.endswith(DATABASE_EXTENSION + '.bak')
+
+
+class BoardDatabase:
+    """
+    Keeps a board in an SQLite database, with a table each for the items,
+    their dependencies, the categories, the items in each category and the
+    category styling. The items are indexed by state and priority, and the
+    dependencies and categories by what they point to, so that other tools
+    can query the file directly.
+
+    Opening a board reads the names, priorities, categories and dependencies
+    of its items, which is all that is needed to work out their states. The
+    descriptions and the category icons are only read when first needed.
+    After the first save, saving only writes the rows for what changed, in
+    a single transaction.
+    """
+    board: KanbanBoard
+    filename: str
+    connection: sqlite3.Connection
+    #: Items added or edited since the last save, by id
+    _changed: Dict[str, KanbanItem]
+    #: Items removed since the last save, by id
+    _removed: Dict[str, KanbanItem]
+    #: Items whose state may have changed since the last save
+    _states: Set[KanbanItem]
+    #: Categories whose styling changed since the last save
+    _styled: Set[str]
+    #: Whether the database holds the board, so that only changes need writing
+    _written: bool
+    #: The position the next item written is stored at
+    _next_position: int
+
+    def __init__(self, board: KanbanBoard, filename: str):
+        self.board = board
+        self.filename = filename
+        self.connection = sqlite3.connect(filename)
+        self.connection.executescript(_SCHEMA)
+        self._written = False
+        self._next_position = 0
+        self._clear()
+        board.subscribe(self._board_changed)
+
+    def _clear(self) -> None:
+        self._changed = dict()
+        self._removed = dict()
+        self._states = set()
+        self._styled = set()
+
+    def _board_changed(self, changes: ChangeSet) -> None:
+        for i in changes.removed:
+            self._changed.pop(i.id, None)
+            self._removed[i.id] = i
+        for i in chain(changes.added, changes.fields):
+            self._changed[i.id] = i
+            self._removed.pop(i.id, None)
+        self._states |= changes.states
+        self._styled |= changes.styled
+
+    def description(self, item: KanbanItem) -> str:
+        """
+        Read the description of an item
+        """
+        row = self.connection.execute("SELECT description FROM items WHERE id = ?", (item.id,)).fetchone()
+        return row[0] if row is not None else ""
+
+    def descriptions(self, items: Iterable[KanbanItem]) -> Dict[str, str]:
+        """
+        Read the descriptions of many items at once
+
+        :param items: The items
+        :returns: The descriptions the database has, by item id
+        """
+        return _select_descriptions(self.connection, [i.id for i in items])
+
+    @staticmethod
+    def read_descriptions(filename: str, item_ids: Collection[str]) -> Dict[str, str]:
+        """
+        Read the descriptions of some items with a connection of its own,
+        so that it can be used from any thread
+
+        :param filename: The database
+        :param item_ids: The ids of the items
+        :returns: The descriptions the database has, by item id
+        """
+        connection = sqlite3.connect(filename)
+        try:
+            return _select_descriptions(connection, item_ids)
+        finally:
+            connection.close()
+
+    def _icon(self, category: str) -> Optional[bytes]:
+        row = self.connection.execute("SELECT icon FROM category_styles WHERE category = ?",
+                                      (category,)).fetchone()
+        return row[0] if row is not None else None
+
+    def save(self) -> None:
+        """
+        Write what changed since the last save, or the whole board if the
+        database doesn't hold it yet
+        """
+        # Anything the board published that a scheduler hasn't delivered
+        # yet has to be known before writing
+        self.board.events.flush()
+        # An item that is put back later needs its description, which
+        # won't be in the database once its row is gone
+        for i in self._removed.values():
+            i.description
+        with self.connection:
+            if self._written:
+                self._write_changes()
+            else:
+                self._write_all()
+        self._written = True
+        self._clear()
+
+    def _write_all(self) -> None:
+        connection = self.connection
+        for table in ('items', 'edges', 'categories', 'item_categories', 'category_styles'):
+            connection.execute(f"DELETE FROM {table}")
+        items = list(self.board.items)
+        connection.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?)",
+                               ((i.id, position, i.name, i.description, int(i.priority), i.completed,
+                                 i.state().name) for position, i in enumerate(items)))
+        self._next_position = len(items)
+        self._write_links(items)
+        self._write_board()
+        self._write_categories(self.board.category_data)
+
+    def _write_changes(self) -> None:
+        connection = self.connection
+        board = self.board
+        removed = [(i,) for i in self._removed]
+        connection.executemany("DELETE FROM items WHERE id = ?", removed)
+        connection.executemany("DELETE FROM edges WHERE item = ?", removed)
+        connection.executemany("DELETE FROM item_categories WHERE item = ?", removed)
+        changed = list(self._changed.values())
+        for i in changed:
+            if i._description is None:
+                # Never read, so it can't have changed
+                connection.execute("UPDATE items SET name = ?, priority = ?, completed = ? WHERE id = ?",
+                                   (i.name, int(i.priority), i.completed, i.id))
+            else:
+                connection.execute(
+                    "INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET "
+                    "name = excluded.name, description = excluded.description, "
+                    "priority = excluded.priority, completed = excluded.completed",
+                    (i.id, self._next_position, i.name, i.description, int(i.priority), i.completed,
+                     i.state().name))
+                self._next_position += 1
+        connection.executemany("DELETE FROM edges WHERE item = ?", ((i.id,) for i in changed))
+        connection.executemany("DELETE FROM item_categories WHERE item = ?", ((i.id,) for i in changed))
+        self._write_links(changed)
+        states = self._states.union(changed)
+        connection.executemany("UPDATE items SET state = ? WHERE id = ?",
+                               ((i.state().name, i.id) for i in states if board.get_item(i.id) is i))
+        self._write_board()
+        stored = {name for (name,) in connection.execute("SELECT category FROM category_styles")}
+        connection.executemany("DELETE FROM category_styles WHERE category = ?",
+                               ((i,) for i in stored if i not in board.category_data))
+        self._write_categories({i: board.category_data[i] for i in self._styled if i in board.category_data})
+
+    def _write_links(self, items: List[KanbanItem]) -> None:
+        """
+        Write the dependencies and categories of some items
+        """
+        connection = self.connection
+        connection.executemany("INSERT INTO edges VALUES (?, ?, ?)",
+                               ((i.id, position, d.id) for i in items for position, d in enumerate(i.depends_on)))
+        connection.executemany("INSERT INTO item_categories VALUES (?, ?)",
+                               ((i.id, c) for i in items for c in i.category))
+
+    def _write_board(self) -> None:
+        """
+        Write the list of categories and the board's own settings
+        """
+        connection = self.connection
+        board = self.board
+        connection.execute("DELETE FROM categories")
+        connection.executemany("INSERT INTO categories VALUES (?)", ((i,) for i in board.categories))
+        connection.executemany("INSERT OR REPLACE INTO board VALUES (?, ?)",
+                               ((key, json.dumps(value)) for key, value in
+                                (('filename', board.filename), ('view_settings', board.view_settings),
+                                 ('schema_version', board.schema_version))))
+
+    def _write_categories(self, category_data: Dict[str, CategoryData]) -> None:
+        for name, data in category_data.items():
+            colors = (name, json.dumps(data.foreground), json.dumps(data.background))
+            if data._load_icon is not None:
+                # Never read, so it can't have changed
+                self.connection.execute(
+                    "INSERT INTO category_styles(category, foreground, background) VALUES (?, ?, ?) "
+                    "ON CONFLICT(category) DO UPDATE SET "
+                    "foreground = excluded.foreground, background = excluded.background", colors)
+            else:
+                self.connection.execute("INSERT OR REPLACE INTO category_styles VALUES (?, ?, ?, ?)",
+                                        colors + (data.icon,))
+
+    def close(self) -> None:
+        self.board.unsubscribe(self._board_changed)
+        self.connection.close()
+
+    @staticmethod
+    def load(filename: str) -> KanbanBoard:
+        """
+        Open a board, leaving the descriptions and icons to be read when
+        they are needed. The board keeps the database open, and saving it to
+        the same file again only writes what changed.
+
+        :param filename: The file to open
+        :returns: The board
+        """
+        from pykanban.kanban import KanbanBoard, KanbanItem, Priority
+        from pykanban.taskcategory import CategoryData
+        board = KanbanBoard()
+        database = BoardDatabase(board, filename)
+        connection = database.connection
+        items = dict()
+        for item_id, name, priority, completed, position in connection.execute(
+                "SELECT id, name, priority, completed, position FROM items ORDER BY position"):
+            item = KanbanItem(name, None, board, Priority(priority))
+            item.id = item_id
+            item.completed = bool(completed)
+            items[item_id] = item
+            database._next_position = position + 1
+        for item, dependency in connection.execute("SELECT item, dependency FROM edges ORDER BY item, position"):
+            items[item].depends_on.append(items[dependency])
+        for item, category in connection.execute("SELECT item, category FROM item_categories"):
+            items[item].category.add(category)
+        board.categories = {name for (name,) in connection.execute("SELECT name FROM categories")}
+        for name, foreground, background in connection.execute(
+                "SELECT category, foreground, background FROM category_styles"):
+            data = CategoryData(json.loads(foreground), json.loads(background))
+            data._load_icon = partial(database._icon, name)
+            board.category_data[name] = data
+        values = {key: json.loads(value) for key, value in connection.execute("SELECT key, value FROM board")}
+        board.filename = values.get('filename')
+        board.view_settings = values.get('view_settings', [])
+        board.schema_version = values.get('schema_version', 0)
+        board.items = items.values()
+        board._lazy_source = database
+        board._savers[filename] = database
+        database._written = True
+        return board
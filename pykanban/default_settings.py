@@ -8,7 +8,8 @@ _defaults_ = {
         'RestoreViewSettings': True
     },
     "Usability": {
-        "OpenLastDocument": True
+        "OpenLastDocument": True,
+        "UndoDepth": 100
     },
     "UseRecord": {
         "LastDocument": None
@@ -0,0 +1,79 @@
+from __future__ import annotations
+from typing import *
+from html import escape
+
+from pykanban.kanban import ItemState
+
+if TYPE_CHECKING:
+    from pykanban.kanban import KanbanBoard, KanbanItem
+
+#: The background of a node for each state, states not listed are left plain
+STATE_COLORS = {ItemState.COMPLETED: 'green', ItemState.BLOCKED: 'red'}
+
+
+def exported_items(board: KanbanBoard, root: KanbanItem = None, dependents: bool = False,
+                   collapsed: Collection[KanbanItem] = (), hide_completed: bool = False) -> List[KanbanItem]:
+    """
+    Find the items that belong in an export, in the order they are written.
+
+    Starting from the root the dependencies (or dependents) of each item
+    are followed. Collapsed items are included but not followed further,
+    and with hide_completed set the completed items are left out along
+    with whatever is only reachable through them.
+
+    :param board: The board to export
+    :param root: The item to export the neighbourhood of, None for the whole board
+    :param dependents: Follow the items that depend on each item rather than
+        the items it depends on
+    :param collapsed: Items whose dependencies (or dependents) are not
+        followed, only used when there is a root
+    :param hide_completed: Whether completed items are left out
+    :returns: The items to export
+    """
+    states = board.states()
+    if root is None:
+        return [i for i in board.items if not (hide_completed and states[i] == ItemState.COMPLETED)]
+    follow = board.dependents_of if dependents else (lambda x: x.depends_on)
+    stack = [root]
+    seen: Set[KanbanItem] = set()
+    result = []
+    while stack:
+        item = stack.pop()
+        if item in seen:
+            continue
+        seen.add(item)
+        if hide_completed and states[item] == ItemState.COMPLETED:
+            continue
+        result.append(item)
+        if item not in collapsed:
+            stack.extend(reversed(follow(item)))
+    return result
+
+
+def dot_chunks(board: KanbanBoard, root: KanbanItem = None, dependents: bool = False,
+               collapsed: Collection[KanbanItem] = (), hide_completed: bool = False) -> Iterator[str]:
+    """
+    Produce a GraphViz document for a board a piece at a time, so that it
+    can be written out without building the whole document first. The
+    arguments are those of :func:`exported_items`.
+
+    :returns: The pieces of the document, one node or edge list at a time
+    """
+    states = board.states()
+    items = exported_items(board, root, dependents, collapsed, hide_completed)
+    ids = {v: idx for idx, v in enumerate(items)}
+    yield "digraph G{\n"
+    for i in items:
+        color = STATE_COLORS.get(states[i])
+        color = f" bgcolor=\"{color}\"" if color is not None else ""
+        table = f"<TABLE{color}><tr><td>{escape(i.name)}</td></tr>"
+        if i.description != "":
+            desc = escape(i.description).replace("\n", "<br/>")
+            table += f"<tr><td>{desc}</td></tr>"
+        table += "</TABLE>"
+        yield f"\t{ids[i]}[shape=none,label=<{table}>];\n"
+    for i in items:
+        targets = [str(ids[j]) for j in i.depends_on if j in ids]
+        if targets:
+            yield f"\t{ids[i]} -> {{{','.join(targets)}}};\n"
+    yield "}\n"
@@ -0,0 +1,149 @@
+from __future__ import annotations
+from typing import *
+from array import array
+
+from pykanban.kanban import ItemState, Priority
+
+# NumPy is optional, everything here has a plain Python version that gives
+# the same results when it isn't installed
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from pykanban.store import BoardStore
+
+#: The states in the order of their codes in :attr:`BoardSummary.states`
+STATE_CODES = (ItemState.COMPLETED, ItemState.BLOCKED, ItemState.AVAILABLE)
+
+
+def _to_array(values, typecode: str = 'l') -> array:
+    result = array(typecode)
+    result.frombytes(values.astype(typecode).tobytes())
+    return result
+
+
+def _owners(offsets: array):
+    """
+    The row each entry of a CSR index array belongs to
+    """
+    offsets = numpy.frombuffer(offsets, dtype=offsets.typecode)
+    return numpy.repeat(numpy.arange(len(offsets) - 1), numpy.diff(offsets))
+
+
+def unmet_counts(offsets: array, indices: array, completed: array) -> array:
+    """
+    Count the uncompleted dependencies of every row
+
+    :param offsets: The CSR offsets of the dependencies
+    :param indices: The CSR indices of the dependencies
+    :param completed: 1 for each completed row, 0 otherwise
+    :returns: The number of unmet dependencies of each row
+    """
+    rows = len(offsets) - 1
+    if numpy is not None:
+        done = numpy.frombuffer(completed, dtype=completed.typecode)
+        dependencies = numpy.frombuffer(indices, dtype=indices.typecode)
+        blocking = done[dependencies] == 0
+        return _to_array(numpy.bincount(_owners(offsets)[blocking], minlength=rows))
+    return array('l', (sum(1 for j in indices[offsets[i]:offsets[i + 1]] if not completed[j])
+                       for i in range(rows)))
+
+
+def depth_levels(offsets: array, indices: array) -> array:
+    """
+    Find the depth of every row, rows without dependencies are at depth 0
+    and every other row is one deeper than its deepest dependency.
+
+    This is a single pass of Kahn's algorithm in O(V+E). There is no NumPy
+    version, settling a level at a time takes one vectorized pass per level,
+    which on long chains is far slower than visiting each edge once.
+
+    :param offsets: The CSR offsets of the dependencies
+    :param indices: The CSR indices of the dependencies
+    :returns: The depth of each row
+    :raises ValueError: If the dependencies contain a cycle
+    """
+    rows = len(offsets) - 1
+    remaining = array('l', (offsets[i + 1] - offsets[i] for i in range(rows)))
+    dependents: List[List[int]] = [[] for _ in range(rows)]
+    for row in range(rows):
+        for i in indices[offsets[row]:offsets[row + 1]]:
+            dependents[i].append(row)
+    depth = array('l', bytes(array('l').itemsize * rows))
+    ready = [i for i in range(rows) if remaining[i] == 0]
+    done = 0
+    while ready:
+        current = ready.pop()
+        done += 1
+        for i in dependents[current]:
+            depth[i] = max(depth[i], depth[current] + 1)
+            remaining[i] -= 1
+            if remaining[i] == 0:
+                ready.append(i)
+    if done != rows:
+        raise ValueError("The board has a dependency cycle")
+    return depth
+
+
+def _counts(values: array, length: int) -> List[int]:
+    if numpy is not None:
+        return numpy.bincount(numpy.frombuffer(values, dtype=values.typecode), minlength=length).tolist()
+    result = [0] * length
+    for i in values:
+        result[i] += 1
+    return result
+
+
+class BoardSummary:
+    """
+    The state of every row of a store, and how many rows there are in each
+    state, priority and category.
+    """
+    #: The state of each row, as an index into STATE_CODES
+    states: array
+    state_counts: Dict[ItemState, int]
+    priority_counts: Dict[Priority, int]
+    category_counts: Dict[str, int]
+
+    def __init__(self, states: array, state_counts: Dict[ItemState, int],
+                 priority_counts: Dict[Priority, int], category_counts: Dict[str, int]):
+        self.states = states
+        self.state_counts = state_counts
+        self.priority_counts = priority_counts
+        self.category_counts = category_counts
+
+    def state_of(self, row: int) -> ItemState:
+        return STATE_CODES[self.states[row]]
+
+    def rows_in_state(self, state: ItemState) -> List[int]:
+        code = STATE_CODES.index(state)
+        if numpy is not None:
+            return numpy.flatnonzero(numpy.frombuffer(self.states, dtype=self.states.typecode) == code).tolist()
+        return [i for i, v in enumerate(self.states) if v == code]
+
+
+def summarize(store: BoardStore) -> BoardSummary:
+    """
+    Work out the state of every row of a store and count the rows by
+    state, priority and category, in a few passes over its arrays.
+
+    :param store: The store to evaluate
+    :returns: The summary
+    """
+    if numpy is not None:
+        done = numpy.frombuffer(store.completed, dtype=store.completed.typecode) != 0
+        unmet = numpy.frombuffer(store.unmet, dtype=store.unmet.typecode)
+        codes = numpy.where(done, 0, numpy.where(unmet > 0, 1, 2))
+        states = _to_array(codes, 'b')
+    else:
+        states = array('b', (0 if store.completed[i] else 1 if store.unmet[i] > 0 else 2
+                             for i in range(len(store.ids))))
+    by_state = _counts(states, len(STATE_CODES))
+    by_priority = _counts(store.priority, max(Priority) + 1)
+    by_category = _counts(store.cat_indices, len(store.category_names))
+    return BoardSummary(states,
+                        {v: by_state[i] for i, v in enumerate(STATE_CODES)},
+                        {i: by_priority[i] for i in Priority},
+                        {v: by_category[i] for i, v in enumerate(store.category_names)})
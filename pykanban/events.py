@@ -0,0 +1,207 @@
+from __future__ import annotations
+from typing import *
+
+if TYPE_CHECKING:
+    from pykanban.kanban import KanbanItem
+
+
+class BoardEvent:
+    """
+    Something that happened to a board. Events carry no references to the
+    user interface, so the board can be used and observed without Qt.
+    """
+    __slots__ = ()
+
+
+class ItemAdded(BoardEvent):
+    """
+    An item was put on the board
+    """
+    item: KanbanItem
+    __slots__ = ('item',)
+
+    def __init__(self, item: KanbanItem):
+        self.item = item
+
+
+class ItemRemoved(BoardEvent):
+    """
+    An item was taken off the board
+    """
+    item: KanbanItem
+    __slots__ = ('item',)
+
+    def __init__(self, item: KanbanItem):
+        self.item = item
+
+
+class FieldsChanged(BoardEvent):
+    """
+    The name, description, priority, completion, categories or dependencies
+    of an item were edited
+    """
+    item: KanbanItem
+    __slots__ = ('item',)
+
+    def __init__(self, item: KanbanItem):
+        self.item = item
+
+
+class StateChanged(BoardEvent):
+    """
+    An item may have moved between blocked, available and completed
+    """
+    item: KanbanItem
+    __slots__ = ('item',)
+
+    def __init__(self, item: KanbanItem):
+        self.item = item
+
+
+class CategoryStyled(BoardEvent):
+    """
+    The colors or icon of a category were changed
+    """
+    category: str
+    __slots__ = ('category',)
+
+    def __init__(self, category: str):
+        self.category = category
+
+
+class ChangeSet:
+    """
+    A number of events folded together, so that listeners can update once
+    for all of them. Each item is listed at most once per kind of change,
+    and an item that was added and removed again is left out altogether.
+
+    The added and removed items are kept as the keys of dicts, which keep
+    their order like a list but can be looked up and taken out of in
+    constant time, so folding in many events stays linear.
+    """
+    #: Items added to the board, in the order they were added
+    added: Dict[KanbanItem, None]
+    #: Items removed from the board, in the order they were removed
+    removed: Dict[KanbanItem, None]
+    #: Items whose fields were edited
+    fields: Set[KanbanItem]
+    #: Items whose state (blocked, available, completed) may have changed
+    states: Set[KanbanItem]
+    #: Categories whose styling changed
+    styled: Set[str]
+    __slots__ = ('added', 'removed', 'fields', 'states', 'styled')
+
+    def __init__(self, events: Iterable[BoardEvent] = ()):
+        self.added = dict()
+        self.removed = dict()
+        self.fields = set()
+        self.states = set()
+        self.styled = set()
+        for i in events:
+            self.add(i)
+
+    def add(self, event: BoardEvent) -> None:
+        """
+        Fold an event into the set of changes
+
+        :param event: The event to fold in
+        """
+        if isinstance(event, ItemAdded):
+            if event.item in self.removed:
+                # Put back before the listeners heard it was gone, so only
+                # what may have changed about it in between is reported
+                del self.removed[event.item]
+                self.fields.add(event.item)
+                self.states.add(event.item)
+            else:
+                self.added[event.item] = None
+        elif isinstance(event, ItemRemoved):
+            self.fields.discard(event.item)
+            self.states.discard(event.item)
+            if event.item in self.added:
+                del self.added[event.item]
+            else:
+                self.removed[event.item] = None
+        elif isinstance(event, FieldsChanged):
+            self.fields.add(event.item)
+        elif isinstance(event, StateChanged):
+            self.states.add(event.item)
+        elif isinstance(event, CategoryStyled):
+            self.styled.add(event.category)
+
+    def events(self) -> List[BoardEvent]:
+        """
+        :returns: The changes as individual events
+        """
+        result: List[BoardEvent] = [ItemRemoved(i) for i in self.removed]
+        result += [ItemAdded(i) for i in self.added]
+        result += [FieldsChanged(i) for i in self.fields]
+        result += [StateChanged(i) for i in self.states]
+        result += [CategoryStyled(i) for i in self.styled]
+        return result
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.fields or self.states or self.styled)
+
+
+class EventBus:
+    """
+    Delivers a board's events to its listeners as ChangeSets.
+
+    Without a scheduler, events are delivered as soon as they are published.
+    A user interface can instead set a scheduler that runs the delivery on
+    its next event loop iteration, so that everything published in between
+    reaches the listeners as one ChangeSet, for example::
+
+        board.events.scheduler = lambda flush: QTimer.singleShot(0, flush)
+    """
+    #: Callables given a ChangeSet for each delivery
+    _listeners: List[Callable[[ChangeSet], None]]
+    #: Changes published but not delivered yet
+    _pending: ChangeSet
+    #: Whether a delivery has been requested from the scheduler
+    _scheduled: bool
+    #: Called with a callable that must be run later to deliver the pending changes
+    scheduler: Optional[Callable[[Callable[[], None]], None]]
+
+    def __init__(self):
+        self._listeners = []
+        self._pending = ChangeSet()
+        self._scheduled = False
+        self.scheduler = None
+
+    def subscribe(self, listener: Callable[[ChangeSet], None]) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[ChangeSet], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def publish(self, events: Iterable[BoardEvent]) -> None:
+        """
+        Queue events for the listeners, delivering them right away unless
+        there is a scheduler.
+
+        :param events: The events to publish
+        """
+        for i in events:
+            self._pending.add(i)
+        if not self._pending:
+            return
+        if self.scheduler is None:
+            self.flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            self.scheduler(self.flush)
+
+    def flush(self) -> None:
+        """
+        Deliver everything published so far
+        """
+        self._scheduled = False
+        changes = self._pending
+        self._pending = ChangeSet()
+        if not changes:
+            return
+        for i in list(self._listeners):
+            i(changes)
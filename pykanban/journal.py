@@ -0,0 +1,307 @@
+from __future__ import annotations
+from typing import *
+from abc import ABC, abstractmethod
+from collections import deque
+
+if TYPE_CHECKING:
+    from pykanban.kanban import KanbanBoard, KanbanItem
+
+
+class Edit(ABC):
+    """
+    A single reversible change to a board, holding only what is needed to
+    apply it in either direction.
+    """
+    __slots__ = ()
+
+    @abstractmethod
+    def undo(self, board: KanbanBoard) -> None:
+        pass
+
+    @abstractmethod
+    def redo(self, board: KanbanBoard) -> None:
+        pass
+
+
+class FieldEdit(Edit):
+    """
+    The name, description, priority or completion of an item was set
+    """
+    item: KanbanItem
+    #: The name of the property on the item
+    field: str
+    before: Any
+    after: Any
+    __slots__ = ('item', 'field', 'before', 'after')
+
+    def __init__(self, item: KanbanItem, field: str, before: Any, after: Any):
+        self.item = item
+        self.field = field
+        self.before = before
+        self.after = after
+
+    def undo(self, board: KanbanBoard) -> None:
+        setattr(self.item, self.field, self.before)
+
+    def redo(self, board: KanbanBoard) -> None:
+        setattr(self.item, self.field, self.after)
+
+
+class CategoryEdit(Edit):
+    """
+    A category was added to or removed from an item
+    """
+    item: KanbanItem
+    category: str
+    added: bool
+    __slots__ = ('item', 'category', 'added')
+
+    def __init__(self, item: KanbanItem, category: str, added: bool):
+        self.item = item
+        self.category = category
+        self.added = added
+
+    def undo(self, board: KanbanBoard) -> None:
+        self.item.update_category(self.category, not self.added)
+
+    def redo(self, board: KanbanBoard) -> None:
+        self.item.update_category(self.category, self.added)
+
+
+class DependencyEdit(Edit):
+    """
+    A dependency was added to or removed from an item
+    """
+    item: KanbanItem
+    dependency: KanbanItem
+    added: bool
+    #: Where the dependency is, or was, in the item's list of dependencies
+    index: int
+    __slots__ = ('item', 'dependency', 'added', 'index')
+
+    def __init__(self, item: KanbanItem, dependency: KanbanItem, added: bool, index: int):
+        self.item = item
+        self.dependency = dependency
+        self.added = added
+        self.index = index
+
+    def _apply(self, board: KanbanBoard, add: bool) -> None:
+        if add:
+            board.add_dependency(self.item, self.dependency, self.index)
+        else:
+            board.remove_dependency(self.item, self.dependency)
+
+    def undo(self, board: KanbanBoard) -> None:
+        self._apply(board, not self.added)
+
+    def redo(self, board: KanbanBoard) -> None:
+        self._apply(board, self.added)
+
+
+class DependencyOrderEdit(Edit):
+    """
+    The dependencies of an item were put in a different order
+    """
+    item: KanbanItem
+    before: List[KanbanItem]
+    after: List[KanbanItem]
+    __slots__ = ('item', 'before', 'after')
+
+    def __init__(self, item: KanbanItem, before: List[KanbanItem], after: List[KanbanItem]):
+        self.item = item
+        self.before = before
+        self.after = after
+
+    def undo(self, board: KanbanBoard) -> None:
+        board.reorder_dependencies(self.item, self.before)
+
+    def redo(self, board: KanbanBoard) -> None:
+        board.reorder_dependencies(self.item, self.after)
+
+
+class ItemAdd(Edit):
+    """
+    An item was put on the board
+    """
+    item: KanbanItem
+    __slots__ = ('item',)
+
+    def __init__(self, item: KanbanItem):
+        self.item = item
+
+    def undo(self, board: KanbanBoard) -> None:
+        board.remove_item(self.item)
+
+    def redo(self, board: KanbanBoard) -> None:
+        board.add_item(self.item)
+
+
+class ItemRemove(Edit):
+    """
+    An item was taken off the board. The item keeps its own fields and
+    dependencies, so only the items that depended on it are remembered.
+    """
+    item: KanbanItem
+    #: Each item that depended on the removed one, and where in its
+    #: dependencies the removed item was
+    dependents: List[Tuple[KanbanItem, int]]
+    __slots__ = ('item', 'dependents')
+
+    def __init__(self, item: KanbanItem, dependents: List[Tuple[KanbanItem, int]]):
+        self.item = item
+        self.dependents = dependents
+
+    def undo(self, board: KanbanBoard) -> None:
+        board.add_item(self.item)
+        board.categories |= self.item.category
+        for i, index in self.dependents:
+            board.add_dependency(i, self.item, index)
+
+    def redo(self, board: KanbanBoard) -> None:
+        board.remove_item(self.item)
+
+
+class Journal:
+    """
+    The undo and redo history of a board.
+
+    Everything changed within one :meth:`KanbanBoard.batch` becomes a single
+    step, and changes made outside of a batch are a step each. A step that
+    only sets the same field of the same item as the step before it is
+    merged into that one, so typing into a field over several edits is
+    undone all at once.
+    """
+    board: KanbanBoard
+    #: The steps that can be undone, the most recent last
+    _undo: Deque[List[Edit]]
+    #: The steps that were undone and can be redone, the most recently undone last
+    _redo: List[List[Edit]]
+    #: Edits made in the batch that is still open
+    _open: List[Edit]
+    #: Whether the latest undo step may have further edits merged into it
+    _mergeable: bool
+    #: Set while undoing or redoing, so that the replayed edits aren't recorded
+    _replaying: bool
+
+    def __init__(self, board: KanbanBoard, depth: int = 100):
+        self.board = board
+        self._undo = deque(maxlen=depth)
+        self._redo = []
+        self._open = []
+        self._mergeable = False
+        self._replaying = False
+
+    @property
+    def depth(self) -> int:
+        """
+        How many steps are kept, the oldest are forgotten first
+        """
+        return self._undo.maxlen
+
+    @depth.setter
+    def depth(self, value: int) -> None:
+        if value != self._undo.maxlen:
+            self._undo = deque(self._undo, maxlen=value)
+            if len(self._redo) > value:
+                del self._redo[:len(self._redo) - value]
+
+    def record(self, edit: Edit) -> None:
+        """
+        Add an edit to the current step, finishing the step right away if
+        no batch is open.
+
+        :param edit: The edit that was just made
+        """
+        if self._replaying:
+            return
+        self._open.append(edit)
+        if self.board._batch_depth == 0:
+            self.commit()
+
+    def commit(self) -> None:
+        """
+        Finish the current step
+        """
+        step = self._open
+        if not step:
+            return
+        self._open = []
+        self._redo.clear()
+        if self._mergeable and self._merge(step):
+            return
+        self._undo.append(step)
+        self._mergeable = True
+
+    def _merge(self, step: List[Edit]) -> bool:
+        """
+        Fold a step into the previous one if both only set the same field
+
+        :returns: True if the step was merged
+        """
+        if len(step) != 1 or not self._undo or len(self._undo[-1]) != 1:
+            return False
+        edit, last = step[0], self._undo[-1][0]
+        if not isinstance(edit, FieldEdit) or not isinstance(last, FieldEdit) \
+                or edit.item is not last.item or edit.field != last.field:
+            return False
+        last.after = edit.after
+        if last.after == last.before:
+            # The edits cancelled out
+            self._undo.pop()
+            self._mergeable = False
+        return True
+
+    def can_undo(self) -> bool:
+        return len(self._undo) > 0
+
+    def can_redo(self) -> bool:
+        return len(self._redo) > 0
+
+    def undo(self) -> bool:
+        """
+        Revert the most recent step
+
+        :returns: False if there was nothing to undo
+        """
+        if not self._undo:
+            return False
+        step = self._undo.pop()
+        self._replay(step, reverse=True)
+        self._redo.append(step)
+        return True
+
+    def redo(self) -> bool:
+        """
+        Reapply the most recently undone step
+
+        :returns: False if there was nothing to redo
+        """
+        if not self._redo:
+            return False
+        step = self._redo.pop()
+        self._replay(step, reverse=False)
+        self._undo.append(step)
+        return True
+
+    def _replay(self, step: List[Edit], reverse: bool) -> None:
+        self._mergeable = False
+        self._replaying = True
+        try:
+            with self.board.batch():
+                if reverse:
+                    for i in reversed(step):
+                        i.undo(self.board)
+                else:
+                    for i in step:
+                        i.redo(self.board)
+        finally:
+            self._replaying = False
+
+    def clear(self) -> None:
+        """
+        Forget the whole history
+        """
+        self._undo.clear()
+        self._redo.clear()
+        self._open = []
+        self._mergeable = False
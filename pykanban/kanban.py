@@ -3,8 +3,17 @@ from typing import *
 from enum import IntEnum, Enum, auto
 
 import pickle
-import json
-from PySide2.QtWidgets import QWidget
+import uuid
+import unicodedata
+from types import MappingProxyType
+from contextlib import contextmanager
+from pykanban.events import *
+from pykanban.journal import *
+
+#: The version of the saved board layout. Boards saved at this version were
+#: validated when they were loaded, so they aren't checked again.
+SCHEMA_VERSION = 1
+
 
 class Priority(IntEnum):
     """
@@ -27,77 +36,199 @@ class ItemState(Enum):
     #: The task is Available for completion
     AVAILABLE=auto()
 
+def normalize(text: str) -> str:
+    """
+    Fold text for searching, so that case and accents are ignored.
+
+    :param text: The text to fold
+    :returns: The casefolded text with combining accents removed
+    """
+    if text.isascii():
+        return text.lower()
+    text = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(i for i in text if not unicodedata.combining(i))
+
+
+def trigrams(text: str) -> Set[str]:
+    """
+    Split text into the set of three character sequences that occur in it.
+
+    :param text: The text to split, expected to already be normalized
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
 class KanbanItem:
     """
     A task on a kanban board.
     """
     #: The list of tasks this task depends on to be completed
     depends_on:List[KanbanItem]
-    #: The name of the task
-    name:str
-    #: The task's priority
-    priority:Priority
-    #: The description of a task
-    description:str
-    #: Whether or not the task is completed
-    completed:bool
     #: The parent board
     board:KanbanBoard
-    #:The parent widget, will be None until initialized
-    widget: List[QWidget]
     position : Optional[Tuple[int,int]]
     #: The set of categories this task is under
     category: Set[str]
-    __slots__=('completed','board','priority','name','depends_on','description','assigned','widget', 'category')
+    #: A persistent identifier, unique to this task and kept across saves
+    id: str
+    #: The normalized name, description and categories, None until the
+    #: first search and whenever one of them changes
+    _search_text: Optional[str]
+    __slots__=('_completed','board','_priority','_name','depends_on','_description','assigned', 'category', 'id',
+               '_search_text')
     def __init__(self, name, description,board:KanbanBoard=None,priority=Priority.MEDIUM):
-        self.priority=priority
-        self.name=name
-        self.description=description
+        self.id = uuid.uuid4().hex
+        self._priority=priority
+        self._name=name
+        self._description=description
         self.depends_on = []
-        self.priority=priority
-        self.completed = False
+        self._completed = False
         self.assigned = None
         self.board = board
         self.category = set()
-        self.widget = []
+        self._search_text = None
+
+    @property
+    def completed(self) -> bool:
+        """
+        Whether or not the task is completed. Setting this keeps the
+        board's unmet dependency counts up to date.
+        """
+        return self._completed
+
+    @completed.setter
+    def completed(self, value: bool) -> None:
+        if value == self._completed:
+            return
+        if self.board is not None:
+            self.board._record(FieldEdit(self, 'completed', self._completed, value))
+        self._completed = value
+        if self.board is not None:
+            self.board._completion_changed(self)
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the task
+        """
+        return self._name
+
+    @name.setter
+    def name(self, value: str) -> None:
+        if value == self._name:
+            return
+        if self.board is not None:
+            self.board._record(FieldEdit(self, 'name', self._name, value))
+        self._name = value
+        self._search_text = None
+        if self.board is not None:
+            self.board._text_changed(self)
+
+    @property
+    def priority(self) -> Priority:
+        """
+        The task's priority
+        """
+        return self._priority
+
+    @priority.setter
+    def priority(self, value: Priority) -> None:
+        if value == self._priority:
+            return
+        if self.board is not None:
+            self.board._record(FieldEdit(self, 'priority', self._priority, value))
+        self._priority = value
+        if self.board is not None:
+            self.board._text_changed(self)
+
+    @property
+    def description(self) -> str:
+        """
+        The description of a task. Boards opened from a database leave
+        descriptions to be read the first time they are needed.
+        """
+        if self._description is None:
+            self._description = self.board._fetch_description(self) if self.board is not None else ""
+        return self._description
+
+    @description.setter
+    def description(self, value: str) -> None:
+        current = self.description
+        if value == current:
+            return
+        if self.board is not None:
+            self.board._record(FieldEdit(self, 'description', current, value))
+        self._description = value
+        self._search_text = None
+        if self.board is not None:
+            self.board._text_changed(self)
+
+    def search_text(self) -> str:
+        """
+        The name, description and categories as one normalized string, kept
+        until one of them changes. The fields are separated by a character
+        that can't be typed into a search.
+        """
+        if self._search_text is None:
+            self._search_text = normalize('\0'.join([self.name, self.description, *sorted(self.category)]))
+        return self._search_text
+
+    def search_trigrams(self) -> Set[str]:
+        """
+        The trigrams of the normalized name, description and categories,
+        as used by the board's search index.
+        """
+        return trigrams(self.search_text())
 
     def category_matches(self, text: str) -> bool:
         """
-        Determine if a category is matched by the string
+        Determine if a category is matched by the string, ignoring case
+        and accents
 
         :param text: The text to search for.
         :returns: If any category in this task partially matches the string
         """
+        text = normalize(text)
         for i in self.category:
-            if text in i:
+            if text in normalize(i):
                 return True
         return False
 
     def matches(self, text: str) -> bool:
         """
-        Determine if this item matches a search string
+        Determine if this item matches a search string, ignoring case and accents
 
         :param text: The text to search for
         """
-        text = text.lower()
-        return text in self.name.lower() or text in self.description.lower() \
-               or self.category_matches(text)
+        return normalize(text) in self.search_text()
 
     def short_name(self)->str:
         return self.name
 
     def blocked(self)->bool:
         """
-        Returns true if all tasks this depends on are completed.
+        Returns true if any task this depends on is not completed.
+
+        Answered from the board's unmet dependency count when the item
+        is on a board, otherwise by checking each dependency.
         """
         if self.completed:
             return False
+        if self.board is not None:
+            unmet = self.board._unmet.get(self)
+            if unmet is not None:
+                return unmet > 0
         return not all(map(lambda x:x.completed,self.depends_on))
 
     def getBlockers(self)->List[KanbanItem]:
         """
         Returns the list of items responsible for this item being blocked
+
+        Prefer :meth:`KanbanBoard.blockers_of`, which this defers to when the
+        item is on a board.
         """
+        if self.board is not None and self in self.board._unmet:
+            return self.board.blockers_of(self)
         result = []
         for i in self.depends_on:
             if i.blocked():
@@ -110,6 +241,9 @@ class KanbanItem:
         """
         Returns true if there is a cycle in the dependencies of an item.
         """
+        if path is None and self.board is not None and self in self.board._unmet \
+                and self.board._ensure_topo_order():
+            return False
         path = path if path is not None else set()
         if self in path:
             return True
@@ -153,8 +287,13 @@ class KanbanItem:
 
         :param category: The name of the category
         """
+        if category in self.category:
+            return
         self.category.add(category)
+        self._search_text = None
         if self.board is not None:
+            self.board._record(CategoryEdit(self, category, True))
+            self.board._category_changed(self, category, True)
             self.board.categories.add(category)
             print(f"Adding category to board {category}")
         else:
@@ -163,6 +302,10 @@ class KanbanItem:
     def remove_category(self, category:str)->None:
         if category in self.category:
             self.category.remove(category)
+            self._search_text = None
+            if self.board is not None:
+                self.board._record(CategoryEdit(self, category, False))
+                self.board._category_changed(self, category, False)
 
     def update_category(self, category:str,state:bool)->None:
         """
@@ -180,15 +323,22 @@ class KanbanItem:
         state = dict((slot, getattr(self, slot))
                      for slot in self.__slots__
                      if hasattr(self, slot))
-        del state['widget']
         if 'position' in state.keys():
             del state['position']
+        del state['_search_text']
+        state['_description'] = self.description
+        # Properties are saved under their public names
+        for slot in [i for i in state.keys() if i.startswith('_')]:
+            state[slot[1:]] = state.pop(slot)
         return state
 
     def __setstate__(self, state):
         for slot,value in state.items():
+            if '_' + slot in self.__slots__:
+                # Bypass the property, the board may not be loaded yet
+                slot = '_' + slot
             setattr(self,slot,value)
-        self.widget = []
+        self._search_text = None
         self._fill_in_missing()
 
     def _fill_in_missing(self):
@@ -205,62 +355,849 @@ class KanbanItem:
             print("Filled in missing category set")
         if isinstance(self.category,list):
             self.category=set(self.category)
-
-    def widget_of(self,widget:QWidget)->QWidget:
-        for i in self.widget:
-            if i.parent().parent() == widget or i.parent()== widget:
-                return i
+        if not hasattr(self, 'id'):
+            self.id = uuid.uuid4().hex
 
     def markChanged(self):
-        for i in self.widget:
-            i.updateDisplay()
-            i.changed.emit(i,Priority.INVALID,self.state())
+        """
+        Tell the board's listeners that this item was edited, for changes
+        the board can't see by itself.
+        """
+        if self.board is not None:
+            self.board._fields_changed(self)
 
 
 class KanbanBoard:
     """
     A container that keeps track of a set of KanbanItems and their categories
     """
-    #: The list of tasks in the board
-    items: List[KanbanItem]
+    #: The tasks in the board, keyed by their id, in the order they were added
+    _items: Dict[str, KanbanItem]
     #: The place where, by default, this will be saved to
     filename: str
     #: A set of categories that exist in the items of the board
     categories: Set[str]
+    #: The :data:`SCHEMA_VERSION` of the file the board was loaded from, 0
+    #: for files from before there was one
+    schema_version: int
     #: Association between the category and the optional styling data that
     #: may be associated to it.
     category_data: Dict[str, CategoryData]
     #: Data used to save the last settings of the views.
     view_settings: List[Dict[Any, Any]]
+    #: Boards can always be edited, unlike a :class:`pykanban.store.BoardStore`
+    #: opened read only, which the views can show in their place
+    read_only = False
+    #: Reverse dependency index, mapping each item on the board to the set of
+    #: items that directly depend on it. Derived data, never saved.
+    _dependents: Dict[KanbanItem, Set[KanbanItem]]
+    #: The items on the board that depend on an item that isn't, by that
+    #: item, so that they are indexed as its dependents once it is added
+    _waiting: Dict[KanbanItem, Set[KanbanItem]]
+    #: The number of uncompleted dependencies of each item on the board.
+    _unmet: Dict[KanbanItem, int]
+    #: Items whose state may have changed since listeners were last notified
+    _state_changes: Set[KanbanItem]
+    #: Incremented whenever items, dependencies or completion change, so
+    #: that cached graph queries know when they are stale.
+    generation: int
+    #: Transitive blocker lists, valid for _blocker_generation only
+    _blocker_cache: Dict[Tuple[KanbanItem, bool], List[KanbanItem]]
+    _blocker_generation: int
+    #: A topological order of the items, every item ranks after all of its
+    #: dependencies. None when it has to be rebuilt, or the board has a cycle.
+    _topo_order: Optional[Dict[KanbanItem, int]]
+    _next_order: int
+    #: Incremented whenever items or dependencies are added or removed
+    _structure_generation: int
+    #: The topological order as a list and the depth of each item, valid
+    #: for the structure generation they were computed at
+    _ordering_cache: Optional[Tuple[int, List[KanbanItem], Dict[KanbanItem, int]]]
+    #: Delivers the changes to whoever is observing the board
+    events: EventBus
+    #: The undo and redo history
+    journal: Journal
+    #: Changes made inside of the open batch, not yet published
+    _pending: ChangeSet
+    #: How many batch() blocks are currently open
+    _batch_depth: int
+    #: Inverted index from each trigram to the items whose searchable text
+    #: contains it. Built a slice at a time by :meth:`build_search_index`,
+    #: None until that is first called.
+    _trigrams: Optional[Dict[str, Set[KanbanItem]]]
+    #: The items still to be added to the trigram index
+    _index_queue: List[KanbanItem]
+    #: The trigrams each item is currently filed under
+    _item_trigrams: Dict[KanbanItem, Set[str]]
+    #: Incremented whenever the searchable text on the board changes
+    _text_generation: int
+    #: The last search, as ((text generation, generation, query), result)
+    _search_cache: Optional[Tuple[Tuple[int, int, str], Set[KanbanItem]]]
+    #: The items in each category, a category with no items has no entry
+    _category_items: Dict[str, Set[KanbanItem]]
+    #: The items currently in each state, and the state each item is filed under
+    _state_items: Dict[ItemState, Set[KanbanItem]]
+    _item_state: Dict[KanbanItem, ItemState]
+    #: The last GraphViz export, as (options and generations it was made at, text)
+    _dot_cache: Optional[Tuple[Tuple, str]]
+    #: Items found more than once when the items were last replaced, see
+    #: :meth:`validate`
+    _duplicates: List[KanbanItem]
+    #: The logs and databases the board was saved to or loaded from, which
+    #: only write what changed since, by filename
+    _savers: Dict[str, Union[SaveLog, BoardDatabase]]
+    #: The database the board was opened from, which descriptions that
+    #: haven't been needed yet are read from
+    _lazy_source: Optional[BoardDatabase]
+    #: The item records autosave snapshots share, made by the first
+    #: snapshot, see :class:`pykanban.snapshot.SnapshotRecords`
+    _snapshots: Optional[SnapshotRecords]
+
+    #: Attributes that are recomputed on load rather than saved
+    _derived = ('_dependents', '_waiting', '_unmet', '_state_changes', 'generation',
+                '_blocker_cache', '_blocker_generation', '_topo_order', '_next_order',
+                '_structure_generation', '_ordering_cache',
+                'events', 'journal', '_pending', '_batch_depth', '_trigrams', '_item_trigrams',
+                '_index_queue', '_text_generation', '_search_cache', '_category_items', '_state_items',
+                '_item_state', '_dot_cache', '_duplicates', '_savers', '_lazy_source', '_snapshots')
 
     def __init__(self):
-        self.items = []
+        self._items = dict()
         self.filename = None
         self.categories = set()
         self.category_data = dict()
         self.view_settings = []
+        self.schema_version = SCHEMA_VERSION
+        self._duplicates = []
+        self._savers = dict()
+        self._lazy_source = None
+        self._snapshots = None
+        self.events = EventBus()
+        self.journal = Journal(self)
+        self._pending = ChangeSet()
+        self._batch_depth = 0
+        self._rebuild_indexes()
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        for i in self._derived:
+            state.pop(i, None)
+        # Saved as a plain list so that the file layout stays the same
+        state['items'] = list(state.pop('_items').values())
+        state['schema_version'] = SCHEMA_VERSION
+        return state
+
+    def __setstate__(self, state):
+        items = state.pop('items')
+        self.schema_version = 0
+        self.__dict__.update(state)
+        self._savers = dict()
+        self._lazy_source = None
+        self._snapshots = None
+        self.events = EventBus()
+        self.journal = Journal(self)
+        self._pending = ChangeSet()
+        self._batch_depth = 0
+        self._items = dict()
+        self._duplicates = [i for i in items if self._insert(i)]
+        self._rebuild_indexes()
+
+    @property
+    def items(self) -> ValuesView[KanbanItem]:
+        """
+        The tasks in the board, in the order they were added.
+        """
+        return self._items.values()
+
+    @items.setter
+    def items(self, items: Iterable[KanbanItem]) -> None:
+        self._items = dict()
+        self._duplicates = [i for i in items if self._insert(i)]
+        self._rebuild_indexes()
+
+    def _insert(self, item: KanbanItem) -> bool:
+        """
+        Store an item by its id, giving it a fresh one if the id is already
+        used by a different item, such as a copy of it.
+
+        :returns: True if the item was already stored, or its id was taken
+        """
+        existing = self._items.get(item.id)
+        if existing is None:
+            self._items[item.id] = item
+            return False
+        if existing is not item:
+            item.id = uuid.uuid4().hex
+            self._items[item.id] = item
+        return True
 
-    def for_each_by_matching(self, func: Callable[[KanbanItem, bool], None], query: str) -> None:
+    def get_item(self, item_id: str) -> Optional[KanbanItem]:
+        """
+        Look up a task by its persistent id
+
+        :param item_id: The id of the task
+        :returns: The task, or None if there is no task with that id on the board
+        """
+        return self._items.get(item_id)
+
+    def _rebuild_indexes(self) -> None:
+        """
+        Recompute all of the derived lookup structures from the items
+        themselves. Used after loading, or after the item list has been
+        replaced wholesale.
+        """
+        if self._snapshots is not None:
+            # Nothing is published for a wholesale change, so the records
+            # snapshots share are made again by the next snapshot
+            self._snapshots.close()
+            self._snapshots = None
+        self._dependents = {i: set() for i in self.items}
+        self._waiting = dict()
+        self._unmet = dict()
+        self._state_changes = set()
+        self.generation = 0
+        self._structure_generation = 0
+        self._ordering_cache = None
+        self._blocker_cache = dict()
+        self._blocker_generation = 0
+        self._topo_order = None
+        self._next_order = 0
+        self._trigrams = None
+        self._item_trigrams = dict()
+        self._index_queue = []
+        self._text_generation = 0
+        self._search_cache = None
+        self._dot_cache = None
+        self._category_items = dict()
+        self._state_items = {i: set() for i in ItemState}
+        self._item_state = dict()
+        # The same as indexing each item in turn, written out with the
+        # lookups hoisted since this is most of the time spent loading
+        dependents = self._dependents
+        waiting = self._waiting
+        unmet = self._unmet
+        item_state = self._item_state
+        category_items = self._category_items
+        buckets = self._state_items
+        COMPLETED, BLOCKED, AVAILABLE = ItemState.COMPLETED, ItemState.BLOCKED, ItemState.AVAILABLE
+        completed, blocked, available = buckets[COMPLETED], buckets[BLOCKED], buckets[AVAILABLE]
+        for i in self.items:
+            depends_on = i.depends_on
+            if len(depends_on) > 1:
+                # Repeated dependencies would throw the counts off
+                depends_on = i.depends_on = list(dict.fromkeys(depends_on))
+            count = 0
+            for d in depends_on:
+                bucket = dependents.get(d)
+                if bucket is None:
+                    bucket = waiting.get(d)
+                    if bucket is None:
+                        bucket = waiting[d] = set()
+                bucket.add(i)
+                if not d._completed:
+                    count += 1
+            unmet[i] = count
+            if i._completed:
+                completed.add(i)
+                item_state[i] = COMPLETED
+            elif count:
+                blocked.add(i)
+                item_state[i] = BLOCKED
+            else:
+                available.add(i)
+                item_state[i] = AVAILABLE
+            for c in i.category:
+                category_items.setdefault(c, set()).add(i)
+
+    def _index_dependencies(self, item: KanbanItem) -> None:
+        for d in item.depends_on:
+            if d in self._dependents:
+                self._dependents[d].add(item)
+            else:
+                self._waiting.setdefault(d, set()).add(item)
+        self._unmet[item] = sum(1 for d in item.depends_on if not d.completed)
+        self._refile_state(item)
+
+    def _unwait(self, item: KanbanItem, dependency: KanbanItem) -> None:
+        """
+        Stop waiting for a dependency that isn't on the board
+        """
+        bucket = self._waiting.get(dependency)
+        if bucket is not None:
+            bucket.discard(item)
+            if not bucket:
+                del self._waiting[dependency]
+
+    def _adopt_waiting(self, item: KanbanItem) -> None:
+        """
+        Index the items that already depended on an item before it was
+        added, such as when an item is added ahead of its own dependency
+        """
+        waiting = self._waiting.pop(item, None)
+        if not waiting:
+            return
+        self._dependents[item] |= waiting
+        for i in waiting:
+            # The count was taken while the item wasn't on the board, so
+            # its completion may have changed since
+            count = sum(1 for d in i.depends_on if not d.completed)
+            if count != self._unmet[i]:
+                self._adjust_unmet(i, count - self._unmet[i])
+            self._order_edge_added(i, item)
+
+    def _refile_state(self, item: KanbanItem) -> None:
+        """
+        Move an item to the right bucket of the state index
+        """
+        state = item.state()
+        before = self._item_state.get(item)
+        if before is state:
+            return
+        if before is not None:
+            self._state_items[before].discard(item)
+        self._state_items[state].add(item)
+        self._item_state[item] = state
+
+    def states(self) -> Mapping[KanbanItem, ItemState]:
+        """
+        The state of every item on the board, read from the state index
+        rather than worked out item by item.
+
+        :returns: A read only mapping from each item to its state
+        """
+        return MappingProxyType(self._item_state)
+
+    def items_in_state(self, state: ItemState) -> Set[KanbanItem]:
+        """
+        The items that are currently in a state
+
+        :param state: The state to look up
+        :returns: The items in that state, which should not be modified
+        """
+        return self._state_items[state]
+
+    def _adjust_unmet(self, item: KanbanItem, delta: int) -> None:
+        """
+        Change the unmet dependency count of an item, recording it as changed
+        when it moves between blocked and unblocked.
+        """
+        before = self._unmet[item]
+        self._unmet[item] = before + delta
+        if (before == 0) != (before + delta == 0) and not item.completed:
+            self._state_changes.add(item)
+            self._refile_state(item)
+
+    def _completion_changed(self, item: KanbanItem) -> None:
+        """
+        Called by an item when it is completed or uncompleted, only the
+        direct dependents need their counts adjusted.
+        """
+        if item not in self._unmet:
+            return
+        self.generation += 1
+        self._state_changes.add(item)
+        self._pending.add(FieldsChanged(item))
+        self._refile_state(item)
+        delta = -1 if item.completed else 1
+        for i in self._dependents[item]:
+            self._adjust_unmet(i, delta)
+        self._notify()
+
+    def _record(self, edit: Edit) -> None:
+        """
+        Add an edit to the undo history, if the item it concerns is on the board
+        """
+        if edit.item in self._unmet:
+            self.journal.record(edit)
+
+    def _fields_changed(self, item: KanbanItem) -> None:
+        if item not in self._unmet:
+            return
+        self._pending.add(FieldsChanged(item))
+        self._notify()
+
+    def _fetch_description(self, item: KanbanItem) -> str:
+        """
+        Read the description of an item that was left out when the board
+        was opened
+        """
+        if self._lazy_source is None:
+            return ""
+        return self._lazy_source.description(item)
+
+    def subscribe(self, listener: Callable[[ChangeSet], None]) -> None:
+        """
+        Have a callable notified with a ChangeSet whenever the board changes.
+        See :class:`pykanban.events.EventBus` for when it is called.
+
+        :param listener: The callable to notify
+        """
+        self.events.subscribe(listener)
+
+    def unsubscribe(self, listener: Callable[[ChangeSet], None]) -> None:
+        self.events.unsubscribe(listener)
+
+    def category_styled(self, categories: Iterable[str]) -> None:
+        """
+        Tell the listeners that the styling data of some categories changed
+
+        :param categories: The names of the restyled categories
+        """
+        for i in categories:
+            self._pending.add(CategoryStyled(i))
+        self._notify()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group a number of changes together, listeners are notified once
+        with all of them when the outermost batch finishes, and they are
+        undone as one step::
+
+            with board.batch():
+                for i in imported:
+                    board.add_item(i)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.journal.commit()
+            self._notify()
+
+    def _notify(self) -> None:
+        """
+        Publish the pending changes, unless a batch is open.
+        """
+        if self._batch_depth > 0:
+            return
+        changes = self._pending
+        self._pending = ChangeSet()
+        for i in self._state_changes:
+            if i in self._unmet:
+                changes.add(StateChanged(i))
+        self._state_changes = set()
+        if changes:
+            self.events.publish(changes.events())
+
+    def blockers_of(self, item: KanbanItem, roots_only: bool = False) -> List[KanbanItem]:
+        """
+        Find every uncompleted item that stands between an item and being
+        available, each listed once. Runs in O(V+E) and is cached until the
+        board's generation changes.
+
+        :param item: The item to find the blockers of
+        :param roots_only: Only return the blockers that are themselves available,
+                           that is, the ones that can be worked on right now
+        :returns: The blocking items
+        """
+        if self._blocker_generation != self.generation:
+            self._blocker_cache.clear()
+            self._blocker_generation = self.generation
+        key = (item, roots_only)
+        if key not in self._blocker_cache:
+            result = []
+            seen = {item}
+            stack = [item]
+            while stack:
+                current = stack.pop()
+                for i in current.depends_on:
+                    if i in seen or i.completed:
+                        continue
+                    seen.add(i)
+                    if not roots_only or not i.blocked():
+                        result.append(i)
+                    stack.append(i)
+            self._blocker_cache[key] = result
+        return list(self._blocker_cache[key])
+
+    def _ensure_topo_order(self) -> bool:
+        """
+        Rebuild the maintained topological order if it was invalidated,
+        using Kahn's algorithm.
+
+        :returns: False if the board contains a cycle, and so has no order
+        """
+        if self._topo_order is not None:
+            return True
+        remaining = {i: sum(1 for d in i.depends_on if d in self._dependents) for i in self.items}
+        ready = [i for i, v in remaining.items() if v == 0]
+        order = dict()
+        while ready:
+            current = ready.pop()
+            order[current] = len(order)
+            for i in self._dependents[current]:
+                remaining[i] -= 1
+                if remaining[i] == 0:
+                    ready.append(i)
+        if len(order) != len(self.items):
+            return False
+        self._topo_order = order
+        self._next_order = len(order)
+        return True
+
+    def _ordering(self) -> Tuple[List[KanbanItem], Dict[KanbanItem, int]]:
+        """
+        Lay out the maintained topological order as a list and compute the
+        depth of each item from it, or reuse the last result if the board's
+        structure hasn't changed since.
+        """
+        cache = self._ordering_cache
+        if cache is not None and cache[0] == self._structure_generation:
+            return cache[1], cache[2]
+        if not self._ensure_topo_order():
+            raise ValueError("The board has a dependency cycle")
+        # The ranks are unique and below _next_order, so they can be
+        # placed directly instead of sorted
+        slots: List[Optional[KanbanItem]] = [None] * self._next_order
+        for item, rank in self._topo_order.items():
+            slots[rank] = item
+        order = [i for i in slots if i is not None]
+        depth: Dict[KanbanItem, int] = dict()
+        for i in order:
+            depth[i] = max((depth[d] + 1 for d in i.depends_on if d in depth), default=0)
+        self._ordering_cache = (self._structure_generation, order, depth)
+        return order, depth
+
+    def topological_order(self) -> List[KanbanItem]:
+        """
+        Order the items so that every item comes after all of its dependencies.
+        Computed in O(V+E) and cached until items or dependencies change.
+
+        :returns: The items of the board in dependency order
+        :raises ValueError: If the board has a dependency cycle, see :meth:`find_cycles`
+        """
+        return list(self._ordering()[0])
+
+    def depths(self) -> Dict[KanbanItem, int]:
+        """
+        The length of the longest chain of dependencies below each item, so
+        items without dependencies are at depth 0 and every other item is one
+        deeper than its deepest dependency.
+
+        :returns: The depth of each item on the board
+        :raises ValueError: If the board has a dependency cycle
+        """
+        return dict(self._ordering()[1])
+
+    def depth_of(self, item: KanbanItem) -> int:
+        """
+        :param item: An item on the board
+        :returns: The depth of the item, as in :meth:`depths`
+        :raises ValueError: If the board has a dependency cycle
+        """
+        return self._ordering()[1][item]
+
+    def critical_path(self, item: KanbanItem) -> List[KanbanItem]:
+        """
+        Find the longest chain of dependencies leading up to an item, which
+        is the least number of tasks that must be done one after another
+        before it.
+
+        :param item: The item at the end of the path
+        :returns: The chain, starting from an item with no dependencies and
+                  ending with the item itself
+        :raises ValueError: If the board has a dependency cycle
+        """
+        depth = self._ordering()[1]
+        path = [item]
+        current = item
+        while True:
+            dependencies = [d for d in current.depends_on if d in depth]
+            if not dependencies:
+                break
+            current = max(dependencies, key=depth.get)
+            path.append(current)
+        path.reverse()
+        return path
+
+    def _reaches_through_dependents(self, start: KanbanItem, target: KanbanItem,
+                                    bound: Optional[int] = None) -> Tuple[bool, Set[KanbanItem]]:
+        """
+        Search forward from start along dependents, looking for target. When
+        a bound is given, items ranked after it in the topological order
+        cannot lead to the target and are not explored.
+
+        :returns: Whether target was found, and the items that were visited
+        """
+        seen = {start}
+        stack = [start]
+        while stack:
+            current = stack.pop()
+            for i in self._dependents.get(current, ()):
+                if i is target:
+                    return True, seen
+                if i in seen or (bound is not None and self._topo_order[i] > bound):
+                    continue
+                seen.add(i)
+                stack.append(i)
+        return False, seen
+
+    def would_create_cycle(self, item: KanbanItem, dependency: KanbanItem) -> bool:
+        """
+        Check whether making item depend on dependency would create a cycle.
+
+        This is O(1) when the dependency already ranks before the item in the
+        maintained topological order, and otherwise only searches the items
+        ranked between the two.
+
+        :param item: The item that would gain the dependency
+        :param dependency: The proposed dependency
+        :returns: True if the new edge would close a cycle
+        """
+        if item is dependency:
+            return True
+        if dependency not in self._dependents or item not in self._dependents:
+            return False
+        if not self._ensure_topo_order():
+            return self._reaches_through_dependents(item, dependency)[0]
+        if self._topo_order[dependency] < self._topo_order[item]:
+            return False
+        return self._reaches_through_dependents(item, dependency, self._topo_order[dependency])[0]
+
+    def _order_edge_added(self, item: KanbanItem, dependency: KanbanItem) -> None:
+        """
+        Repair the topological order after an edge was inserted, reordering
+        only the affected region (Pearce and Kelly's algorithm).
+        """
+        if self._topo_order is None:
+            return
+        order = self._topo_order
+        lower, upper = order[item], order[dependency]
+        if upper < lower:
+            return
+        found, forward = self._reaches_through_dependents(item, dependency, upper)
+        if found:
+            self._topo_order = None
+            return
+        backward = {dependency}
+        stack = [dependency]
+        while stack:
+            current = stack.pop()
+            for i in current.depends_on:
+                if i in backward or i not in order or order[i] < lower:
+                    continue
+                backward.add(i)
+                stack.append(i)
+        moved = sorted(backward, key=order.get) + sorted(forward, key=order.get)
+        for i, rank in zip(moved, sorted(order[i] for i in moved)):
+            order[i] = rank
+
+    def find_cycles(self) -> List[List[KanbanItem]]:
+        """
+        Find every dependency cycle on the board, using an iterative version
+        of Tarjan's strongly connected components algorithm.
+
+        :returns: One list of items per cycle, empty if the board has none
+        """
+        if self._topo_order is not None:
+            return []
+        index: Dict[KanbanItem, int] = dict()
+        lowlink: Dict[KanbanItem, int] = dict()
+        on_stack: Set[KanbanItem] = set()
+        stack: List[KanbanItem] = []
+        cycles = []
+        for root in self.items:
+            if root in index:
+                continue
+            work = [(root, iter(root.depends_on))]
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                current, children = work[-1]
+                for i in children:
+                    if i not in self._dependents:
+                        continue
+                    if i not in index:
+                        index[i] = lowlink[i] = len(index)
+                        stack.append(i)
+                        on_stack.add(i)
+                        work.append((i, iter(i.depends_on)))
+                        break
+                    if i in on_stack:
+                        lowlink[current] = min(lowlink[current], index[i])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[current])
+                    if lowlink[current] == index[current]:
+                        component = []
+                        while True:
+                            i = stack.pop()
+                            on_stack.remove(i)
+                            component.append(i)
+                            if i is current:
+                                break
+                        if len(component) > 1 or current in current.depends_on:
+                            cycles.append(component)
+        return cycles
+
+    def _index_text(self, item: KanbanItem) -> None:
+        grams = item.search_trigrams()
+        self._item_trigrams[item] = grams
+        for i in grams:
+            self._trigrams.setdefault(i, set()).add(item)
+
+    def _unindex_text(self, item: KanbanItem) -> None:
+        for i in self._item_trigrams.pop(item, ()):
+            bucket = self._trigrams[i]
+            bucket.discard(item)
+            if not bucket:
+                del self._trigrams[i]
+
+    def _index_categories(self, item: KanbanItem) -> None:
+        for i in item.category:
+            self._category_items.setdefault(i, set()).add(item)
+
+    def _unindex_categories(self, item: KanbanItem) -> None:
+        for i in item.category:
+            bucket = self._category_items.get(i)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self._category_items[i]
+
+    def _category_changed(self, item: KanbanItem, category: str, added: bool) -> None:
+        """
+        Called by an item when a category is added to or removed from it
+        """
+        if item not in self._unmet:
+            return
+        if added:
+            self._category_items.setdefault(category, set()).add(item)
+        else:
+            bucket = self._category_items.get(category)
+            if bucket is not None:
+                bucket.discard(item)
+                if not bucket:
+                    del self._category_items[category]
+        self._text_changed(item)
+
+    def items_in_category(self, category: str) -> Set[KanbanItem]:
+        """
+        The items that are under a category
+
+        :param category: The name of the category
+        :returns: The items in it, which should not be modified
+        """
+        return self._category_items.get(category, set())
+
+    def category_count(self, category: str) -> int:
+        """
+        :param category: The name of the category
+        :returns: How many items are under the category
+        """
+        return len(self._category_items.get(category, ()))
+
+    def _text_changed(self, item: KanbanItem) -> None:
+        """
+        Called by an item when its name, description, priority or
+        categories change
+        """
+        if item not in self._unmet:
+            return
+        self._text_generation += 1
+        if self._trigrams is not None:
+            self._unindex_text(item)
+            self._index_text(item)
+        self._pending.add(FieldsChanged(item))
+        self._notify()
+
+    def build_search_index(self, limit: Optional[int] = None) -> bool:
+        """
+        Add items to the trigram index, so that it can be built a slice at a
+        time while the board is idle rather than on the first search. Items
+        added or edited in the meantime are indexed straight away.
+
+        :param limit: The most items to index, all that are left if None
+        :returns: True once every item is indexed
+        """
+        if self._trigrams is None:
+            self._trigrams = dict()
+            self._index_queue = list(self.items)
+            self._index_queue.reverse()
+        queue = self._index_queue
+        count = len(queue) if limit is None else min(limit, len(queue))
+        chunk = [queue.pop() for _ in range(count)]
+        chunk = [i for i in chunk if i in self._unmet and i not in self._item_trigrams]
+        if self._lazy_source is not None:
+            # One query for the slice rather than one per description
+            unread = [i for i in chunk if i._description is None]
+            if unread:
+                descriptions = self._lazy_source.descriptions(unread)
+                for i in unread:
+                    i._description = descriptions.get(i.id, "")
+        for i in chunk:
+            self._index_text(i)
+        return not queue
+
+    def search_candidates(self, text: str) -> Iterable[KanbanItem]:
+        """
+        Narrow down the items that could match a search using the trigram index.
+        Every match is among the candidates, but not every candidate matches.
+
+        :param text: The text being searched for
+        :returns: The candidate items, all of them for queries under three characters
+        """
+        grams = trigrams(normalize(text))
+        if not grams:
+            return self.items
+        self.build_search_index()
+        buckets = []
+        for i in grams:
+            bucket = self._trigrams.get(i)
+            if bucket is None:
+                return set()
+            buckets.append(bucket)
+        buckets.sort(key=len)
+        return buckets[0].intersection(*buckets[1:])
+
+    def matching_set(self, query: Union[str, Query]) -> Set[KanbanItem]:
+        """
+        Find the items matching a search, only checking the candidates the
+        indexes give. The last result is kept, since every view asks for the
+        same search on each keystroke.
+
+        :param query: The query, either as text or already compiled
+        :returns: The set of matching items
+        """
+        from pykanban.query import Query
+        if isinstance(query, str):
+            query = Query.parse(query)
+        key = (self._text_generation, self.generation, query.text)
+        cache = self._search_cache
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        result = query.evaluate(self)
+        self._search_cache = (key, result)
+        return result
+
+    def for_each_by_matching(self, func: Callable[[KanbanItem, bool], None], query: Union[str, Query]) -> None:
         """
         Call a function on each item, also passing in a bool indicating its matchiness
 
         :param func: The function to call
         :param query: The query to match against
         """
+        matches = self.matching_set(query)
         for i in self.items:
-            func(i,i.matches(query))
+            func(i,i in matches)
 
-    def find_matching(self,text:str)->List[KanbanItem]:
+    def find_matching(self,text:Union[str, Query])->List[KanbanItem]:
         """
-        Return items that contain specified text in either the name or description
+        Return items that match a query, see :class:`pykanban.query.Query`
+        for the syntax. Plain words are searched for in the name,
+        description and categories.
         
-        :param text: The text to search for
-        :returns: A list of items that match the text
+        :param text: The query, either as text or already compiled
+        :returns: A list of items that match the query
         """
-        matches = []
-        for i in filter(lambda x:x.matches(text),self.items):
-            matches.append(i)
-        return matches
+        matches = self.matching_set(text)
+        return [i for i in self.items if i in matches]
 
     def dependents_of(self, item:KanbanItem) -> List[KanbanItem]:
         """
@@ -269,7 +1206,101 @@ class KanbanBoard:
         :param item: The item that is depended on.
         :returns: A list of items that depend on item
         """
-        return list(filter(lambda x: item in x.depends_on, self.items))
+        return list(self._dependents.get(item, ()))
+
+    def add_dependency(self, item: KanbanItem, dependency: KanbanItem, index: Optional[int] = None) -> None:
+        """
+        Make an item depend on another, keeping the dependents index current.
+
+        :param item: The item gaining a dependency
+        :param dependency: The item that must be completed first
+        :param index: Where to insert it in the item's dependencies, by default at the end
+        """
+        if dependency in item.depends_on:
+            return
+        if index is None:
+            index = len(item.depends_on)
+        item.depends_on.insert(index, dependency)
+        self.generation += 1
+        self._structure_generation += 1
+        if item not in self._unmet:
+            return
+        self.journal.record(DependencyEdit(item, dependency, True, index))
+        if dependency in self._dependents:
+            self._dependents[dependency].add(item)
+            self._order_edge_added(item, dependency)
+        else:
+            self._waiting.setdefault(dependency, set()).add(item)
+        if not dependency.completed:
+            self._adjust_unmet(item, 1)
+        self._pending.add(FieldsChanged(item))
+        self._notify()
+
+    def remove_dependency(self, item: KanbanItem, dependency: KanbanItem) -> None:
+        """
+        Remove a dependency from an item, keeping the dependents index current.
+
+        :param item: The item losing a dependency
+        :param dependency: The item that is no longer depended on
+        """
+        if dependency not in item.depends_on:
+            return
+        index = item.depends_on.index(dependency)
+        del item.depends_on[index]
+        self.generation += 1
+        self._structure_generation += 1
+        if item not in self._unmet:
+            return
+        self.journal.record(DependencyEdit(item, dependency, False, index))
+        if dependency in self._dependents:
+            self._dependents[dependency].discard(item)
+        else:
+            self._unwait(item, dependency)
+        if not dependency.completed:
+            self._adjust_unmet(item, -1)
+        self._pending.add(FieldsChanged(item))
+        self._notify()
+
+    def set_dependencies(self, item: KanbanItem, dependencies: Iterable[KanbanItem]) -> None:
+        """
+        Replace the dependencies of an item wholesale. Only the dependencies
+        that actually differ are removed or added.
+
+        :param item: The item whose dependencies are replaced
+        :param dependencies: The new dependencies, in order
+        """
+        dependencies = list(dict.fromkeys(dependencies))
+        wanted = set(dependencies)
+        with self.batch():
+            for i in list(item.depends_on):
+                if i not in wanted:
+                    self.remove_dependency(item, i)
+            for index, i in enumerate(dependencies):
+                self.add_dependency(item, i, index)
+            # Dependencies that were kept may still be out of order
+            self.reorder_dependencies(item, dependencies)
+
+    def reorder_dependencies(self, item: KanbanItem, dependencies: Iterable[KanbanItem]) -> None:
+        """
+        Put the dependencies of an item in a different order
+
+        :param item: The item whose dependencies are reordered
+        :param dependencies: The same dependencies, in their new order
+        :raises ValueError: If the dependencies aren't the ones the item has
+        """
+        dependencies = list(dependencies)
+        if dependencies == item.depends_on:
+            return
+        if len(dependencies) != len(item.depends_on) or set(dependencies) != set(item.depends_on):
+            raise ValueError("Only the order of the dependencies can be changed")
+        before = list(item.depends_on)
+        item.depends_on[:] = dependencies
+        self.generation += 1
+        if item not in self._unmet:
+            return
+        self.journal.record(DependencyOrderEdit(item, before, dependencies))
+        self._pending.add(FieldsChanged(item))
+        self._notify()
 
     def add_item(self, item:KanbanItem) -> None:
         """
@@ -277,8 +1308,33 @@ class KanbanBoard:
         
         :param item: The item to add
         """
-        self.items.append(item)
+        self._insert(item)
         item.board=self
+        self.generation += 1
+        self._structure_generation += 1
+        self._dependents.setdefault(item, set())
+        self._index_dependencies(item)
+        if self._topo_order is not None:
+            self._topo_order[item] = self._next_order
+            self._next_order += 1
+        self._adopt_waiting(item)
+        self._index_categories(item)
+        self._text_generation += 1
+        if self._trigrams is not None:
+            self._index_text(item)
+        self.journal.record(ItemAdd(item))
+        self._pending.add(ItemAdded(item))
+        self._notify()
+
+    def add_items(self, items: Iterable[KanbanItem]) -> None:
+        """
+        Add many items at once, listeners are notified a single time.
+
+        :param items: The items to add
+        """
+        with self.batch():
+            for i in items:
+                self.add_item(i)
 
     def remove_item(self, item:KanbanItem)->None:
         """
@@ -286,19 +1342,43 @@ class KanbanBoard:
         
         :param item: The kanban item being removed
         """
-        if item not in self.items:
+        if item not in self._dependents:
             return
-        item_dx=self.items.index(item)
-        del self.items[item_dx]
-        if item.widget is not None:
-            for i in item.widget:
-                i.parent().layout().removeWidget(i)
-                i.deleteLater()
-        for i in self.items:
-            if item not in i.depends_on:
-                continue
-            item_dx = i.depends_on.index(item)
-            del i.depends_on[item_dx]
+        self.journal.record(ItemRemove(item, [(i, i.depends_on.index(item)) for i in self._dependents[item]]))
+        del self._items[item.id]
+        self.generation += 1
+        self._structure_generation += 1
+        for i in self._dependents.pop(item):
+            i.depends_on.remove(item)
+            self._pending.add(FieldsChanged(i))
+            if not item.completed:
+                self._adjust_unmet(i, -1)
+        for i in item.depends_on:
+            if i in self._dependents:
+                self._dependents[i].discard(item)
+            else:
+                self._unwait(item, i)
+        del self._unmet[item]
+        self._state_changes.discard(item)
+        self._state_items[self._item_state.pop(item)].discard(item)
+        if self._topo_order is not None:
+            del self._topo_order[item]
+        self._unindex_categories(item)
+        self._text_generation += 1
+        if self._trigrams is not None:
+            self._unindex_text(item)
+        self._pending.add(ItemRemoved(item))
+        self._notify()
+
+    def remove_items(self, items: Iterable[KanbanItem]) -> None:
+        """
+        Remove many items at once, listeners are notified a single time.
+
+        :param items: The items to remove
+        """
+        with self.batch():
+            for i in list(items):
+                self.remove_item(i)
 
     def trim_unused_categories(self)->Set[str]:
         """
@@ -306,10 +1386,7 @@ class KanbanBoard:
         
         :returns: A list of removed categories.
         """
-        seen: Set[str] = set()
-        for item in self.items:
-            seen = seen.union(item.category)
-        not_used = self.categories.difference(seen)
+        not_used = {i for i in self.categories if i not in self._category_items}
         for i in not_used:
             if i in self.category_data.keys():
                 del self.category_data[i]
@@ -318,7 +1395,12 @@ class KanbanBoard:
 
     def save(self, filename: str, update_stored: bool = True) -> None:
         """
-        Save the kanban board to a file
+        Save the kanban board to a file. Files ending in .json are written
+        as JSON, files ending in .kblog as a :class:`pykanban.savelog.SaveLog`,
+        files ending in .kbdb as a :class:`pykanban.database.BoardDatabase`,
+        files ending in .kbb in the binary format of
+        :class:`pykanban.binaryformat.BinaryBoardFile` and anything else is
+        pickled.
         
         :param filename: The file that will be dumped to
         :param update_stored: Update the filename stored in the file
@@ -331,6 +1413,21 @@ class KanbanBoard:
         if filename.endswith('.json') or filename.endswith('.json.bak'):
             self.export(filename)
             return
+        from pykanban.binaryformat import BinaryBoardFile, is_binary_file
+        if is_binary_file(filename):
+            BinaryBoardFile.write(self, filename)
+            return
+        from pykanban.savelog import SaveLog, is_log_file
+        from pykanban.database import BoardDatabase, is_database_file
+        saver = self._savers.get(filename)
+        if saver is None:
+            if is_log_file(filename):
+                saver = self._savers[filename] = SaveLog(self, filename)
+            elif is_database_file(filename):
+                saver = self._savers[filename] = BoardDatabase(self, filename)
+        if saver is not None:
+            saver.save()
+            return
         with open(filename, 'wb') as f:
             thing = pickle.dumps(self)
             f.write(thing)
@@ -339,11 +1436,24 @@ class KanbanBoard:
         if KanbanBoard.Encoder is None:
             from pykanban.serializers import KanbanBoardEncoder
             KanbanBoard.Encoder = KanbanBoardEncoder
-        js = json.dumps(self,cls=KanbanBoard.Encoder)
+        # Written as it is encoded, rather than as one string
         with open(filename, 'w') as f:
-            f.write(js)
+            for chunk in KanbanBoard.Encoder().iterencode(self):
+                f.write(chunk)
 
-    def _fix_missing(self)->None:
+    def validate(self, repair: bool = False) -> ValidationReport:
+        """
+        Check the board for duplicate items, dependencies on items that
+        aren't on it, dependency cycles and styling for missing categories.
+        See :func:`pykanban.validate.validate`.
+
+        :param repair: Whether to fix what was found
+        :returns: What was found
+        """
+        from pykanban.validate import validate
+        return validate(self, repair)
+
+    def _fix_missing(self)->Optional[ValidationReport]:
         """
         This ended up being necessary to get categories working 
         in older save files. This may continue to be necessary, or it may 
@@ -351,89 +1461,118 @@ class KanbanBoard:
 
         In either case, it provides some way of enabling new features on
         old saves, so that's quite nice.
+
+        Boards from before the current :data:`SCHEMA_VERSION` are also
+        validated and repaired.
+
+        :returns: The validation report, or None if the board was already
+            at the current schema version
         """
         from pykanban.taskcategory import CategoryData
-        from PySide2.QtGui import QColor
         if not hasattr(self,'categories'):
             self.categories=set()
             self.category_data=dict()
         for name,val in self.category_data.items():
-            if isinstance(val,QColor):
+            # Older saves had a bare color for each category
+            if not isinstance(val,CategoryData):
                 self.category_data[name]=CategoryData(val,None)
-        seen = set()
-        for i in self.items:
-            if id(i) in seen:
-                print("Found duplicate")
-                del i
-            else:
-                seen.add(id(i))
-
-        stack = list(self.items)
-        while len(stack)>0:
-            item = stack.pop()
-            if item not in self.items:
-                print("Found disconnected item")
-            for i in item.depends_on:
-                stack.append(i)
+        if self.schema_version >= SCHEMA_VERSION:
+            return None
+        report = self.validate(repair=True)
+        for i in report.describe():
+            print(i)
+        self.schema_version = SCHEMA_VERSION
+        return report
 
     Encoder = None
     Decoder = None
 
     @staticmethod
-    def load(filename: str) -> KanbanBoard:
+    def load(filename: str, progress: Callable[[int, int], None] = None) -> KanbanBoard:
         """
         Load a kanbanboard from a file
         
         :param filename: The filename to load the kanban board from
+        :param progress: Called with the number of bytes read and the size
+            of the file as a JSON board is read
         """
-        if filename.endswith(".json") or filename.endswith('.json.bak'):
-            ret = KanbanBoard.loadJson(filename)
-        else:
-            from pykanban.serializers import KanbanUnpickler
-            with open(filename, 'rb') as f:
-                ret = KanbanUnpickler(f).load()
-                ret._fix_missing()
+        from pykanban.savelog import SaveLog, is_log_file
+        from pykanban.database import BoardDatabase, is_database_file
+        from pykanban.binaryformat import BinaryBoardFile, is_binary_file
+        import gc
+        # Nothing made while loading is garbage, but the collector would
+        # still walk the half built board each time enough objects were made
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            if filename.endswith(".json") or filename.endswith('.json.bak'):
+                ret = KanbanBoard.loadJson(filename, progress)
+            elif is_binary_file(filename):
+                ret = BinaryBoardFile.load(filename)
+            elif is_log_file(filename):
+                ret = SaveLog.load(filename)
+            elif is_database_file(filename):
+                ret = BoardDatabase.load(filename)
+            else:
+                from pykanban.serializers import KanbanUnpickler
+                with open(filename, 'rb') as f:
+                    ret = KanbanUnpickler(f).load()
+        finally:
+            if collecting:
+                gc.enable()
+        ret._fix_missing()
         if filename.endswith('.bak'):
             filename = filename[0:-4]
         ret.filename = filename
         return ret
 
     @staticmethod
-    def loadJson(filename: str) -> KanbanBoard:
+    def loadJson(filename: str, progress: Callable[[int, int], None] = None) -> KanbanBoard:
+        """
+        Load a kanbanboard from a JSON file, an item at a time. See
+        :class:`pykanban.serializers.BoardReader`.
+
+        :param filename: The filename to load the kanban board from
+        :param progress: Called with the number of bytes read and the size of the file
+        """
         if KanbanBoard.Decoder is None:
-            from pykanban.serializers import as_kanban_board
-            KanbanBoard.Decoder = as_kanban_board
-        with open(filename, 'r') as f:
-            return json.load(f, object_hook=KanbanBoard.Decoder)
+            from pykanban.serializers import BoardReader
+            KanbanBoard.Decoder = BoardReader
+        with open(filename, 'rb') as f:
+            return KanbanBoard.Decoder(f, progress).read()
+
+    def writeGraphViz(self, out: TextIO, root: KanbanItem = None, dependents: bool = False,
+                      collapsed: Collection[KanbanItem] = (), hide_completed: bool = False) -> None:
+        """
+        Write a directed graph of the items in the dot language, a piece
+        at a time. The last export is kept, so exporting the same thing
+        again before the board changes only writes out the kept text.
+        See :func:`pykanban.dotexport.exported_items` for the options.
+
+        :param out: Where to write the graph, anything with a write method
+        """
+        from pykanban.dotexport import dot_chunks
+        key = (self.generation, self._text_generation, root, dependents,
+               frozenset(collapsed), hide_completed)
+        cache = self._dot_cache
+        if cache is not None and cache[0] == key:
+            out.write(cache[1])
+            return
+        chunks = []
+        for i in dot_chunks(self, root, dependents, collapsed, hide_completed):
+            out.write(i)
+            chunks.append(i)
+        self._dot_cache = (key, "".join(chunks))
 
-    def toGraphViz(self) -> str:
+    def toGraphViz(self, root: KanbanItem = None, dependents: bool = False,
+                   collapsed: Collection[KanbanItem] = (), hide_completed: bool = False) -> str:
         """
         Create a directed graph based on the current item tree.
 
         :returns: The a string with the dot language 
         corresponding to the kanbanboard
         """
-        lines = ["digraph G{"]
-        ids = {v: idx for idx, v in enumerate(self.items)}
-        for i in self.items:
-            desc = i.description.replace("\n", "<br/>")
-            color=""
-            if i.completed:
-                color='green'
-            elif i.state() == ItemState.BLOCKED:
-                color='red'
-            if color != '':
-                color=f"bgcolor=\"{color}\""
-            table = f"<TABLE {color}><tr><td>{i.name}</td></tr>"
-            if i.description != "":
-                table+=f"<tr><td>{desc}</td></tr>"
-            table+="</TABLE>"
-            declaration = f"""
-            \t{ids[i]}[shape=none,label=<{table}>]
-            """
-            lines.append(declaration)
-        for i in self.items:
-            edges = f"{ids[i]} -> {{{','.join([str(ids[j]) for j in i.depends_on])}}};"
-            lines.append(edges)
-        lines+=["}"]
-        return "\n".join(lines)
+        from io import StringIO
+        out = StringIO()
+        self.writeGraphViz(out, root, dependents, collapsed, hide_completed)
+        return out.getvalue()
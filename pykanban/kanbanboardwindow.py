@@ -1,6 +1,6 @@
 from __future__ import annotations
 from PySide2.QtWidgets import *
-from PySide2.QtCore import Qt, QSettings, QTimer
+from PySide2.QtCore import Qt, QSettings, QTimer, Signal
 from PySide2.QtGui import QKeySequence, QCloseEvent
 from pykanban.kanban import *
 from pykanban.kanbanwidget import KanbanWidget
@@ -9,10 +9,16 @@ from pykanban.categorylist import CategoryEditor
 from pykanban.treeview import TreeView
 from typing import *
 from pickle import PicklingError
+from threading import Thread
 from pykanban.abstractview import AbstractView
+from pykanban.query import Query
 from pykanban.optioneditor import OptionDialog
 from pykanban.widgets.labeled_column import LabeledColumn
 
+#: The formats boards can be opened from
+OPEN_FILTER = ("Kanban Boards JSON (*.kb.json);;Kanban Boards(*.kb);;Kanban Boards Log (*.kblog);;"
+               "Kanban Boards Database (*.kbdb);;Kanban Boards Binary (*.kbb)")
+
 
 class StatusView(QFrame, AbstractView):
     """
@@ -20,10 +26,13 @@ class StatusView(QFrame, AbstractView):
     to be done, blocked, or completed.
     """
     kanbanWidgets: List[KanbanWidget]
+    #: The widget displaying each item in this view
+    itemWidgets: Dict[KanbanItem, KanbanWidget]
 
     def __init__(self, parent=None, board: KanbanBoard = None):
         super(StatusView, self).__init__(None)
         self.kanbanWidgets = []
+        self.itemWidgets = {}
         self.board = board
         self.mainlayout = QHBoxLayout()
         self.setLayout(self.mainlayout)
@@ -51,59 +60,106 @@ class StatusView(QFrame, AbstractView):
         return selection
 
     def addKanbanItem(self, k: KanbanItem) -> None:
-        state = k.state()
-        widg = KanbanWidget(None, k)
-        self.kanbanWidgets.append(widg)
-        self.selectColumn(state).addWidget(widg)
-        widg.updateDisplay()
-        widg.changed.connect(self.widgetChange)
-        self.setWindowModified(True)
-        parent = self.window()
-        if parent is not None:
-            parent.setWindowModified(True)
+        self.addKanbanItems([k])
 
-    def removeFrom(self, widget: QWidget, state: ItemState) -> None:
-        self.layout().removeWidget(widget)
+    def addKanbanItems(self, items: Iterable[KanbanItem]) -> None:
+        """
+        Create widgets for a number of items, only sorting each column once.
 
-    def addTo(self, widget: QWidget, state: ItemState) -> None:
-        self.selectColumn(state).addWidget(widget)
+        :param items: The items to add
+        """
+        columns = set()
+        states = self.board.states()
+        for k in items:
+            widg = self.makeWidget(k)
+            column = self.selectColumn(states[k])
+            column.widgetArea.addWidget(widg)
+            columns.add(column)
+        for i in columns:
+            i.sort_widgets()
+
+    def makeWidget(self, k: KanbanItem) -> KanbanWidget:
+        widg = KanbanWidget(None, k)
+        self.kanbanWidgets.append(widg)
+        self.itemWidgets[k] = widg
+        return widg
 
-    def widgetChange(self, widget: QWidget, fromState: ItemState, toState: ItemState) -> None:
+    def pageItems(self) -> None:
         """
-        Handle the aftermath of a kanbanwidget's update, move it to the 
-        correct column, place it in the correct spot in the column, etc
-        
-        :param widget: The widget being changed
-        :param fromState: The previous state of the widget
-        :param toState: The new state of the widget
+        Hand each column its items in order of priority, to be paged in as
+        it is scrolled, rather than making a widget for every item up front.
+        Only read only boards are shown this way, since nothing has to be
+        moved between columns once it is shown.
         """
-        print(f"{widget.item.name}: {fromState}->{toState}")
+        states = self.board.states()
+        columns = {i: [] for i in (self.availableColumn, self.completedColumn, self.blockedColumn)}
+        for k in self.board.items:
+            columns[self.selectColumn(states[k])].append(k)
+        for column, items in columns.items():
+            items.sort(key=lambda x: x.priority)
+            column.setPagedItems(items, self.makeWidget)
+
+    def page_in(self, matches: Container[KanbanItem]) -> None:
+        for i in (self.availableColumn, self.completedColumn, self.blockedColumn):
+            i.pageThrough(matches)
+
+    def itemsRemoved(self, items: Iterable[KanbanItem]) -> None:
+        removed = set()
+        for i in items:
+            widget = self.itemWidgets.pop(i, None)
+            if widget is not None:
+                removed.add(widget)
+                widget.deleteLater()
+        if removed:
+            self.kanbanWidgets = [i for i in self.kanbanWidgets if i not in removed]
+
+    def itemFieldsChanged(self, items: Set[KanbanItem]) -> None:
+        """
+        Redisplay edited items, reordering their columns since the priority
+        may have changed.
 
-        if fromState == toState:
-            # Although the item may not have changed column,
-            # the column may still need reordering
-            self.selectColumn(fromState).sort_widgets()
-            return
-        self.removeFrom(widget, fromState)
-        self.addTo(widget, toState)
+        :param items: The edited items
+        """
+        columns = set()
+        for i in items:
+            widget = self.itemWidgets.get(i)
+            if widget is not None:
+                widget.updateDisplay()
+                columns.add(self.selectColumn(i.state()))
+        for i in columns:
+            i.sort_widgets()
+
+    def itemStatesChanged(self, items: Set[KanbanItem]) -> None:
+        """
+        Move the widgets of items whose state changed to their new columns.
 
-        if toState == ItemState.COMPLETED:
-            # AT some point it would be wise to accelerate this search somewhat, since it's linear time
-            # Ofc, this is probably more than enough for most things :)
-            for i in self.kanbanWidgets:
-                if widget.item in i.item.depends_on:
-                    self.widgetChange(i, ItemState.BLOCKED, i.item.state())
+        :param items: The items that changed, as reported by the board
+        """
+        columns = set()
+        for i in items:
+            widget = self.itemWidgets.get(i)
+            if widget is None:
+                continue
+            widget.updateDisplay()
+            column = self.selectColumn(i.state())
+            column.widgetArea.addWidget(widget)
+            columns.add(column)
+        for i in columns:
+            i.sort_widgets()
 
     def populate(self) -> None:
         if self.board is None:
             return
-        for i in self.board.items:
-            self.addKanbanItem(i)
+        if self.board.read_only:
+            self.pageItems()
+        else:
+            self.addKanbanItems(self.board.items)
 
-    def updateCategories(self) -> None:
-        for i in self.kanbanWidgets:
-            if len(i.item.category) > 0:
-                i.updateDisplay()
+    def updateCategories(self, items: Iterable[KanbanItem]) -> None:
+        for i in items:
+            widget = self.itemWidgets.get(i)
+            if widget is not None:
+                widget.updateDisplay()
 
     def newBoard(self, board: KanbanBoard) -> None:
         """
@@ -113,6 +169,9 @@ class StatusView(QFrame, AbstractView):
             self.layout().removeWidget(i)
             i.deleteLater()
         self.kanbanWidgets.clear()
+        self.itemWidgets.clear()
+        for i in (self.availableColumn, self.completedColumn, self.blockedColumn):
+            i.clearPages()
         self.board = board
         self.populate()
 
@@ -138,10 +197,13 @@ class StatusView(QFrame, AbstractView):
 
 class QueueView(LabeledColumn, AbstractView):
     kanbanWidgets: List[KanbanWidget]
+    #: The widget displaying each item in this view
+    itemWidgets: Dict[KanbanItem, KanbanWidget]
 
     def __init__(self, parent: QWidget = None, board: KanbanBoard = None):
         super(QueueView, self).__init__("", parent)
         self.kanbanWidgets = []
+        self.itemWidgets = {}
         self.board = board
         self.matching = []
         self.last_filter = None
@@ -151,34 +213,77 @@ class QueueView(LabeledColumn, AbstractView):
         return self.tr("Queue")
 
     def newBoard(self, board) -> None:
+        self.board = board
         for i in self.widgetArea.children():
             i.deleteLater()
             self.widgetArea.removeWidget(i)
+        self.itemWidgets.clear()
+        self.clearPages()
         self.populate()
 
     def widgetChange(self, widget: KanbanWidget) -> None:
-        widget.setVisible(not (widget.item.completed or widget.item.blocked()))
+        widget.setVisible(widget.item.state() == ItemState.AVAILABLE)
+
+    def itemStatesChanged(self, items: Set[KanbanItem]) -> None:
+        for i in items:
+            widget = self.itemWidgets.get(i)
+            if widget is not None:
+                widget.updateDisplay()
+                self.widgetChange(widget)
 
     def populate(self) -> None:
         if self.board is None:
             return
-        for i in self.board.items:
-            widget = KanbanWidget(self, i)
-            widget.setVisible(not (widget.item.completed or widget.item.blocked()))
-            self.addWidget(widget)
+        if self.board.read_only:
+            # Nothing will become available later, so only the available
+            # items are needed, and they are paged in as the queue is scrolled
+            states = self.board.states()
+            items = [i for i in self.board.items if states[i] == ItemState.AVAILABLE]
+            items.sort(key=lambda x: x.priority)
+            self.setPagedItems(items, self.makeWidget)
+        else:
+            self.addKanbanItems(self.board.items)
+
+    def page_in(self, matches: Container[KanbanItem]) -> None:
+        self.pageThrough(matches)
 
     def scroll_to_result(self, item:KanbanWidget):
         self.ensureWidgetVisible(item)
 
     def addKanbanItem(self, k: KanbanItem) -> None:
-        widg = KanbanWidget(kbi=k)
-        widg.setVisible(not (widg.item.completed or widg.item.blocked()))
-        self.addWidget(widg)
-
-    def updateCategories(self) -> None:
-        for i in self.findChildren(KanbanWidget):
-            if len(i.item.category) > 0:
-                i.updateDisplay()
+        self.addKanbanItems([k])
+
+    def addKanbanItems(self, items: Iterable[KanbanItem]) -> None:
+        available = self.board.items_in_state(ItemState.AVAILABLE)
+        for i in items:
+            widget = self.makeWidget(i)
+            widget.setVisible(i in available)
+            self.widgetArea.addWidget(widget)
+        self.sort_widgets()
+
+    def makeWidget(self, i: KanbanItem) -> KanbanWidget:
+        widget = KanbanWidget(self, i)
+        self.itemWidgets[i] = widget
+        return widget
+
+    def itemsRemoved(self, items: Iterable[KanbanItem]) -> None:
+        for i in items:
+            widget = self.itemWidgets.pop(i, None)
+            if widget is not None:
+                widget.deleteLater()
+
+    def itemFieldsChanged(self, items: Set[KanbanItem]) -> None:
+        for i in items:
+            widget = self.itemWidgets.get(i)
+            if widget is not None:
+                widget.updateDisplay()
+        self.sort_widgets()
+
+    def updateCategories(self, items: Iterable[KanbanItem]) -> None:
+        for i in items:
+            widget = self.itemWidgets.get(i)
+            if widget is not None:
+                widget.updateDisplay()
 
     def get_eligible_widgets(self) -> List[KanbanWidget]:
         return list(filter(lambda x: x.isVisible(), self.findChildren(KanbanWidget)))
@@ -198,6 +303,10 @@ class KanbanBoardWidget(QFrame):
     #: A list of views that are populated from the 
     #: board and updated accordingly
     views: List[Union[TreeView, QueueView, StatusView]]
+    #: Builds the board's search index a slice at a time while idle
+    indexTimer: QTimer
+    #: How many items are indexed each time the index timer fires
+    INDEX_STEP = 500
 
     def __init__(self, k: KanbanBoard):
         super(KanbanBoardWidget, self).__init__()
@@ -229,6 +338,9 @@ class KanbanBoardWidget(QFrame):
         self.searchText.returnPressed.connect(self.update_search_indicators)
         self.searchText.setClearButtonEnabled(True)
 
+        self.searchText.setToolTip(self.tr(
+            'Search by text, or narrow down with category:name, state:blocked, '
+            'priority:high, "exact phrase", and -term to exclude'))
         labelledLayout.addRow(self.tr("Search"), self.searchText)
 
         searchNext = QPushButton(self.tr("Next"))
@@ -247,7 +359,12 @@ class KanbanBoardWidget(QFrame):
         labelledLayout.addWidget(buttonPanel)
         utilityLayout.addLayout(labelledLayout)
 
+        self.indexTimer = QTimer(self)
+        self.indexTimer.setInterval(0)
+        self.indexTimer.timeout.connect(self.buildSearchIndex)
+
         self.board = k
+        self.connectBoard()
         self.kanbanWidgets = []
         self.tab_container = QTabWidget()
         for i in self.views:
@@ -273,6 +390,39 @@ class KanbanBoardWidget(QFrame):
         for i in self.views:
             i.addKanbanItem(k)
 
+    @staticmethod
+    def scheduleDelivery(flush: Callable[[], None]) -> None:
+        """
+        Have the board's changes delivered on the next iteration of the event
+        loop, so that everything changed in response to one user action
+        reaches the views together.
+        """
+        QTimer.singleShot(0, flush)
+
+    def boardChanged(self, changes: ChangeSet) -> None:
+        """
+        Pass a set of changes from the board on to the views, so that each
+        of them only updates once per batch of changes.
+
+        :param changes: The changes made to the board
+        """
+        if changes.removed:
+            for i in self.views:
+                i.itemsRemoved(changes.removed)
+        if changes.added:
+            for i in self.views:
+                i.addKanbanItems(changes.added)
+        if changes.fields:
+            for i in self.views:
+                i.itemFieldsChanged(changes.fields)
+        if changes.states:
+            for i in self.views:
+                i.itemStatesChanged(changes.states)
+        if changes.styled:
+            self.updateCategories(changes.styled)
+        if changes.added or changes.removed or changes.fields:
+            self.window().setWindowModified(True)
+
     def populate(self) -> None:
         for v in self.views:
             v.populate()
@@ -281,8 +431,7 @@ class KanbanBoardWidget(QFrame):
         """
         Dispatch filterChanged to each view
         """
-        query = self.searchText.text()
-        # board.for_each_by_matching(lambda x,y: (x.setVisible(y) for i in x.widget),query)
+        query = Query.parse(self.searchText.text())
         for i in self.views:
             i.filterChanged(query)
 
@@ -295,25 +444,82 @@ class KanbanBoardWidget(QFrame):
 
     def openNewItem(self, k: KanbanItem) -> None:
         dialog = KanbanItemDialog(self, None, kbb=self.board)
-        dialog.NewItem.connect(self.addKanbanItem)
         dialog.show()
 
     def openCategoryEditor(self) -> None:
         c = CategoryEditor(self.board, self)
         c.show()
-        c.finished.connect(self.updateCategories)
 
-    def updateCategories(self) -> None:
+    def updateCategories(self, categories: Iterable[str]) -> None:
+        """
+        Restyle the widgets of the items in the given categories
+
+        :param categories: The categories whose styling changed
+        """
+        items = set()
+        for i in categories:
+            items |= self.board.items_in_category(i)
+        if not items:
+            return
         for i in self.views:
-            i.updateCategories()
+            i.updateCategories(items)
 
     def newBoard(self, board: KanbanBoard) -> None:
+        self.disconnectBoard()
+        self.board = board
+        self.connectBoard()
         for i in self.views:
             i.newBoard(board)
 
+    def connectBoard(self) -> None:
+        """
+        Start following the board's changes, unless it is read only and so
+        has none. Adding items and editing categories are only offered for
+        boards that can be edited.
+        """
+        self.addItem.setEnabled(not self.board.read_only)
+        self.categoryButton.setEnabled(not self.board.read_only)
+        if self.board.read_only:
+            return
+        self.board.events.scheduler = self.scheduleDelivery
+        self.board.subscribe(self.boardChanged)
+        self.applyUndoDepth()
+        self.indexTimer.start()
+
+    def disconnectBoard(self) -> None:
+        self.indexTimer.stop()
+        if self.board.read_only:
+            return
+        self.board.unsubscribe(self.boardChanged)
+        self.board.events.scheduler = None
+
+    def buildSearchIndex(self) -> None:
+        """
+        Index the next slice of the board for searching, so that the first
+        search doesn't have to index the whole board
+        """
+        if self.board.read_only or self.board.build_search_index(self.INDEX_STEP):
+            self.indexTimer.stop()
+
+    def applyUndoDepth(self) -> None:
+        """
+        Limit the board's undo history to the configured number of steps
+        """
+        from pykanban.settingNames import UNDO_DEPTH
+        if self.board.read_only:
+            return
+        self.board.journal.depth = QSettings().value(UNDO_DEPTH, 100, int)
+
 
 class KanbanBoardWindow(QMainWindow):
     kanban: KanbanBoardWidget
+    #: The actions that change the board, disabled while a read only board is open
+    editActions: List[QAction]
+    #: Emitted from the autosave thread with the file it wrote and an error
+    #: message, which is empty if it succeeded
+    autosaveFinished = Signal(str, str)
+    #: Whether an autosave is still being written
+    autosaving: bool
 
     def __init__(self, kb: KanbanBoard = None):
         super(KanbanBoardWindow, self).__init__()
@@ -339,12 +545,30 @@ class KanbanBoardWindow(QMainWindow):
         load = filemenu.addAction(self.tr("Load"))
         load.triggered.connect(self.openLoad)
 
+        loadReadOnly = filemenu.addAction(self.tr("Open Read Only"))
+        loadReadOnly.triggered.connect(self.openReadOnly)
+
+        editmenu = mb.addMenu(self.tr("Edit"))
+
+        undo = editmenu.addAction(self.tr("Undo"))
+        undo.triggered.connect(self.undo)
+        undo.setShortcut(QKeySequence.Undo)
+
+        redo = editmenu.addAction(self.tr("Redo"))
+        redo.triggered.connect(self.redo)
+        redo.setShortcut(QKeySequence.Redo)
+
         boardmenu = mb.addMenu(self.tr("Board"))
 
         addItem = boardmenu.addAction(self.tr("add item"))
         addItem.triggered.connect(self.kanban.openNewItem)
         addItem.setShortcut(QKeySequence("Ctrl+a"))
 
+        self.editActions = [save, saveAs, undo, redo, addItem]
+
+        exportGraph = boardmenu.addAction(self.tr("Export Tree as GraphViz"))
+        exportGraph.triggered.connect(self.exportGraphViz)
+
         search_shortcut = QShortcut(QKeySequence("Ctrl+F"), self)
         search_shortcut.activated.connect(self.selectSearchBar)
 
@@ -356,8 +580,11 @@ class KanbanBoardWindow(QMainWindow):
         self.autosave_timer.setInterval(1000 * QSettings().value("Recovery/Interval", 120, int))
         self.autosave_timer.timeout.connect(self.autosave)
         self.autosave_timer.start()
+        self.autosaving = False
+        self.autosaveFinished.connect(self.autosaveDone)
         # self.setWindowModified(True)
         self.updateTitle()
+        self.updateEditActions()
         self.prompt_to_recover()
 
         self.restore_view_settings()
@@ -373,6 +600,7 @@ class KanbanBoardWindow(QMainWindow):
                                           QMessageBox.Yes | QMessageBox.No)
             if choice == QMessageBox.Yes:
                 self.kanban.newBoard(KanbanBoard.load(self.kanban.board.filename + '.bak'))
+                self.updateEditActions()
 
     def open_settings(self):
         settings_dialog = OptionDialog(self)
@@ -383,6 +611,15 @@ class KanbanBoardWindow(QMainWindow):
         if code == QDialog.Rejected:
             return
         self.autosave_timer.setInterval(1000 * QSettings().value("Recovery/Interval", 100, int))
+        self.kanban.applyUndoDepth()
+
+    def undo(self):
+        if self.kanban.board.journal.undo():
+            self.setWindowModified(True)
+
+    def redo(self):
+        if self.kanban.board.journal.redo():
+            self.setWindowModified(True)
 
     def updateTitle(self):
         """
@@ -393,9 +630,18 @@ class KanbanBoardWindow(QMainWindow):
             title += f": {self.kanban.board.filename}"
         else:
             title += ": Unsaved Document"
+        if self.kanban.board.read_only:
+            title += self.tr(" (Read Only)")
         title += '[*]'
         self.setWindowTitle(title)
 
+    def updateEditActions(self) -> None:
+        """
+        Only allow the board to be changed or saved if it can be edited
+        """
+        for i in self.editActions:
+            i.setEnabled(not self.kanban.board.read_only)
+
     def selectSearchBar(self):
         if self.kanban.searchText.hasFocus():
             if self.kanban.searchText.selectionLength() > 0:
@@ -404,7 +650,9 @@ class KanbanBoardWindow(QMainWindow):
         self.kanban.searchText.setFocus(Qt.ShortcutFocusReason)
 
     def getSaveFilename(self) -> str:
-        thing = QFileDialog.getSaveFileName(filter="Kanban Boards (JSON) (*.kb.json);;Kanban Boards (*.kb)")
+        thing = QFileDialog.getSaveFileName(
+            filter="Kanban Boards (JSON) (*.kb.json);;Kanban Boards (*.kb);;Kanban Boards (Log) (*.kblog);;"
+                   "Kanban Boards (Database) (*.kbdb);;Kanban Boards (Binary) (*.kbb)")
         print(thing)
         filename: str = thing[0]
         if filename == '':
@@ -412,6 +660,15 @@ class KanbanBoardWindow(QMainWindow):
 
         if thing[1] == 'Kanban Boards (*.kb)' and not filename.endswith('.kb'):
             filename += ".kb"
+        elif thing[1] == 'Kanban Boards (Log) (*.kblog)':
+            if not filename.endswith('.kblog'):
+                filename += ".kblog"
+        elif thing[1] == 'Kanban Boards (Database) (*.kbdb)':
+            if not filename.endswith('.kbdb'):
+                filename += ".kbdb"
+        elif thing[1] == 'Kanban Boards (Binary) (*.kbb)':
+            if not filename.endswith('.kbb'):
+                filename += ".kbb"
         elif not filename.endswith('.kb.json'):
             filename += ".kb.json"
         print(filename)
@@ -456,19 +713,63 @@ class KanbanBoardWindow(QMainWindow):
 
     def autosave(self):
         """
-        Save the document if the document has changed and autosaving is enabled
+        Save the document if the document has changed and autosaving is enabled.
+
+        Only a snapshot of the board is taken here, it is written out on
+        another thread so that the window stays responsive, and the board
+        can go on being edited in the meantime.
         """
-        import gc
-        gc.collect()
+        from pykanban.snapshot import BoardSnapshot
+        if self.autosaving:
+            # The last one is still being written, this one can wait for the next tick
+            return
+        if self.kanban.board.read_only:
+            return
         if self.isWindowModified() and bool(QSettings().value("Recovery/AutoSave", False, bool)):
             print("Autosaving :D")
             self.persist_view_settings()
             if self.kanban.board.filename is not None:
-                try:
-                    self.kanban.board.save(self.kanban.board.filename + '.bak', False)
-                except PicklingError:
-                    QErrorMessage.showMessage("Failed to save, sorry :(")
-                print("Autosaved :)")
+                snapshot = BoardSnapshot(self.kanban.board)
+                self.autosaving = True
+                Thread(target=self.writeAutosave, args=(snapshot, self.kanban.board.filename + '.bak'),
+                       daemon=True).start()
+
+    def writeAutosave(self, snapshot, filename: str) -> None:
+        """
+        Write an autosave, runs on its own thread
+
+        :param snapshot: The board as it was when the autosave started
+        :param filename: The file to write
+        """
+        from pykanban.snapshot import save_snapshot
+        try:
+            save_snapshot(snapshot, filename)
+            error = ""
+        except Exception as e:
+            # Anything raised here would otherwise be lost with the thread
+            error = str(e)
+        self.autosaveFinished.emit(filename, error)
+
+    def autosaveDone(self, filename: str, error: str) -> None:
+        self.autosaving = False
+        if error:
+            QErrorMessage(self).showMessage(self.tr("Failed to autosave, sorry :(") + "\n" + error)
+        else:
+            print("Autosaved :)")
+
+    def exportGraphViz(self):
+        """
+        Write the tree view's current tree to a dot file
+        """
+        thing = QFileDialog.getSaveFileName(filter="GraphViz (*.dot)")
+        filename: str = thing[0]
+        if filename == '':
+            return
+        if not filename.endswith('.dot'):
+            filename += '.dot'
+        tree = next(i for i in self.kanban.views if isinstance(i, TreeView))
+        with open(filename, 'w') as f:
+            tree.exportGraphViz(f)
 
     def openSaveAs(self):
         from pykanban.settingNames import LAST_DOCUMENT_USED
@@ -487,7 +788,7 @@ class KanbanBoardWindow(QMainWindow):
 
     def openLoad(self):
         from pickle import UnpicklingError
-        thing = QFileDialog.getOpenFileName(filter="Kanban Boards JSON (*.kb.json);;Kanban Boards(*.kb)")
+        thing = QFileDialog.getOpenFileName(filter=OPEN_FILTER)
         if thing[0] == '':
             return
         try:
@@ -496,9 +797,27 @@ class KanbanBoardWindow(QMainWindow):
             self.kanban.newBoard(new_kanban)
             self.restore_view_settings()
             self.updateTitle()
+            self.updateEditActions()
         except UnpicklingError:
             print("Huh")
 
+    def openReadOnly(self):
+        """
+        Open a board only to look through it. Boards in the binary format
+        are mapped into memory and each item is only read once it is shown,
+        so even very large boards open straight away.
+        """
+        from pykanban.store import BoardStore
+        thing = QFileDialog.getOpenFileName(filter=OPEN_FILTER)
+        if thing[0] == '':
+            return
+        self.kanban.newBoard(BoardStore.load(thing[0], read_only=True))
+        # There is nothing in a read only board to save
+        self.setWindowModified(False)
+        self.restore_view_settings()
+        self.updateTitle()
+        self.updateEditActions()
+
     def newBoard(self):
         """
         Make a new board and clear the old ones.
@@ -506,6 +825,8 @@ class KanbanBoardWindow(QMainWindow):
         """
         kb = KanbanBoard()
         self.kanban.newBoard(kb)
+        self.updateTitle()
+        self.updateEditActions()
 
     def closeEvent(self, event: QCloseEvent) -> None:
         if self.isWindowModified():
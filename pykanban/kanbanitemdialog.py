@@ -243,37 +243,50 @@ class KanbanItemDialog(QDialog):
         """
         if self.hasChanged():
             self.parent().window().setWindowModified(True)
+        with self.board.batch():
+            self.applyChanges()
+        self.accept()
+
+    def applyChanges(self) -> None:
+        """
+        Copy the widget values onto the item. Called within a batch on the
+        board so that the views are only updated once.
+        """
         item = self.item
         item.name = self.nameEdit.text()
         item.description = self.descEdit.toPlainText()
         item.priority = self.prioritySelect.itemData(
             self.prioritySelect.currentIndex())
-        item.depends_on.clear()
-        for i in range(self.dependencyList.count()):
-            item.depends_on.append(self.dependencyList.item(i).data(32))
+        if self.addAtEnd:
+            # The item has to be on the board before the dependents index
+            # can track edges pointing at it.
+            self.board.add_item(item)
+        self.board.set_dependencies(item, [self.dependencyList.item(i).data(32)
+                                           for i in range(self.dependencyList.count())])
         dependentsOf = list(
             map(lambda x: x.data(32), [self.dependentsOfList.item(i) for i in range(self.dependentsOfList.count())]))
 
         for i in self.board.dependents_of(self.item):
-            if item not in dependentsOf:
-                i.depends_on.remove(item)
+            if i not in dependentsOf:
+                self.board.remove_dependency(i, item)
 
         for i in dependentsOf:
-            if item not in i.depends_on:
-                i.depends_on.append(item)
+            self.board.add_dependency(i, item)
 
         from PySide2.QtCore import Qt
         item.completed = self.completed.checkState() == Qt.Checked
 
         if self.category_changeset is not None:
             print(self.category_changeset)
-            item.category.clear()
+            # Only touch the categories that changed, so that the undo
+            # history stays small
+            for cat in list(item.category):
+                if cat not in self.category_changeset:
+                    item.remove_category(cat)
             for cat, val in self.category_changeset.items():
                 item.update_category(cat, val)
         if self.addAtEnd:
-            self.board.add_item(item)
             self.NewItem.emit(item)
-        self.accept()
 
     def add_dependsOn(self) -> None:
         """
@@ -281,17 +294,52 @@ class KanbanItemDialog(QDialog):
         dependencies
         """
         thing = self.dependsOnCombo.currentData()
+        if self.createsCycle(self.item, thing):
+            return
         self.dependsOnCombo.removeItem(self.dependsOnCombo.currentIndex())
         item = QListWidgetItem(thing.short_name(), self.dependencyList)
         item.setText(thing.short_name())
         item.setData(32, thing)
         item.setCheckState(Qt.Checked if thing.completed else Qt.Unchecked)
 
+    def createsCycle(self, item: KanbanItem, dependency: KanbanItem) -> bool:
+        """
+        Check if making item depend on dependency would form a cycle, warning
+        the user if it would.
+
+        The only edges pending in the dialog are this item's own, so a new
+        edge closes a cycle only if it leads back round through one of them.
+        Each of those paths is checked with
+        :meth:`KanbanBoard.would_create_cycle`, which answers from the
+        board's topological order without walking the whole board. The
+        check errs on the side of caution: a path through one of this
+        item's edges that the dialog has removed still counts until the
+        dialog is accepted.
+        """
+        pending_dependents = [self.dependentsOfList.item(i).data(32) for i in range(self.dependentsOfList.count())]
+        pending_dependencies = [self.dependencyList.item(i).data(32) for i in range(self.dependencyList.count())]
+        if item is dependency:
+            cycle = True
+        elif self.board is None:
+            cycle = False
+        elif item is self.item:
+            # Closed if the dependency leads to something that will depend on this item
+            cycle = any(self.board.would_create_cycle(i, dependency) for i in pending_dependents)
+        else:
+            # Closed if something this item will depend on leads to the item gaining the edge
+            cycle = any(self.board.would_create_cycle(item, i) for i in pending_dependencies)
+        if cycle:
+            QMessageBox.warning(self, self.tr("Cycle"),
+                                self.tr("This would make the task depend on itself."))
+        return cycle
+
     def add_dependent_of(self) -> None:
         """
         Handle adding this item to the selected thing
         """
         thing = self.dependentsOfChoice.currentData()
+        if self.createsCycle(thing, self.item):
+            return
         self.dependentsOfChoice.removeItem(self.dependentsOfChoice.currentIndex())
         item = QListWidgetItem(thing.short_name(), self.dependentsOfList)
         item.setText(thing.short_name())
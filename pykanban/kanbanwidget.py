@@ -4,6 +4,7 @@ from pykanban.kanbanitemdialog import *
 import pykanban.settingNames as settingNames
 from PySide2.QtCore import Signal, QEvent, Qt, QSettings
 from PySide2.QtGui import QMouseEvent, QCursor, QPalette, QPixmap, QPaintEvent, QPainter
+from pykanban.qtconvert import ColorFromTuple, PixmapFromIcon
 from typing import Callable
 import re
 
@@ -55,8 +56,6 @@ class KanbanWidget(QFrame):
     """
     #: The kanbanitem that is displayed
     item: KanbanItem
-    #: Invoked when the kanbanitem is changed.
-    changed: Signal = Signal(QWidget, ItemState, ItemState)
     #: The description text editor
     description: QTextEdit
     #: The label that display's the item's name
@@ -80,10 +79,6 @@ class KanbanWidget(QFrame):
         self.setFrameShape(QFrame.StyledPanel)
         self.item = kbi
         self.priorState = self.item.state()
-        if self.item.widget is None:
-            self.item.widget = []
-
-        self.item.widget.append(self)
 
         layout = QVBoxLayout()
         layout.setAlignment(Qt.AlignTop)
@@ -141,6 +136,11 @@ class KanbanWidget(QFrame):
         button_layout.addWidget(createChildButton)
         button_layout.layout().addWidget(complete)
 
+        if self.item.board is not None and self.item.board.read_only:
+            self.name.setToolTip("")
+            for i in (self.editButton, createChildButton, complete):
+                i.setEnabled(False)
+
         layout.addLayout(button_layout)
         self.selected = False
 
@@ -152,8 +152,6 @@ class KanbanWidget(QFrame):
     def complete(self):
         self.item.completed = not self.item.completed
         self.updateDisplay()
-        self.changed.emit(self, Priority.INVALID, self.item.state())
-        self.completeButton.setText(self.tr("Uncomplete" if self.item.completed else "Complete"))
         self.window().setWindowModified(True)
 
     def updateDisplay(self):
@@ -165,6 +163,7 @@ class KanbanWidget(QFrame):
         self.name.updateGeometry()
         self.description.setText(self.item.description)
         self.finished.setChecked(self.item.completed)
+        self.completeButton.setText(self.tr("Uncomplete" if self.item.completed else "Complete"))
         blocked = self.item.blocked()
         self.setFrameShadow(QFrame.Plain if not blocked else QFrame.Sunken)
         if blocked:
@@ -180,15 +179,15 @@ class KanbanWidget(QFrame):
                 data = self.item.board.category_data[category]
                 palette = self.palette()
                 if data.foreground is not None:
-                    foreground: QColor = data.foreground
+                    foreground: QColor = ColorFromTuple(data.foreground)
                     palette.setColor(QPalette.Text, foreground)
                 if data.background is not None:
-                    background = data.background
+                    background = ColorFromTuple(data.background)
                     palette.setColor(QPalette.Window, background)
-                if data.icon is not None:
+                if data.icon_blob is not None:
                     from PySide2.QtGui import QFontMetrics
                     a = self.name.fontMetrics()
-                    self.icon.setPixmap(data.icon.scaled(a.height() * 2, a.height() * 2, Qt.KeepAspectRatio))
+                    self.icon.setPixmap(PixmapFromIcon(data.icon_blob).scaled(a.height() * 2, a.height() * 2, Qt.KeepAspectRatio))
                 else:
                     self.icon.setPixmap(None)
                 # self.setStyleSheet(stylesheet)
@@ -201,6 +200,8 @@ class KanbanWidget(QFrame):
         """
         Handle opening the editing dialog
         """
+        if self.item.board.read_only:
+            return
         self.priorState = self.item.state()
         # The reason we don't use this widget as the parent is because it causes
         # the dialog to adopt the background styling it currently has.
@@ -212,7 +213,6 @@ class KanbanWidget(QFrame):
         dialog = KanbanItemDialog(parent, self.item, self.item.board)
         if bool(QSettings().value(settingNames.USE_CATEGORY_STYLING)):
             dialog.setPalette(self.palette())
-        dialog.finished.connect(self.finishDialog)
         dialog.show()
 
     def createChildTask(self) -> None:
@@ -221,21 +221,8 @@ class KanbanWidget(QFrame):
         lw = QListWidgetItem(self.item.name, dialog.dependentsOfList)
         lw.setData(32, self.item)
         dialog.dependentsOfList.addItem(lw)
-        dialog.NewItem.connect(self.window().kanban.addKanbanItem)
-        dialog.finished.connect(self.finishDialog)
         dialog.show()
 
-    def finishDialog(self, code):
-        """
-        Handle the editing dialog being closed, if it's accepted
-        then it must also update the widget displays and emit a
-        'changed' signal
-
-        :param code: The way that this dialog finished, Accepted, Rejected, etc
-        """
-        if code == QDialog.Accepted:
-            self.item.markChanged()
-
     def set_selected(self, sel: bool = True):
         self.selected = sel
         self.update()
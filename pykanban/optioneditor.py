@@ -81,7 +81,7 @@ class OptionWidget(QWidget):
 
 class OptionDialog(QDialog):
     def __init__(self, parent=None):
-        from pykanban.settingNames import AUTOSAVE_ENABLED, AUTOSAVE_INTERVAL, RESTORE_VIEW_SETTINGS
+        from pykanban.settingNames import AUTOSAVE_ENABLED, AUTOSAVE_INTERVAL, RESTORE_VIEW_SETTINGS, UNDO_DEPTH
         super(OptionDialog, self).__init__(parent)
 
         self.setLayout(QVBoxLayout())
@@ -96,6 +96,8 @@ class OptionDialog(QDialog):
         self.layout().addWidget(OptionWidget(RESTORE_VIEW_SETTINGS, self.tr("Restore View Settings"),
                                              """Restore view settings on save.
                                              """, bool))
+        self.layout().addWidget(OptionWidget(UNDO_DEPTH, self.tr("Undo Depth"),
+                                             "How many changes can be undone.", (int, 1, 10000)))
         accept_button = QPushButton(self.tr("&Accept"))
         accept_button.clicked.connect(self.update_settings)
         accept_button.clicked.connect(self.accept)
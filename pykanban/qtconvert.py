@@ -0,0 +1,43 @@
+from PySide2.QtGui import QColor, QPixmap
+from PySide2.QtCore import QByteArray, QBuffer, QIODevice
+from functools import lru_cache
+from pykanban.taskcategory import Color, IconBlob
+
+
+def ColorToTuple(color: QColor) -> Color:
+    return (color.red(), color.green(), color.blue(), color.alpha())
+
+
+def ColorFromTuple(tuple: Color) -> QColor:
+    return QColor(tuple[0], tuple[1], tuple[2], tuple[3])
+
+
+@lru_cache(maxsize=64)
+def PixmapFromIcon(blob: IconBlob) -> QPixmap:
+    """
+    Decode the icon of a CategoryData. Blobs are shared by every category
+    with the same icon, so each is looked up by identity without hashing
+    its contents, and an icon read from a file is only decoded here, when it
+    is first displayed. The returned pixmap must not be modified.
+
+    :param blob: The icon
+    :returns: The decoded image
+    """
+    pix = QPixmap()
+    pix.loadFromData(QByteArray(blob.data), 'PNG')
+    return pix
+
+
+def PixmapToPng(pixmap: QPixmap) -> bytes:
+    """
+    Encode an image so that it can be stored in a CategoryData
+
+    :param pixmap: The image
+    :returns: The contents of a PNG file
+    """
+    ba = QByteArray()
+    buffer = QBuffer(ba)
+    buffer.open(QIODevice.WriteOnly)
+    pixmap.save(buffer, "PNG")
+    buffer.close()
+    return bytes(ba)
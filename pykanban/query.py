@@ -0,0 +1,221 @@
+from __future__ import annotations
+from typing import *
+from abc import ABC, abstractmethod
+import re
+
+from pykanban.kanban import KanbanBoard, KanbanItem, ItemState, Priority, normalize
+
+#: Splits a query into terms, each optionally negated and field qualified,
+#: with quoted values kept together
+_TERM = re.compile(r'(-)?(?:(\w+):)?(?:"([^"]*)"?|(\S+))')
+
+_STATES = {
+    'blocked': ItemState.BLOCKED,
+    'available': ItemState.AVAILABLE,
+    'todo': ItemState.AVAILABLE,
+    'completed': ItemState.COMPLETED,
+    'complete': ItemState.COMPLETED,
+    'done': ItemState.COMPLETED,
+}
+
+_PRIORITIES = {
+    'high': Priority.HIGH,
+    'medium': Priority.MEDIUM,
+    'low': Priority.LOW,
+}
+
+
+class Term(ABC):
+    """
+    A single condition of a query
+    """
+    #: Whether the term excludes the items it matches instead
+    negated: bool
+    __slots__ = ('negated',)
+
+    def __init__(self, negated: bool = False):
+        self.negated = negated
+
+    @abstractmethod
+    def test(self, item: KanbanItem) -> bool:
+        """
+        :returns: If the item satisfies the condition, ignoring negation
+        """
+
+    def candidates(self, board: KanbanBoard) -> Optional[Collection[KanbanItem]]:
+        """
+        Get a superset of the items satisfying the condition from the
+        board's indexes.
+
+        :returns: The candidates, or None if no index can help
+        """
+        return None
+
+
+class TextTerm(Term):
+    """
+    Substring search over the name, description and categories, ignoring
+    case and accents
+    """
+    text: str
+    #: The text as normalized for searching, done once for every item
+    needle: str
+    __slots__ = ('text', 'needle')
+
+    def __init__(self, text: str, negated: bool = False):
+        super(TextTerm, self).__init__(negated)
+        self.text = text
+        self.needle = normalize(text)
+
+    def test(self, item: KanbanItem) -> bool:
+        return self.needle in item.search_text()
+
+    def candidates(self, board: KanbanBoard) -> Optional[Collection[KanbanItem]]:
+        if len(self.needle) < 3:
+            return None
+        return board.search_candidates(self.text)
+
+
+class CategoryTerm(Term):
+    """
+    Items under a category, ignoring case and accents like the rest of
+    the search
+    """
+    category: str
+    __slots__ = ('category',)
+
+    def __init__(self, category: str, negated: bool = False):
+        super(CategoryTerm, self).__init__(negated)
+        self.category = normalize(category)
+
+    def test(self, item: KanbanItem) -> bool:
+        return any(normalize(i) == self.category for i in item.category)
+
+    def candidates(self, board: KanbanBoard) -> Optional[Collection[KanbanItem]]:
+        result = set()
+        for i in board.categories:
+            if normalize(i) == self.category:
+                result |= board.items_in_category(i)
+        return result
+
+
+class StateTerm(Term):
+    """
+    Items that are blocked, available or completed
+    """
+    state: ItemState
+    __slots__ = ('state',)
+
+    def __init__(self, state: ItemState, negated: bool = False):
+        super(StateTerm, self).__init__(negated)
+        self.state = state
+
+    def test(self, item: KanbanItem) -> bool:
+        return item.state() == self.state
+
+    def candidates(self, board: KanbanBoard) -> Optional[Collection[KanbanItem]]:
+        return board.items_in_state(self.state)
+
+
+class PriorityTerm(Term):
+    """
+    Items with a given priority
+    """
+    priority: Priority
+    __slots__ = ('priority',)
+
+    def __init__(self, priority: Priority, negated: bool = False):
+        super(PriorityTerm, self).__init__(negated)
+        self.priority = priority
+
+    def test(self, item: KanbanItem) -> bool:
+        return item.priority == self.priority
+
+
+class Query:
+    """
+    A compiled search query. Queries are made of whitespace separated terms,
+    all of which must hold:
+
+    * ``word`` or ``"exact phrase"`` searches the name, description and categories
+    * ``category:backend`` matches items under a category
+    * ``state:blocked`` matches by state, one of blocked, available or completed
+      (``todo`` and ``done`` also work)
+    * ``priority:high`` matches by priority
+    * A leading ``-`` excludes the items a term matches, as in ``-state:done``
+
+    Anything that isn't understood as a field is searched for as text.
+    """
+    #: The text the query was compiled from
+    text: str
+    terms: List[Term]
+    __slots__ = ('text', 'terms')
+
+    def __init__(self, text: str, terms: List[Term]):
+        self.text = text
+        self.terms = terms
+
+    @staticmethod
+    def parse(text: str) -> Query:
+        """
+        Compile query text
+
+        :param text: The query, as typed by the user
+        :returns: The compiled query
+        """
+        terms = []
+        for match in _TERM.finditer(text):
+            negated, field, quoted, word = match.groups()
+            negated = negated is not None
+            value = quoted if quoted is not None else word
+            term = None
+            if field is not None:
+                field = field.lower()
+                if field == 'category':
+                    term = CategoryTerm(value, negated)
+                elif field == 'state' and value.lower() in _STATES:
+                    term = StateTerm(_STATES[value.lower()], negated)
+                elif field == 'priority' and value.lower() in _PRIORITIES:
+                    term = PriorityTerm(_PRIORITIES[value.lower()], negated)
+                else:
+                    value = match.group(0)[1 if negated else 0:]
+            if term is None:
+                if value == '':
+                    continue
+                term = TextTerm(value, negated)
+            terms.append(term)
+        return Query(text, terms)
+
+    def is_empty(self) -> bool:
+        return not self.terms
+
+    def matches(self, item: KanbanItem) -> bool:
+        """
+        :returns: If the item satisfies every term of the query
+        """
+        for i in self.terms:
+            if i.test(item) == i.negated:
+                return False
+        return True
+
+    def evaluate(self, board: KanbanBoard) -> Set[KanbanItem]:
+        """
+        Find the matching items on a board. Of the terms that an index can
+        answer, the one with the fewest candidates is used as the starting
+        point, and only those candidates are checked against the full query.
+
+        :param board: The board to search
+        :returns: The matching items
+        """
+        best = None
+        for i in self.terms:
+            if i.negated:
+                continue
+            candidates = i.candidates(board)
+            if candidates is not None and (best is None or len(candidates) < len(best)):
+                best = candidates
+                if not best:
+                    break
+        if best is None:
+            best = board.items
+        return {i for i in best if self.matches(i)}
@@ -0,0 +1,188 @@
+from __future__ import annotations
+from typing import *
+from itertools import chain
+import json
+import os
+
+from pykanban.events import ChangeSet
+from pykanban.serializers import KanbanBoardEncoder, as_kanban_board
+
+if TYPE_CHECKING:
+    from pykanban.kanban import KanbanBoard, KanbanItem
+
+#: The extension of boards saved as a log
+LOG_EXTENSION = '.kblog'
+
+
+def is_log_file(filename: str) -> bool:
+    """
+    Whether a file, or its backup, is a board saved as a log
+    """
+    return filename.endswith(LOG_EXTENSION) or filename.endswith(LOG_EXTENSION + '.bak')
+
+
+class SaveLog:
+    """
+    Saves a board as a snapshot of the whole board followed by a line for
+    each later save, holding only the items that save changed. Each line is
+    the JSON the :class:`pykanban.serializers.KanbanBoardEncoder` writes, so
+    saving takes time in proportion to what was edited rather than to the
+    size of the board.
+
+    Once the lines appended add up to more than the snapshot, the next save
+    writes a fresh snapshot in place of the file instead. This compaction
+    keeps loading proportional to the size of the board, and the time spent
+    compacting proportional to the time spent appending.
+
+    Every save is written out to the operating system right away, but the
+    file is only synced to disk once every :attr:`sync_group` saves, and
+    whenever it is compacted.
+    """
+    board: KanbanBoard
+    filename: str
+    #: Items changed since the last save, by id
+    _changed: Dict[str, KanbanItem]
+    #: The ids of the items removed since the last save
+    _removed: Set[str]
+    #: Categories whose styling changed since the last save
+    _styled: Set[str]
+    #: The size of the snapshot at the start of the file, 0 if the next
+    #: save has to write a snapshot
+    _base_size: int
+    #: The size of the whole file
+    _size: int
+    #: Saves appended since the file was last synced to disk
+    _unsynced: int
+    #: How many saves may be appended before the file is synced to disk
+    sync_group: int
+
+    def __init__(self, board: KanbanBoard, filename: str, sync_group: int = 8):
+        self.board = board
+        self.filename = filename
+        self.sync_group = sync_group
+        self._base_size = self._size = 0
+        self._unsynced = 0
+        self._clear()
+        board.subscribe(self._board_changed)
+
+    def _clear(self) -> None:
+        self._changed = dict()
+        self._removed = set()
+        self._styled = set()
+
+    def _board_changed(self, changes: ChangeSet) -> None:
+        for i in changes.removed:
+            self._changed.pop(i.id, None)
+            self._removed.add(i.id)
+        for i in chain(changes.added, changes.fields):
+            self._changed[i.id] = i
+            self._removed.discard(i.id)
+        self._styled |= changes.styled
+
+    def save(self) -> None:
+        """
+        Append what changed since the last save, or compact the file if
+        it's due
+        """
+        # Anything the board published that a scheduler hasn't delivered
+        # yet has to be known before writing
+        self.board.events.flush()
+        if self._base_size == 0 or self._size - self._base_size > self._base_size:
+            self.compact()
+        else:
+            self._append()
+
+    def _append(self) -> None:
+        board = self.board
+        encoder = KanbanBoardEncoder()
+        record: Dict[str, Any] = {}
+        record['__kanbanupdate__'] = True
+        record['items'] = [encoder.encodeItem(i) for i in self._changed.values()]
+        record['removed'] = list(self._removed)
+        record['categories'] = list(board.categories)
+        icons: Dict[str, str] = {}
+        record['category_data'] = {name: encoder.encodeCategoryData(board.category_data[name], icons)
+                                   for name in self._styled if name in board.category_data}
+        record['icons'] = icons
+        record['category_names'] = list(board.category_data)
+        record['filename'] = board.filename
+        record['view_settings'] = board.view_settings
+        line = (json.dumps(record) + '\n').encode()
+        with open(self.filename, 'ab') as f:
+            f.write(line)
+            self._unsynced += 1
+            if self._unsynced >= self.sync_group:
+                f.flush()
+                os.fsync(f.fileno())
+                self._unsynced = 0
+        self._size += len(line)
+        self._clear()
+
+    def compact(self) -> None:
+        """
+        Replace the file with a snapshot of the board as it is now
+        """
+        temporary = self.filename + '.tmp'
+        size = 0
+        # Written as it is encoded, rather than as one string
+        with open(temporary, 'wb') as f:
+            for chunk in KanbanBoardEncoder().iterencode(self.board):
+                data = chunk.encode()
+                f.write(data)
+                size += len(data)
+            f.write(b'\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.filename)
+        self._base_size = self._size = size + 1
+        self._unsynced = 0
+        self._clear()
+
+    def close(self) -> None:
+        self.board.unsubscribe(self._board_changed)
+
+    @staticmethod
+    def load(filename: str) -> KanbanBoard:
+        """
+        Load a board by reading the snapshot and replaying each save after
+        it. The board keeps the log, so saving it to the same file again
+        appends to it.
+
+        :param filename: The file to load
+        :returns: The board
+        """
+        with open(filename, 'rb') as f:
+            first = f.readline()
+            board = json.loads(first)
+            items = {i['id']: i for i in board['items']}
+            base_size = size = len(first)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # A save cut short, everything before it is intact but
+                    # the file must be rewritten before it is appended to
+                    base_size = 0
+                    break
+                SaveLog._replay(board, items, json.loads(line))
+                size += len(line)
+        board['items'] = list(items.values())
+        result = as_kanban_board(board)
+        log = SaveLog(result, filename)
+        log._base_size, log._size = base_size, size
+        result._savers[filename] = log
+        return result
+
+    @staticmethod
+    def _replay(board: Dict[str, Any], items: Dict[str, Dict[str, Any]], record: Dict[str, Any]) -> None:
+        for i in record['removed']:
+            items.pop(i, None)
+        for i in record['items']:
+            items[i['id']] = i
+        board['categories'] = record['categories']
+        names = set(record['category_names'])
+        category_data = board['category_data']
+        for i in [i for i in category_data if i not in names]:
+            del category_data[i]
+        category_data.update(record['category_data'])
+        board.setdefault('icons', {}).update(record.get('icons', {}))
+        board['filename'] = record['filename']
+        board['view_settings'] = record['view_settings']
@@ -1,108 +1,291 @@
-from pykanban.kanban import KanbanBoard, KanbanItem
-from pykanban.taskcategory import CategoryData
+from pykanban.kanban import KanbanBoard, KanbanItem, Priority, SCHEMA_VERSION
+from pykanban.taskcategory import CategoryData, IconBlob, as_color
 from typing import *
-from json import JSONEncoder
-from PySide2.QtGui import QColor, QPixmap
-from PySide2.QtCore import QByteArray, QBuffer, QIODevice
+from json import JSONEncoder, JSONDecoder, JSONDecodeError
 
+import codecs
+import os
 import pickle
-
-
-def ColorToTuple(color: QColor) -> Tuple[int, int, int, int]:
-    return (color.red(), color.green(), color.blue(), color.alpha())
-
-
-def ColorFromTuple(tuple) -> QColor:
-    return QColor(tuple[0], tuple[1], tuple[2], tuple[3])
+import re
 
 
 def as_kanban_item(dct: dict):
     if '__kanbanitem__' in dct:
-        result = KanbanItem(dct['name'], dct['description'], dct['priority'])
+        result = KanbanItem(dct['name'], dct['description'], priority=Priority(dct['priority']))
         result.category = set(dct['category'])
         result.depends_on = dct['depends_on']
         result.completed = dct['completed']
+        # Older files only had positional ids, which are not kept
+        if isinstance(dct.get('id'), str):
+            result.id = dct['id']
         return result
     else:
         return dct
 
-def as_category_data(dct:dict)->CategoryData:
+def as_category_data(dct:dict, icons:Dict[str,str]=None)->CategoryData:
+    """
+    :param dct: The encoded styling
+    :param icons: The board's icons as base64 text, by their digest
+    """
     result = CategoryData()
     if 'foreground' in dct:
-        result.foreground=ColorFromTuple(dct['foreground'])
+        result.foreground=as_color(dct['foreground'])
     if 'background' in dct:
-        result.background=ColorFromTuple(dct['background'])
-    if 'icon' in dct:
-        ba = QByteArray.fromBase64(QByteArray(dct['icon'].encode()))
-        buffer = QBuffer(ba)
-        buffer.open(QIODevice.ReadOnly)
-        pix = QPixmap()
-        pix.loadFromData(ba,'PNG')
-        result.icon = pix
+        result.background=as_color(dct['background'])
+    if 'icon_id' in dct:
+        result.icon_blob = IconBlob.from_encoded(icons[dct['icon_id']], dct['icon_id'])
+    elif 'icon' in dct:
+        # Older files held each icon in its category
+        result.icon_blob = IconBlob.from_encoded(dct['icon'])
     return result
 
 
 def as_kanban_board(dct:dict):
     if '__kanbanboard__' in dct:
-        board = KanbanBoard()
-        board.items = list(map(as_kanban_item, dct['items']))
-        for i in board.items:
-            i.board = board
-        for name, cd in dct['category_data'].items():
-            board.category_data[name] = as_category_data(cd)
-        for i in board.items:
-            for idx, val in enumerate(i.depends_on):
-                i.depends_on[idx] = board.items[val]
-        board.categories = set(dct['categories'])
-        if 'view_settings' in dct:
-            board.view_settings = dct['view_settings']
-        return board
+        items = list(map(as_kanban_item, dct['items']))
+        ids = {d['id']: item for d, item in zip(dct['items'], items)}
+        return assemble_board(dct, items, ids)
     else:
         return dct
 
 
+def assemble_board(dct:dict, items:List[KanbanItem], ids:Dict[Any,KanbanItem]) -> KanbanBoard:
+    """
+    Put decoded items on a new board, replacing the ids in their
+    dependencies with the items themselves
+
+    :param dct: The rest of the board's fields, its items aren't used
+    :param items: The items, with dependencies still as ids
+    :param ids: Each item by the id it was saved with
+    :returns: The board
+    """
+    board = KanbanBoard()
+    for i in items:
+        i.board = board
+        i.depends_on = [ids[val] for val in i.depends_on]
+    icons = dct.get('icons', {})
+    for name, cd in dct['category_data'].items():
+        board.category_data[name] = as_category_data(cd, icons)
+    board.items = items
+    board.categories = set(dct['categories'])
+    if 'view_settings' in dct:
+        board.view_settings = dct['view_settings']
+    board.schema_version = dct.get('schema_version', 0)
+    return board
+
+
+class BoardReader:
+    """
+    Reads a board written by :class:`KanbanBoardEncoder` a piece at a time.
+    Each item is turned into a KanbanItem as soon as it has been read, so
+    only one item's worth of parsed JSON is held at once rather than the
+    whole document, and the dependencies are resolved once all of the items
+    have been read.
+    """
+    #: The file, opened in binary mode
+    file: BinaryIO
+    #: Called with the number of bytes read so far and the size of the
+    #: file after each chunk is read
+    progress: Optional[Callable[[int, int], None]]
+    #: How many bytes are read at a time
+    chunk_size: int
+    #: Decoded text that hasn't been parsed yet, from pos onwards
+    buffer: str
+    pos: int
+    #: Whether the whole file has been read
+    done: bool
+    #: The number of bytes read so far, and the size of the file
+    read_size: int
+    total_size: int
+
+    _whitespace = re.compile(r'[ \t\n\r]*')
+
+    def __init__(self, file: BinaryIO, progress: Callable[[int, int], None] = None, chunk_size: int = 1 << 16):
+        self.file = file
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.done = False
+        self.read_size = 0
+        try:
+            self.total_size = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError):
+            self.total_size = 0
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._json = JSONDecoder()
+
+    def _fill(self) -> bool:
+        """
+        Read another chunk of the file, dropping what has been parsed
+
+        :returns: False if there was nothing left to read
+        """
+        if self.done:
+            return False
+        data = self.file.read(self.chunk_size)
+        self.read_size += len(data)
+        self.buffer = self.buffer[self.pos:] + self._text.decode(data, final=not data)
+        self.pos = 0
+        if not data:
+            self.done = True
+            return False
+        if self.progress is not None:
+            self.progress(self.read_size, self.total_size)
+        return True
+
+    def _peek(self) -> str:
+        """
+        :returns: The next character that isn't whitespace
+        """
+        while True:
+            self.pos = self._whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise JSONDecodeError("Unexpected end of file", self.buffer, self.pos)
+
+    def _expect(self, character: str) -> None:
+        if self._peek() != character:
+            raise JSONDecodeError(f"Expected {character!r}", self.buffer, self.pos)
+        self.pos += 1
+
+    def _value(self) -> Any:
+        """
+        Parse the next complete JSON value, reading until there is enough
+        of the file to hold it
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buffer, self.pos)
+                # A number at the very end of the buffer may carry on in
+                # the next chunk
+                if end < len(self.buffer) or self.done:
+                    self.pos = end
+                    return value
+            except JSONDecodeError:
+                if self.done:
+                    raise
+            self._fill()
+
+    def read(self) -> KanbanBoard:
+        """
+        :returns: The board in the file
+        """
+        dct = {}
+        items = []
+        ids = {}
+        self._expect('{')
+        if self._peek() != '}':
+            while True:
+                key = self._value()
+                self._expect(':')
+                if key == 'items':
+                    self._read_items(items, ids)
+                else:
+                    dct[key] = self._value()
+                if self._peek() == '}':
+                    break
+                self._expect(',')
+        self.pos += 1
+        if '__kanbanboard__' not in dct:
+            raise ValueError("The file does not hold a kanban board")
+        return assemble_board(dct, items, ids)
+
+    def _read_items(self, items: List[KanbanItem], ids: Dict[Any, KanbanItem]) -> None:
+        self._expect('[')
+        if self._peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            dct = self._value()
+            item = as_kanban_item(dct)
+            items.append(item)
+            ids[dct['id']] = item
+            if self._peek() == ']':
+                self.pos += 1
+                return
+            self._expect(',')
+
+
 class KanbanBoardEncoder(JSONEncoder):
-    def encodeItem(self,item:KanbanItem,ids:Dict[KanbanItem,int])->Dict[str,Any]:
+    def encodeItem(self,item:KanbanItem)->Dict[str,Any]:
         result:Dict[str,Any] = {}
-        result['id']=ids[item]
+        result['id']=item.id
         result['category']=list(item.category)
         result['name']=item.name
         result['description']=item.description
         result['priority']=item.priority
         result['__kanbanitem__']=True
-        result['depends_on']=list(map(lambda x:ids[x],item.depends_on))
+        result['depends_on']=list(map(lambda x:x.id,item.depends_on))
         result['completed']=item.completed
         return result
 
+    def encodeCategoryData(self, item:CategoryData, icons:Dict[str,str]) -> Dict[str,Any]:
+        """
+        :param item: The styling
+        :param icons: Where the icon is put as base64 text, by its digest, so
+            that an icon shared by several categories is only written once
+        """
+        data = {}
+        if item.foreground is not None:
+            data['foreground']=list(item.foreground)
+        if item.background is not None:
+            data['background'] = list(item.background)
+        blob = item.icon_blob
+        if blob is not None:
+            data['icon_id'] = blob.digest
+            icons[blob.digest] = blob.encoded
+        return data
+
     def encodeKanban(self, kanban:KanbanBoard) -> Dict:
-        ids = {}
-        # Assign IDs for each item
-        for i,v in enumerate(kanban.items):
-            ids[v]=i
         result:Dict[str,Any] = {}
         result['__kanbanboard__']=True
-        result['items'] = list(map(lambda x:self.encodeItem(x,ids),kanban.items))
+        result['items'] = list(map(self.encodeItem,kanban.items))
+        result.update(self.encodeBoardFields(kanban))
+        return result
+
+    def encodeBoardFields(self, kanban:KanbanBoard) -> Dict[str,Any]:
+        """
+        Encode everything about a board except for its items
+        """
+        result:Dict[str,Any] = {}
         category_data={}
+        icons={}
         for (name,item) in kanban.category_data.items():
-            data = {}
-            if item.foreground is not None:
-                data['foreground']=ColorToTuple(item.foreground)
-            if item.background is not None:
-                data['background'] = ColorToTuple(item.background)
-            if item.icon is not None:
-                ba = QByteArray()
-                buffer = QBuffer(ba)
-                buffer.open(QIODevice.WriteOnly)
-                item.icon.save(buffer,"PNG")
-                data['icon']=bytes(ba.toBase64()).decode()
-                buffer.close()
-            category_data[name]=data
+            category_data[name]=self.encodeCategoryData(item, icons)
+        result['icons']=icons
         result['category_data']=category_data
         result['categories'] = list(kanban.categories)
         result['filename'] = kanban.filename
         result['view_settings'] = kanban.view_settings
+        result['schema_version'] = SCHEMA_VERSION
         return result
 
+    def iterencode(self, o, _one_shot=False):
+        """
+        Boards are encoded an item at a time, rather than first building
+        the dictionaries for every item
+        """
+        if not isinstance(o, KanbanBoard):
+            yield from super(KanbanBoardEncoder, self).iterencode(o, _one_shot)
+            return
+        encode = super(KanbanBoardEncoder, self).iterencode
+        yield '{"__kanbanboard__"' + self.key_separator + 'true' + self.item_separator + '"items"' \
+              + self.key_separator + '['
+        for n, i in enumerate(o.items):
+            if n:
+                yield self.item_separator
+            yield from encode(self.encodeItem(i))
+        yield ']'
+        for key, value in self.encodeBoardFields(o).items():
+            yield self.item_separator
+            yield from encode(key)
+            yield self.key_separator
+            yield from encode(value)
+        yield '}'
+
     def default(self, obj):
         if isinstance(obj, KanbanBoard):
             return self.encodeKanban(obj)
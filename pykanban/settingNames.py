@@ -5,3 +5,4 @@ AUTOSAVE_ENABLED = "Recovery/Autosave"
 AUTOSAVE_INTERVAL = "Recovery/Interval"
 USE_CATEGORY_STYLING = "Display/CategoriesInEditor"
 RESTORE_VIEW_SETTINGS = 'Display/RestoreViewSettings'
+UNDO_DEPTH = "Usability/UndoDepth"
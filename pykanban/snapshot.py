@@ -0,0 +1,201 @@
+from __future__ import annotations
+from typing import *
+from copy import deepcopy
+from itertools import chain
+import os
+
+from pykanban.events import ChangeSet
+from pykanban.kanban import KanbanBoard, KanbanItem, Priority
+from pykanban.taskcategory import CategoryData, Color, IconBlob
+
+#: (id, name, description, priority, completed, categories, dependency ids),
+#: the description is None if it hasn't been read from the database yet
+ItemRecord = Tuple[str, str, Optional[str], Priority, bool, Tuple[str, ...], Tuple[str, ...]]
+
+
+def _record(item: KanbanItem) -> ItemRecord:
+    # The description is read past the property, so that one which was
+    # never needed isn't read from the database just for a snapshot
+    return (item.id, item.name, item._description, item.priority, item.completed, tuple(item.category),
+            tuple(d.id for d in item.depends_on))
+
+
+class SnapshotRecords:
+    """
+    A record of every item on a board, kept up to date from the board's
+    changes, that snapshots share instead of copying.
+
+    Taking a snapshot hands out the records as they are and marks them as
+    shared. The first change after that copies the dict, which only copies
+    references, before changing the copy, so a snapshot never sees later
+    edits. Taking a snapshot only costs time in proportion to what changed
+    since the last one, apart from the first, which records every item.
+    """
+    board: KanbanBoard
+    #: The record of each item by id
+    records: Dict[str, ItemRecord]
+    #: The items whose description hasn't been read yet, by id
+    unread: Dict[str, KanbanItem]
+    #: Items changed since the records were last brought up to date, by
+    #: id, with None for the ones removed
+    _changed: Dict[str, Optional[KanbanItem]]
+    #: Whether a snapshot holds the records, so they must be copied before
+    #: they are changed
+    _shared: bool
+
+    def __init__(self, board: KanbanBoard):
+        self.board = board
+        self.records = dict()
+        self.unread = dict()
+        for i in board.items:
+            self._update(i)
+        self._changed = dict()
+        self._shared = False
+        board.subscribe(self._board_changed)
+
+    def _board_changed(self, changes: ChangeSet) -> None:
+        for i in changes.removed:
+            self._changed[i.id] = None
+        for i in chain(changes.added, changes.fields):
+            self._changed[i.id] = i
+
+    def _update(self, item: KanbanItem) -> None:
+        record = self.records[item.id] = _record(item)
+        if record[2] is None:
+            self.unread[item.id] = item
+        else:
+            self.unread.pop(item.id, None)
+
+    def take(self) -> Tuple[Dict[str, ItemRecord], Dict[str, KanbanItem]]:
+        """
+        :returns: The records and the items with unread descriptions, which
+            must not be changed
+        """
+        # Anything the board published that a scheduler hasn't delivered
+        # yet has to be known first
+        self.board.events.flush()
+        if self._changed:
+            if self._shared:
+                self.records = dict(self.records)
+                self.unread = dict(self.unread)
+                self._shared = False
+            for item_id, item in self._changed.items():
+                if item is None:
+                    self.records.pop(item_id, None)
+                    self.unread.pop(item_id, None)
+                else:
+                    self._update(item)
+            self._changed = dict()
+        self._shared = True
+        return self.records, self.unread
+
+    def close(self) -> None:
+        self.board.unsubscribe(self._board_changed)
+
+
+class BoardSnapshot:
+    """
+    The contents of a board at one moment, held only in tuples, strings
+    and other values that are never changed in place. The item records are
+    shared with the board's :class:`SnapshotRecords` rather than copied, so
+    taking one is cheap enough for the user interface thread, and the
+    snapshot can then be handed to another thread while the board goes on
+    being edited.
+    """
+    #: The record of each item by id
+    items: Dict[str, ItemRecord]
+    #: The items of a board opened from a database whose descriptions were
+    #: never needed, by id. Only their descriptions are ever read, and only
+    #: if the database no longer has them, see :meth:`to_board`.
+    unread: Dict[str, KanbanItem]
+    #: The database the unread descriptions are in
+    description_source: Optional[str]
+    categories: FrozenSet[str]
+    #: (name, foreground, background, icon) for each styled category
+    category_data: Tuple[Tuple[str, Optional[Color], Optional[Color], Optional[IconBlob]], ...]
+    view_settings: List[Any]
+    filename: Optional[str]
+    schema_version: int
+    __slots__ = ('items', 'unread', 'description_source', 'categories', 'category_data', 'view_settings',
+                 'filename', 'schema_version')
+
+    def __init__(self, board: KanbanBoard):
+        if board._snapshots is None:
+            board._snapshots = SnapshotRecords(board)
+        self.items, self.unread = board._snapshots.take()
+        self.description_source = board._lazy_source.filename if board._lazy_source is not None else None
+        self.categories = frozenset(board.categories)
+        self.category_data = tuple((name, data.foreground, data.background, data.icon_blob)
+                                   for name, data in board.category_data.items())
+        self.view_settings = deepcopy(board.view_settings)
+        self.filename = board.filename
+        self.schema_version = board.schema_version
+
+    def to_board(self) -> KanbanBoard:
+        """
+        :returns: A new board holding the snapshot's contents, sharing
+            nothing with the board it was taken from
+        """
+        board = KanbanBoard()
+        descriptions = self._read_descriptions()
+        items: Dict[str, KanbanItem] = dict()
+        for item_id, name, description, priority, completed, category, _ in self.items.values():
+            if description is None:
+                description = descriptions[item_id]
+            item = KanbanItem(name, description, board, priority)
+            item.id = item_id
+            item.completed = completed
+            item.category = set(category)
+            items[item_id] = item
+        for item_id, *_, dependencies in self.items.values():
+            items[item_id].depends_on = [items[i] for i in dependencies if i in items]
+        board.categories = set(self.categories)
+        for name, foreground, background, icon in self.category_data:
+            data = board.category_data[name] = CategoryData(foreground, background)
+            data.icon_blob = icon
+        board.view_settings = deepcopy(self.view_settings)
+        board.filename = self.filename
+        board.schema_version = self.schema_version
+        board.items = items.values()
+        return board
+
+    def _read_descriptions(self) -> Dict[str, str]:
+        """
+        Read the descriptions that were never needed on the board from its
+        database, with a connection of this thread's own
+        """
+        if not self.unread:
+            return dict()
+        from pykanban.database import BoardDatabase
+        result = BoardDatabase.read_descriptions(self.description_source, self.unread)
+        for item_id, item in self.unread.items():
+            if item_id not in result:
+                # Saving the board removed the row since, and saving reads
+                # the description of every removed item before removing it
+                result[item_id] = item._description or ""
+        return result
+
+
+def save_snapshot(snapshot: BoardSnapshot, filename: str) -> None:
+    """
+    Save a snapshot in whichever format the filename calls for. It is
+    written to a temporary file next to the real one, synced to disk and
+    then renamed over it, so the file is never left half written. Nothing
+    is shared with the board the snapshot came from, so this can run on
+    any thread.
+
+    :param snapshot: What to save
+    :param filename: Where to save it
+    """
+    directory, name = os.path.split(filename)
+    # The prefix keeps the extension, which decides the format
+    temporary = os.path.join(directory, '.~' + name)
+    board = snapshot.to_board()
+    try:
+        board.save(temporary, False)
+    finally:
+        for i in board._savers.values():
+            i.close()
+    with open(temporary, 'rb+') as f:
+        os.fsync(f.fileno())
+    os.replace(temporary, filename)
@@ -0,0 +1,559 @@
+from __future__ import annotations
+from typing import *
+from array import array
+from collections.abc import Sequence, Mapping
+import json
+
+from pykanban.kanban import KanbanBoard, KanbanItem, ItemState, Priority, normalize
+from pykanban.evaluate import BoardSummary, summarize, unmet_counts, depth_levels
+
+if TYPE_CHECKING:
+    from pykanban.query import Query
+
+
+class ItemView:
+    """
+    A lightweight view of one row of a :class:`BoardStore`, with the same
+    attribute names as :class:`pykanban.kanban.KanbanItem`, so that code that
+    only reads items works with either.
+
+    Views are created on demand, two views of the same row compare equal.
+    """
+    #: The store the row belongs to
+    board: BoardStore
+    #: The row number
+    row: int
+    __slots__ = ('board', 'row')
+
+    def __init__(self, board: BoardStore, row: int):
+        self.board = board
+        self.row = row
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ItemView) and other.row == self.row and other.board is self.board
+
+    def __hash__(self) -> int:
+        return hash(self.row)
+
+    @property
+    def id(self) -> str:
+        return self.board.ids[self.row]
+
+    @property
+    def name(self) -> str:
+        return self.board.names[self.row]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self.board._check_writable()
+        self.board.names[self.row] = value
+        self.board._text_changed()
+
+    @property
+    def description(self) -> str:
+        return self.board.descriptions[self.row]
+
+    @description.setter
+    def description(self, value: str) -> None:
+        self.board._check_writable()
+        self.board.descriptions[self.row] = value
+        self.board._text_changed()
+
+    @property
+    def priority(self) -> Priority:
+        return Priority(self.board.priority[self.row])
+
+    @priority.setter
+    def priority(self, value: Priority) -> None:
+        self.board._check_writable()
+        self.board.priority[self.row] = value
+        self.board.generation += 1
+
+    @property
+    def completed(self) -> bool:
+        return bool(self.board.completed[self.row])
+
+    @completed.setter
+    def completed(self, value: bool) -> None:
+        self.board.set_completed(self.row, value)
+
+    @property
+    def depends_on(self) -> List[ItemView]:
+        """
+        The items this item depends on. Dependencies can't be edited through
+        a view, see :meth:`BoardStore.to_board`.
+        """
+        return [ItemView(self.board, i) for i in self.board.dependency_rows(self.row)]
+
+    @property
+    def category(self) -> FrozenSet[str]:
+        names = self.board.category_names
+        return frozenset(names[i] for i in self.board.category_ids(self.row))
+
+    def short_name(self) -> str:
+        return self.name
+
+    def blocked(self) -> bool:
+        return not self.completed and self.board.unmet[self.row] > 0
+
+    def getBlockers(self) -> List[ItemView]:
+        """
+        The uncompleted items this item is waiting on, directly or through
+        other items, as in :meth:`KanbanItem.getBlockers`
+        """
+        return self.board.blockers_of(self)
+
+    def state(self) -> ItemState:
+        return self.board.state_of(self.row)
+
+    def search_text(self) -> str:
+        """
+        The normalized searchable text, as in :meth:`KanbanItem.search_text`.
+        Views aren't kept, so this is cached by the store instead, see
+        :meth:`BoardStore.search_texts`.
+        """
+        return self.board.search_texts()[self.row]
+
+    def category_matches(self, text: str) -> bool:
+        text = normalize(text)
+        for i in self.category:
+            if text in normalize(i):
+                return True
+        return False
+
+    def matches(self, text: str) -> bool:
+        return normalize(text) in self.search_text()
+
+
+class ItemRows(Sequence):
+    """
+    The rows of a store as item views, made as they are accessed
+    """
+    __slots__ = ('store',)
+
+    def __init__(self, store: BoardStore):
+        self.store = store
+
+    def __len__(self) -> int:
+        return len(self.store.ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [ItemView(self.store, i) for i in range(len(self))[index]]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ItemView(self.store, index)
+
+
+class RowStates(Mapping):
+    """
+    The state of each row of a store, worked out as it is looked up
+    """
+    __slots__ = ('store',)
+
+    def __init__(self, store: BoardStore):
+        self.store = store
+
+    def __getitem__(self, item: ItemView) -> ItemState:
+        return self.store.state_of(item.row)
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def __iter__(self) -> Iterator[ItemView]:
+        return iter(self.store.items)
+
+
+class BoardStore:
+    """
+    A column oriented alternative to :class:`pykanban.kanban.KanbanBoard`
+    for very large boards, such as archives, that are mostly read.
+
+    Rather than a Python object per item, each field is kept in a column:
+    priority, completion and the unmet dependency counts in typed arrays,
+    dependencies and categories as offset and index arrays (CSR), with
+    category names stored once and referred to by number. Items are read
+    through :class:`ItemView` objects, which have the same attribute names
+    as KanbanItem.
+
+    The store answers the same queries as a KanbanBoard: items, get_item,
+    states, items_in_state, items_in_category, dependents_of, blockers_of,
+    depths, matching_set, find_matching and writeGraphViz. Completion,
+    names, descriptions and priorities can be changed in place, unless the
+    store is :attr:`read_only`. Anything structural, and the change events
+    and undo history, need a regular board, see :meth:`to_board`.
+    """
+    #: The persistent id of each row
+    ids: List[str]
+    names: List[str]
+    descriptions: List[str]
+    priority: array
+    #: 1 for completed rows, 0 otherwise
+    completed: array
+    #: The dependencies of row i are dep_indices[dep_offsets[i]:dep_offsets[i + 1]]
+    dep_offsets: array
+    dep_indices: array
+    #: The categories of row i are numbers into category_names, stored
+    #: in cat_indices[cat_offsets[i]:cat_offsets[i + 1]]
+    cat_offsets: array
+    cat_indices: array
+    category_names: List[str]
+    #: The number of uncompleted dependencies of each row
+    unmet: array
+    #: The reverse of the dependency arrays, built when first needed
+    _dependents: Optional[Tuple[array, array]]
+    _row_of_id: Optional[Dict[str, int]]
+    filename: Optional[str]
+    categories: Set[str]
+    category_data: Dict[str, Any]
+    view_settings: List[Dict[Any, Any]]
+    #: Whether the store is only for viewing, such as one opened straight
+    #: from a file with :meth:`load`
+    read_only: bool
+    #: Incremented with every change, like :attr:`KanbanBoard.generation`
+    generation: int
+    #: The normalized search text of each row, built on the first search
+    _search_texts: Optional[List[str]]
+    #: The last search, as (query text, generation, matching rows)
+    _search_cache: Optional[Tuple[str, int, Set[ItemView]]]
+
+    def __init__(self):
+        self.ids = []
+        self.names = []
+        self.descriptions = []
+        self.priority = array('b')
+        self.completed = array('b')
+        self.dep_offsets = array('l', [0])
+        self.dep_indices = array('l')
+        self.cat_offsets = array('l', [0])
+        self.cat_indices = array('l')
+        self.category_names = []
+        self.unmet = array('l')
+        self._dependents = None
+        self._row_of_id = None
+        self._category_ids = dict()
+        self.filename = None
+        self.categories = set()
+        self.category_data = dict()
+        self.view_settings = []
+        self.read_only = False
+        self.generation = 0
+        self._search_texts = None
+        self._search_cache = None
+
+    def _intern(self, category: str) -> int:
+        number = self._category_ids.get(category)
+        if number is None:
+            number = self._category_ids[category] = len(self.category_names)
+            self.category_names.append(category)
+        return number
+
+    def _append(self, item_id: str, name: str, description: str, priority: int,
+                completed: bool, categories: Iterable[str]) -> None:
+        self.ids.append(item_id)
+        self.names.append(name)
+        self.descriptions.append(description)
+        self.priority.append(int(priority))
+        self.completed.append(1 if completed else 0)
+        self.cat_indices.extend(self._intern(i) for i in categories)
+        self.cat_offsets.append(len(self.cat_indices))
+
+    def _finish(self) -> None:
+        """
+        Compute the unmet dependency counts once every column is filled in
+        """
+        self.unmet = unmet_counts(self.dep_offsets, self.dep_indices, self.completed)
+        self._dependents = None
+        self._row_of_id = None
+
+    @staticmethod
+    def from_board(board: KanbanBoard) -> BoardStore:
+        """
+        Copy a board into columns
+
+        :param board: The board to copy
+        :returns: The new store
+        """
+        store = BoardStore()
+        rows = {item: row for row, item in enumerate(board.items)}
+        for i in board.items:
+            store._append(i.id, i.name, i.description, i.priority, i.completed, i.category)
+            store.dep_indices.extend(rows[d] for d in i.depends_on if d in rows)
+            store.dep_offsets.append(len(store.dep_indices))
+        store._finish()
+        store.filename = board.filename
+        store.categories = set(board.categories)
+        store.category_data = dict(board.category_data)
+        store.view_settings = board.view_settings
+        return store
+
+    @staticmethod
+    def from_json(dct: Dict[str, Any]) -> BoardStore:
+        """
+        Fill the columns straight from a decoded JSON board, without making
+        a KanbanItem for every task.
+
+        :param dct: The board, as written by :class:`pykanban.serializers.KanbanBoardEncoder`
+        :returns: The new store
+        """
+        from pykanban.serializers import as_category_data
+        store = BoardStore()
+        items = dct['items']
+        rows = {d['id']: row for row, d in enumerate(items)}
+        for row, d in enumerate(items):
+            # Older files only had positional ids
+            item_id = d['id'] if isinstance(d.get('id'), str) else None
+            store._append(item_id, d['name'], d['description'], d['priority'], d['completed'], d['category'])
+            store.dep_indices.extend(rows[i] for i in d['depends_on'] if i in rows)
+            store.dep_offsets.append(len(store.dep_indices))
+        if None in store.ids:
+            import uuid
+            store.ids = [i if i is not None else uuid.uuid4().hex for i in store.ids]
+        store._finish()
+        store.filename = dct.get('filename')
+        store.categories = set(dct['categories'])
+        for name, cd in dct['category_data'].items():
+            store.category_data[name] = as_category_data(cd, dct.get('icons', {}))
+        store.view_settings = dct.get('view_settings', [])
+        return store
+
+    @staticmethod
+    def load(filename: str, read_only: bool = False) -> BoardStore:
+        """
+        Load a saved board into columns. JSON files are read directly,
+        other formats go through a regular board first, except that a board
+        in the binary format opened read only is mapped into memory and only
+        read as it is accessed, see :meth:`pykanban.binaryformat.BinaryBoardFile.store`.
+
+        :param filename: The file to load
+        :param read_only: Whether the store is only for viewing
+        """
+        from pykanban.binaryformat import BinaryBoardFile, is_binary_file
+        if read_only and is_binary_file(filename):
+            store = BinaryBoardFile(filename).store()
+        elif filename.endswith('.json') or filename.endswith('.json.bak'):
+            with open(filename, 'r') as f:
+                store = BoardStore.from_json(json.load(f))
+        else:
+            store = BoardStore.from_board(KanbanBoard.load(filename))
+        store.read_only = read_only
+        if filename.endswith('.bak'):
+            filename = filename[0:-4]
+        store.filename = filename
+        return store
+
+    def to_board(self) -> KanbanBoard:
+        """
+        Make a regular, fully editable board with the same contents
+        """
+        board = KanbanBoard()
+        items = []
+        for row in range(len(self.ids)):
+            item = KanbanItem(self.names[row], self.descriptions[row], board, Priority(self.priority[row]))
+            item.id = self.ids[row]
+            item._completed = bool(self.completed[row])
+            item.category = {self.category_names[i] for i in self.category_ids(row)}
+            items.append(item)
+        for row, item in enumerate(items):
+            item.depends_on = [items[i] for i in self.dependency_rows(row)]
+        board.items = items
+        board.filename = self.filename
+        board.categories = set(self.categories)
+        board.category_data = dict(self.category_data)
+        board.view_settings = self.view_settings
+        return board
+
+    @property
+    def items(self) -> ItemRows:
+        """
+        Every row as an item view, in order
+        """
+        return ItemRows(self)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def get_item(self, item_id: str) -> Optional[ItemView]:
+        if self._row_of_id is None:
+            self._row_of_id = {v: k for k, v in enumerate(self.ids)}
+        row = self._row_of_id.get(item_id)
+        return ItemView(self, row) if row is not None else None
+
+    def dependency_rows(self, row: int) -> array:
+        return self.dep_indices[self.dep_offsets[row]:self.dep_offsets[row + 1]]
+
+    def category_ids(self, row: int) -> array:
+        return self.cat_indices[self.cat_offsets[row]:self.cat_offsets[row + 1]]
+
+    def dependent_rows(self, row: int) -> array:
+        """
+        :returns: The rows that directly depend on a row
+        """
+        if self._dependents is None:
+            counts = array('l', bytes(array('l').itemsize * (len(self.ids) + 1)))
+            for i in self.dep_indices:
+                counts[i + 1] += 1
+            for i in range(len(self.ids)):
+                counts[i + 1] += counts[i]
+            indices = array('l', bytes(array('l').itemsize * len(self.dep_indices)))
+            fill = array('l', counts)
+            for dependent in range(len(self.ids)):
+                for i in self.dependency_rows(dependent):
+                    indices[fill[i]] = dependent
+                    fill[i] += 1
+            self._dependents = (counts, indices)
+        offsets, indices = self._dependents
+        return indices[offsets[row]:offsets[row + 1]]
+
+    def dependents_of(self, item: ItemView) -> List[ItemView]:
+        return [ItemView(self, i) for i in self.dependent_rows(item.row)]
+
+    def _check_writable(self) -> None:
+        if self.read_only:
+            raise ValueError("The board was opened read only and can't be changed")
+
+    def set_completed(self, row: int, value: bool) -> None:
+        """
+        Complete or uncomplete a row, keeping the unmet counts of its
+        dependents up to date
+
+        :raises ValueError: If the store is read only
+        """
+        self._check_writable()
+        value = 1 if value else 0
+        if self.completed[row] == value:
+            return
+        self.completed[row] = value
+        self.generation += 1
+        delta = -1 if value else 1
+        for i in self.dependent_rows(row):
+            self.unmet[i] += delta
+
+    def _text_changed(self) -> None:
+        self.generation += 1
+        self._search_texts = None
+
+    def state_of(self, row: int) -> ItemState:
+        if self.completed[row]:
+            return ItemState.COMPLETED
+        if self.unmet[row] > 0:
+            return ItemState.BLOCKED
+        return ItemState.AVAILABLE
+
+    def summary(self) -> BoardSummary:
+        """
+        Evaluate the state of every row at once, along with the counts of
+        rows by state, priority and category. See :mod:`pykanban.evaluate`.
+        """
+        return summarize(self)
+
+    def depth_levels(self) -> array:
+        """
+        :returns: The depth of every row, by row number
+        :raises ValueError: If the dependencies contain a cycle
+        """
+        return depth_levels(self.dep_offsets, self.dep_indices)
+
+    def depths(self) -> Dict[ItemView, int]:
+        """
+        :returns: The depth of each item, as in :meth:`pykanban.kanban.KanbanBoard.depths`
+        :raises ValueError: If the dependencies contain a cycle
+        """
+        return {ItemView(self, row): depth for row, depth in enumerate(self.depth_levels())}
+
+    def blockers_of(self, item: ItemView, roots_only: bool = False) -> List[ItemView]:
+        """
+        Find every uncompleted item that stands between an item and being
+        available, as in :meth:`pykanban.kanban.KanbanBoard.blockers_of`
+
+        :param item: The item to find the blockers of
+        :param roots_only: Only return the blockers that are themselves available
+        """
+        result = []
+        seen = {item.row}
+        stack = [item.row]
+        while stack:
+            for i in self.dependency_rows(stack.pop()):
+                if i in seen or self.completed[i]:
+                    continue
+                seen.add(i)
+                if not roots_only or self.unmet[i] == 0:
+                    result.append(ItemView(self, i))
+                stack.append(i)
+        return result
+
+    def states(self) -> Mapping[ItemView, ItemState]:
+        """
+        The state of every row, as in :meth:`KanbanBoard.states`
+        """
+        return RowStates(self)
+
+    def items_in_state(self, state: ItemState) -> Set[ItemView]:
+        return {ItemView(self, i) for i in self.summary().rows_in_state(state)}
+
+    def items_in_category(self, category: str) -> Set[ItemView]:
+        number = self._category_ids.get(category)
+        if number is None:
+            return set()
+        return {ItemView(self, i) for i in range(len(self.ids)) if number in self.category_ids(i)}
+
+    def search_texts(self) -> List[str]:
+        """
+        The normalized search text of every row, worked out on the first
+        search and kept until a name or description changes
+        """
+        if self._search_texts is None:
+            names = self.category_names
+            self._search_texts = [
+                normalize('\0'.join([name, description,
+                                      *sorted(names[i] for i in self.category_ids(row))]))
+                for row, (name, description) in enumerate(zip(self.names, self.descriptions))]
+        return self._search_texts
+
+    def search_candidates(self, text: str) -> Iterable[ItemView]:
+        """
+        There's no text index on a store, so every row is a candidate
+        """
+        return self.items
+
+    def matching_set(self, query: Union[str, Query]) -> Set[ItemView]:
+        """
+        Find the rows matching a search, as in :meth:`KanbanBoard.matching_set`.
+        The last result is kept until the store changes.
+
+        :param query: The query, either as text or already compiled
+        """
+        from pykanban.query import Query
+        if isinstance(query, str):
+            query = Query.parse(query)
+        cache = self._search_cache
+        if cache is not None and cache[:2] == (query.text, self.generation):
+            return cache[2]
+        result = query.evaluate(self)
+        self._search_cache = (query.text, self.generation, result)
+        return result
+
+    def find_matching(self, query: Union[str, Query]) -> List[ItemView]:
+        """
+        :returns: The rows matching a search, in order, as in :meth:`KanbanBoard.find_matching`
+        """
+        matches = self.matching_set(query)
+        return [i for i in self.items if i in matches]
+
+    def writeGraphViz(self, out: TextIO, root: ItemView = None, dependents: bool = False,
+                      collapsed: Collection[ItemView] = (), hide_completed: bool = False) -> None:
+        """
+        Write a directed graph of the rows in the dot language, as in
+        :meth:`KanbanBoard.writeGraphViz`
+        """
+        from pykanban.dotexport import dot_chunks
+        for i in dot_chunks(self, root, dependents, collapsed, hide_completed):
+            out.write(i)
+
+    def category_count(self, category: str) -> int:
+        number = self._category_ids.get(category)
+        if number is None:
+            return 0
+        return self.cat_indices.count(number)
@@ -1,45 +1,182 @@
-from PySide2.QtCore import QBuffer, QByteArray, QIODevice
-from PySide2.QtGui import QColor, QPixmap
-from typing import Optional
+from typing import Optional, Tuple, Any, Callable
+from weakref import WeakValueDictionary
+import base64
+import hashlib
+
+#: A color as its red, green, blue and alpha components, each from 0 to 255
+Color = Tuple[int, int, int, int]
+
+
+def as_color(value: Any) -> Optional[Color]:
+    """
+    Turn a sequence of three or four components, or a color object such as
+    the QColors older save files hold, into a color tuple.
+
+    :param value: The color to convert
+    :returns: The color as a tuple, or None if value was None
+    """
+    if value is None:
+        return None
+    if hasattr(value, 'red'):
+        return (value.red(), value.green(), value.blue(), value.alpha())
+    value = tuple(int(i) for i in value)
+    if len(value) == 3:
+        value += (255,)
+    return value
+
+
+class IconBlob:
+    """
+    The contents of an icon, identified by a hash of them. Every category
+    showing the same image shares one blob, and a blob is never changed once
+    made. The base64 text that files hold is kept alongside the image once it
+    has been worked out, so an unchanged icon is only encoded once however
+    often it is saved, and an icon read from a file is only decoded once
+    something needs the image.
+    """
+    _data:Optional[bytes]
+    _encoded:Optional[str]
+    _digest:Optional[str]
+    __slots__=('_data','_encoded','_digest','__weakref__')
+
+    def __init__(self, data:bytes=None, encoded:str=None, digest:str=None):
+        self._data=data
+        self._encoded=encoded
+        self._digest=digest
+
+    @property
+    def data(self) -> bytes:
+        """
+        The contents of a PNG file
+        """
+        if self._data is None:
+            self._data = base64.b64decode(self._encoded)
+        return self._data
+
+    @property
+    def encoded(self) -> str:
+        """
+        The contents as base64 text
+        """
+        if self._encoded is None:
+            self._encoded = base64.b64encode(self._data).decode()
+        return self._encoded
+
+    @property
+    def digest(self) -> str:
+        """
+        The SHA-256 hash of the contents, in hexadecimal
+        """
+        if self._digest is None:
+            self._digest = hashlib.sha256(self.data).hexdigest()
+        return self._digest
+
+    @staticmethod
+    def from_data(data:bytes) -> 'IconBlob':
+        """
+        :param data: The contents of a PNG file
+        :returns: The blob holding them, shared with any other category
+            using the same image
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        blob = _blobs.get(digest)
+        if blob is None:
+            blob = _blobs[digest] = IconBlob(data, None, digest)
+        return blob
+
+    @staticmethod
+    def from_encoded(encoded:str, digest:str=None) -> 'IconBlob':
+        """
+        Make a blob for an icon read from a file, without decoding it
+
+        :param encoded: The contents as base64 text
+        :param digest: The hash of the contents, if the file held it
+        :returns: The blob, shared with any other category using the same image
+        """
+        if digest is None:
+            blob = _encoded_blobs.get(encoded)
+            if blob is None:
+                blob = _encoded_blobs[encoded] = IconBlob(None, encoded)
+            return blob
+        blob = _blobs.get(digest)
+        if blob is None:
+            blob = _blobs[digest] = IconBlob(None, encoded, digest)
+        return blob
+
+
+#: Blobs by their digest, for as long as something uses them
+_blobs = WeakValueDictionary()
+#: Blobs read from files that didn't hold the digest, by their base64 text
+_encoded_blobs = WeakValueDictionary()
+
+
 class CategoryData:
     """
     A small container class for handling the associated styling of a
     task's category. This will enable improved extensibility down the line
     compared to a tuple of the same items.
+
+    Nothing here depends on Qt, see :mod:`pykanban.qtconvert` for turning
+    the colors and icon into something that can be displayed.
     """
     #: The foreground(text) Color the widget should render with
-    foreground:Optional[QColor]
+    foreground:Optional[Color]
     #: The background color the widget should render with
-    background:Optional[QColor]
-    icon:Optional[QPixmap]
-    __slots__=('foreground','background','icon')
-    
-    def __init__(self, foreground:QColor=None, background:QColor=None, icon:QPixmap=None):
-        self.foreground = foreground
-        self.background = background
+    background:Optional[Color]
+    _icon:Optional[IconBlob]
+    #: Reads the icon the first time it is needed, for styling opened from
+    #: a database
+    _load_icon:Optional[Callable[[], Optional[bytes]]]
+    __slots__=('foreground','background','_icon','_load_icon')
+
+    def __init__(self, foreground:Color=None, background:Color=None, icon:bytes=None):
+        self.foreground = as_color(foreground)
+        self.background = as_color(background)
         self.icon=icon
 
+    @property
+    def icon(self) -> Optional[bytes]:
+        """
+        The contents of a PNG file
+        """
+        blob = self.icon_blob
+        return blob.data if blob is not None else None
+
+    @icon.setter
+    def icon(self, value: Optional[bytes]) -> None:
+        self.icon_blob = IconBlob.from_data(value) if value is not None else None
+
+    @property
+    def icon_blob(self) -> Optional[IconBlob]:
+        """
+        The icon, without decoding it
+        """
+        if self._load_icon is not None:
+            data = self._load_icon()
+            self._icon = IconBlob.from_data(data) if data is not None else None
+            self._load_icon = None
+        return self._icon
+
+    @icon_blob.setter
+    def icon_blob(self, value: Optional[IconBlob]) -> None:
+        self._icon = value
+        self._load_icon = None
+
     def __setstate__(self,state):
-        for slot, value in state.items():
-            setattr(self, slot, value)
-        if 'icon' in state and state['icon']:
-            print(state)
-            ba = QByteArray.fromBase64(QByteArray(state['icon'].encode()))
-            buffer = QBuffer(ba)
-            buffer.open(QIODevice.ReadOnly)
-            pix = QPixmap()
-            pix.loadFromData(ba, 'PNG')
-            self.icon = pix
+        # Older saves pickled QColors
+        self.foreground = as_color(state.get('foreground'))
+        self.background = as_color(state.get('background'))
+        self._load_icon = None
+        if state.get('icon'):
+            self.icon_blob = IconBlob.from_encoded(state['icon'])
+        else:
+            self.icon_blob = None
 
     def __getstate__(self):
-        state = dict((slot, getattr(self, slot))
-                     for slot in self.__slots__
-                     if hasattr(self, slot))
-        if self.icon:
-            ba = QByteArray()
-            buffer = QBuffer(ba)
-            buffer.open(QIODevice.WriteOnly)
-            self.icon.save(buffer, "PNG")
-            state['icon'] = bytes(ba.toBase64()).decode()
+        state = {'foreground': self.foreground, 'background': self.background, 'icon': None}
+        if self.icon_blob is not None:
+            # Categories sharing an icon share the text too, which pickle
+            # then only writes once
+            state['icon'] = self.icon_blob.encoded
 
         return state
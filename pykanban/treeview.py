@@ -1,6 +1,6 @@
 from PySide2.QtWidgets import *
 from PySide2.QtGui import QPaintEvent, QPainter, QPainterPath, QColor
-from PySide2.QtCore import Signal, QTimer, Qt, QEvent
+from PySide2.QtCore import Signal, QTimer, Qt, QEvent, QAbstractListModel, QModelIndex
 from pykanban.kanban import KanbanBoard, KanbanItem, ItemState
 from pykanban.kanbanwidget import KanbanWidget
 from pykanban.abstractview import AbstractView
@@ -11,7 +11,7 @@ class TreeArea(QFrame):
     def __init__(self, parent=None, board=None):
         super(TreeArea, self).__init__(parent)
         self.board = board
-        self.lastLen = 0
+        #: The widget of each item, shared with the TreeView
         self.widgets = {}
         self.active = None
         self.setAttribute(Qt.WA_Hover, True)
@@ -38,16 +38,11 @@ class TreeArea(QFrame):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         offset = 5.0
-        if len(self.board.items) != self.lastLen:
-            self.board.items[0].widget_of(self)
-            self.widgets = {x: x.widget_of(self) for x in self.board.items}
-            self.lastLen = len(self.board.items)
-        else:
-            pass
         widgets = self.widgets
         active = QPainterPath()
-        for i in self.board.items:
-            widget = widgets[i]
+        # Only the items with widgets can have lines drawn, and a read only
+        # board only has widgets for the tree being shown
+        for i, widget in widgets.items():
             widget = widget.parent()
             if not widget.parent().isVisible():
                 continue
@@ -57,7 +52,9 @@ class TreeArea(QFrame):
             # Offset each edge by a different amount for each child
             offmod = 0
             for d in i.depends_on:
-                child: QWidget = widgets[d]
+                child: QWidget = widgets.get(d)
+                if child is None:
+                    continue
                 child = child.parent()
                 if not child.isVisible():
                     continue
@@ -132,6 +129,75 @@ class Collapser(QFrame):
         self.collapseButton.setVisible(show)
 
 
+class ItemListModel(QAbstractListModel):
+    """
+    The items the root of the tree can be chosen from. The names are read
+    from the items as rows are shown, rather than every item being copied
+    into the combobox up front. The item itself is the UserRole data.
+    """
+    #: The items, in the order they are listed
+    items: List[KanbanItem]
+
+    def __init__(self, parent=None):
+        super(ItemListModel, self).__init__(parent)
+        self.items = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.items)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole or role == Qt.EditRole:
+            return self.items[index.row()].name
+        if role == Qt.UserRole:
+            return self.items[index.row()]
+        return None
+
+    def removeRows(self, row: int, count: int, parent=QModelIndex()) -> bool:
+        if parent.isValid() or count <= 0 or row < 0 or row + count > len(self.items):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.items[row:row + count]
+        self.endRemoveRows()
+        return True
+
+    def addItems(self, items: Iterable[KanbanItem]) -> None:
+        items = list(items)
+        if not items:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.items), len(self.items) + len(items) - 1)
+        self.items.extend(items)
+        self.endInsertRows()
+
+    def removeItems(self, items: Container[KanbanItem]) -> None:
+        """
+        Remove the rows of the given items, a run of adjacent rows at a time
+        """
+        row = len(self.items) - 1
+        while row >= 0:
+            if self.items[row] in items:
+                end = row
+                while row > 0 and self.items[row - 1] in items:
+                    row -= 1
+                self.removeRows(row, end - row + 1)
+            row -= 1
+
+    def itemsChanged(self, items: Container[KanbanItem]) -> None:
+        """
+        Have the names of the given items shown again
+        """
+        for row, i in enumerate(self.items):
+            if i in items:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self.items = []
+        self.endResetModel()
+
+
 class TreeView(AbstractView):
     board: KanbanBoard
     #: Association between each kanbanitem and the position assigned by the
@@ -143,6 +209,10 @@ class TreeView(AbstractView):
     completed: Set[KanbanItem]
     #: The combobox uses to select the root of the tree being shown
     itemChoice: QComboBox
+    #: The items listed in the combobox
+    itemModel: ItemListModel
+    #: The widget displaying each item in this view
+    itemWidgets: Dict[KanbanItem, KanbanWidget]
     #: The checkbox which is used to control whether or not completed items
     #: are shown
     hiding_completed: QCheckBox
@@ -162,6 +232,13 @@ class TreeView(AbstractView):
         headerFrame.setLayout(QFormLayout())
 
         self.itemChoice = QComboBox()
+        self.itemModel = ItemListModel(self.itemChoice)
+        self.itemChoice.setModel(self.itemModel)
+        # Sized without measuring every name, and only the rows scrolled to
+        # in the popup are read
+        self.itemChoice.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.itemChoice.setMinimumContentsLength(30)
+        self.itemChoice.view().setUniformItemSizes(True)
         self.itemChoice.currentIndexChanged.connect(self.relayout)
         self.itemChoice.setEditable(True)
         self.itemChoice.setInsertPolicy(QComboBox.NoInsert)
@@ -180,7 +257,9 @@ class TreeView(AbstractView):
 
         root.layout().addWidget(headerFrame)
 
+        self.itemWidgets = {}
         display = TreeArea(self, board)
+        display.widgets = self.itemWidgets
         self.grd = QGridLayout()
         self.grd.setVerticalSpacing(30)
         self.grd.setHorizontalSpacing(30)
@@ -217,15 +296,61 @@ class TreeView(AbstractView):
         return self.extraCompactCheckbox.isChecked()
 
     def addKanbanItem(self, k: KanbanItem) -> None:
+        self.addKanbanItems([k])
+
+    def addKanbanItems(self, items: Iterable[KanbanItem]) -> None:
+        """
+        Add widgets for a number of items, laying the tree out once afterwards.
+        The widgets of a read only board's items are left until they are part
+        of the tree being shown.
+
+        :param items: The items to add
+        """
+        items = list(items)
+        if not self.board.read_only:
+            for k in items:
+                self.makeWidget(k)
+        self.itemModel.addItems(items)
+        if self.finishedAdding:
+            self.relayout(self.itemChoice.currentIndex())
+
+    def makeWidget(self, k: KanbanItem) -> KanbanWidget:
         container = Collapser(self)
         widget = KanbanWidget(container, k)
+        self.itemWidgets[k] = widget
         container.layout().addWidget(widget)
         self.grd.addWidget(container, 0, 0, 1, 1)
         container.setVisible(False)
         container.collapseToggle.connect(self.collapse)
         widget.setMinimumWidth(400)
-        self.itemChoice.addItem(k.name, k)
-        self.itemChoice.setItemData(self.itemChoice.count() - 1, k, 32)
+        return widget
+
+    def itemsRemoved(self, items: Iterable[KanbanItem]) -> None:
+        removed = set(items)
+        self.itemModel.removeItems(removed)
+        self.collapsed.difference_update(removed)
+        shown = False
+        for i in removed:
+            widget = self.itemWidgets.pop(i, None)
+            if widget is not None:
+                shown = shown or widget.parent().isVisible()
+                self.grd.removeWidget(widget.parent())
+                widget.parent().deleteLater()
+        if shown:
+            self.relayout(self.itemChoice.currentIndex())
+
+    def itemFieldsChanged(self, items: Set[KanbanItem]) -> None:
+        """
+        Redisplay edited items, laying the tree out again since their
+        dependencies may have changed.
+
+        :param items: The edited items
+        """
+        self.itemModel.itemsChanged(items)
+        for i in items:
+            widget = self.itemWidgets.get(i)
+            if widget is not None:
+                widget.updateDisplay()
         if self.finishedAdding:
             self.relayout(self.itemChoice.currentIndex())
 
@@ -244,6 +369,16 @@ class TreeView(AbstractView):
         if 'hide_completed' in settings:
             self.hiding_completed.setChecked(settings['hide_completed'])
 
+    def exportGraphViz(self, out: TextIO) -> None:
+        """
+        Write the tree as it is currently shown, from the chosen root and
+        leaving out what is collapsed or hidden, as a GraphViz graph
+
+        :param out: Where to write the graph
+        """
+        root = self.itemChoice.currentData(32)
+        self.board.writeGraphViz(out, root, collapsed=self.collapsed, hide_completed=self.hide_completed)
+
     def collapse(self, collapser: Collapser):
         """
         Handle a widget signalling that it should be collapsed,
@@ -409,6 +544,10 @@ class TreeView(AbstractView):
             return
         self.reposition(item)
         self.check_overlap()
+        if self.board.read_only:
+            for i in self.positions:
+                if i not in self.itemWidgets:
+                    items.append(self.makeWidget(i))
         # Just in case the update takes a long time,
         # Don't draw during this time
         self.display.setUpdatesEnabled(False)
@@ -426,31 +565,41 @@ class TreeView(AbstractView):
         self.determine_efficiency()
         self.positions.clear()
 
-    def widgetChange(self, widget: KanbanWidget, fromState: ItemState, toState: ItemState):
-        # Don't updating the layout unless the widget is visible
-        if widget.item not in self.positions:
-            return
-        self.relayout(self.itemChoice.currentIndex())
+    def itemStatesChanged(self, items: Set[KanbanItem]) -> None:
+        shown = False
+        for i in items:
+            widget = self.itemWidgets.get(i)
+            if widget is not None:
+                widget.updateDisplay()
+                shown = shown or widget.parent().isVisible()
+        if shown and self.hide_completed:
+            self.relayout(self.itemChoice.currentIndex())
 
     def scroll_to_result(self, widget: KanbanWidget):
         self.scrl.ensureWidgetVisible(widget)
 
-    def updateCategories(self):
-        for i in filter(lambda x: len(x.item.category) > 0, self.findChildren(KanbanWidget)):
-            i.updateDisplay()
+    def updateCategories(self, items: Iterable[KanbanItem]):
+        for i in items:
+            widget = self.itemWidgets.get(i)
+            if widget is not None:
+                widget.updateDisplay()
 
     def tabName(self) -> str:
         return "Tree"
 
     def populate(self) -> None:
-        for i in self.board.items:
-            self.addKanbanItem(i)
+        self.addKanbanItems(self.board.items)
         self.relayout(self.itemChoice.currentIndex())
         self.finishedAdding = True
 
     def newBoard(self, board: KanbanBoard) -> None:
-        for i in self.findChildren(KanbanWidget):
-            self.layout().removeWidget(i)
-            i.deleteLater()
+        for i in self.itemWidgets.values():
+            self.grd.removeWidget(i.parent())
+            i.parent().deleteLater()
+        self.itemWidgets.clear()
+        self.collapsed.clear()
+        self.itemModel.clear()
+        self.board = board
+        self.display.board = board
         self.finishedAdding = False
         self.populate()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import *
+
+if TYPE_CHECKING:
+    from pykanban.kanban import KanbanBoard, KanbanItem
+
+
+class ValidationReport:
+    """
+    The problems a validation pass found on a board, and what was done
+    about them
+    """
+    #: Items that were listed more than once, or that shared their id with
+    #: another item and were given a new one
+    duplicates: List[KanbanItem]
+    #: Dependencies on items that aren't on the board, as (item, dependency)
+    dangling: List[Tuple[KanbanItem, KanbanItem]]
+    #: The dependency cycles, as the items that can reach each other, in no
+    #: particular order
+    cycles: List[List[KanbanItem]]
+    #: Categories that have styling but aren't on the board
+    orphaned_categories: List[str]
+    #: The dependencies removed to break the cycles, as (item, dependency)
+    broken: List[Tuple[KanbanItem, KanbanItem]]
+    #: Whether the problems were repaired
+    repaired: bool
+
+    def __init__(self):
+        self.duplicates = []
+        self.dangling = []
+        self.cycles = []
+        self.orphaned_categories = []
+        self.broken = []
+        self.repaired = False
+
+    @property
+    def clean(self) -> bool:
+        """
+        Whether nothing was found
+        """
+        return not (self.duplicates or self.dangling or self.cycles or self.orphaned_categories)
+
+    def describe(self) -> List[str]:
+        """
+        :returns: A line of text for each problem found
+        """
+        lines = [f"Found duplicate: {i.short_name()}" for i in self.duplicates]
+        lines += [f"Found disconnected item: {d.short_name()}, a dependency of {i.short_name()}"
+                  for i, d in self.dangling]
+        # Each cycle is a strongly connected component, which isn't a path
+        lines += ["Found items in a dependency cycle: " + ", ".join(x.short_name() for x in i)
+                  for i in self.cycles]
+        lines += [f"Found styling for missing category: {i}" for i in self.orphaned_categories]
+        lines += [f"Removed dependency of {i.short_name()} on {d.short_name()} to break a cycle"
+                  for i, d in self.broken]
+        return lines
+
+
+def validate(board: KanbanBoard, repair: bool = False) -> ValidationReport:
+    """
+    Check a board for duplicate items, dependencies on items that aren't on
+    the board, dependency cycles and styling for categories that don't
+    exist, in time linear in the number of items and dependencies.
+
+    Repairing removes the dangling dependencies and the orphaned styling,
+    and breaks every cycle at once by removing the dependencies that lead
+    back up a single depth first walk of the board.
+    Duplicates are already resolved when the items are put on the board, so
+    they are only reported. The repairs bypass the undo history, which is
+    cleared, and publish no events, so this is meant for boards that were
+    just loaded.
+
+    :param board: The board to check
+    :param repair: Whether to fix what was found
+    :returns: What was found
+    """
+    report = ValidationReport()
+    report.duplicates = list(board._duplicates)
+    for item in board.items:
+        for d in item.depends_on:
+            if board.get_item(d.id) is not d:
+                report.dangling.append((item, d))
+    report.cycles = board.find_cycles()
+    report.orphaned_categories = [i for i in board.category_data if i not in board.categories]
+    if repair and not report.clean:
+        _repair(board, report)
+    return report
+
+
+def _back_edges(board: KanbanBoard) -> List[Tuple[KanbanItem, KanbanItem]]:
+    """
+    Walk the dependencies of the whole board depth first, once.
+
+    :returns: The dependencies that lead back to an item still being
+        walked, as (item, dependency). Every cycle has at least one, and
+        without them the board has none.
+    """
+    WALKING, DONE = 1, 2
+    status: Dict[KanbanItem, int] = dict()
+    found = []
+    for root in board.items:
+        if root in status:
+            continue
+        status[root] = WALKING
+        work = [(root, iter(root.depends_on))]
+        while work:
+            current, children = work[-1]
+            for i in children:
+                state = status.get(i)
+                if state is None:
+                    status[i] = WALKING
+                    work.append((i, iter(i.depends_on)))
+                    break
+                if state == WALKING:
+                    found.append((current, i))
+            else:
+                status[current] = DONE
+                work.pop()
+    return found
+
+
+def _repair(board: KanbanBoard, report: ValidationReport) -> None:
+    for name in report.orphaned_categories:
+        del board.category_data[name]
+    for item, d in report.dangling:
+        item.depends_on.remove(d)
+    if report.cycles:
+        # Only the items on the board are left to walk, and the edges
+        # found are removed after the walk so it isn't disturbed
+        report.broken = _back_edges(board)
+        removed: Dict[KanbanItem, Set[KanbanItem]] = dict()
+        for item, d in report.broken:
+            removed.setdefault(item, set()).add(d)
+        for item, dependencies in removed.items():
+            item.depends_on = [d for d in item.depends_on if d not in dependencies]
+    if report.dangling or report.cycles:
+        board._rebuild_indexes()
+    board._duplicates = []
+    board.journal.clear()
+    report.repaired = True
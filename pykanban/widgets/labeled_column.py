@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Any, Callable, Container, List, Set
 
 from PySide2.QtCore import Qt
 from PySide2.QtWidgets import QScrollArea, QLabel, QVBoxLayout, QWidget, QPushButton, QFrame
@@ -14,6 +14,19 @@ class LabeledColumn(QScrollArea):
     #: Displays whatever label is assigned
     label: QLabel
     vlayout: QVBoxLayout
+    #: Items shown a page at a time, in order, see :meth:`setPagedItems`
+    pagedItems: List[Any]
+    #: How many of the paged items have widgets so far
+    pagedCount: int
+    #: Positions in the paged items past pagedCount whose widgets were made
+    #: ahead of their page, see :meth:`pageThrough`
+    pagedAhead: Set[int]
+    #: Where the first paged widget is in the layout
+    pagedStart: int
+    #: Makes the widget for each item as it is paged in
+    makePagedWidget: Optional[Callable[[Any], QWidget]]
+    #: How many widgets are made each time the column is scrolled to its end
+    PAGE_SIZE = 40
 
     def __init__(self, text: str, parent: Optional[QWidget] = None):
         super(LabeledColumn, self).__init__(parent)
@@ -43,6 +56,10 @@ class LabeledColumn(QScrollArea):
 
         self.setWidget(frame)
 
+        self.clearPages()
+        self.verticalScrollBar().valueChanged.connect(self.pageIfAtEnd)
+        self.verticalScrollBar().rangeChanged.connect(self.pageIfAtEnd)
+
     def toggleWidgetDisplay(self) -> None:
         self.toggleButton.setText(self.tr("Expand")
                                   if self.widgetPanel.isVisible() else self.tr("Collapse")
@@ -76,6 +93,73 @@ class LabeledColumn(QScrollArea):
         for i in widg:
             self.widgetArea.addWidget(i)
 
+    def setPagedItems(self, items: List[Any], makeWidget: Callable[[Any], QWidget]) -> None:
+        """
+        Show a long list of items a page at a time, only making the widgets
+        for the next page once the column is scrolled close to its end. The
+        items are shown in the order given rather than sorted.
+
+        :param items: The items, in the order they are shown
+        :param makeWidget: Makes the widget for an item
+        """
+        self.pagedItems = items
+        self.pagedCount = 0
+        self.pagedAhead = set()
+        self.pagedStart = self.widgetArea.count()
+        self.makePagedWidget = makeWidget
+        self.loadPage()
+
+    def clearPages(self) -> None:
+        """
+        Forget the items waiting to be paged in
+        """
+        self.pagedItems = []
+        self.pagedCount = 0
+        self.pagedAhead = set()
+        self.pagedStart = 0
+        self.makePagedWidget = None
+
+    def loadPage(self) -> None:
+        """
+        Make the widgets for the next page of items
+        """
+        end = min(self.pagedCount + self.PAGE_SIZE, len(self.pagedItems))
+        for n in range(self.pagedCount, end):
+            if n in self.pagedAhead:
+                # Already in place
+                self.pagedAhead.discard(n)
+            else:
+                self.widgetArea.insertWidget(self.pagedStart + n, self.makePagedWidget(self.pagedItems[n]))
+        self.pagedCount = end
+
+    def pageIfAtEnd(self, *args) -> None:
+        """
+        Load another page if there is one and the column is scrolled to
+        within a screen of its end, or isn't full yet
+        """
+        bar = self.verticalScrollBar()
+        if self.pagedCount < len(self.pagedItems) and bar.value() >= bar.maximum() - bar.pageStep():
+            self.loadPage()
+
+    def pageThrough(self, items: Container[Any]) -> None:
+        """
+        Make the widgets for the given items that are waiting to be paged
+        in, each where it will be once the pages before it are loaded, and
+        leave the rest to be paged in as usual
+
+        :param items: The items that need widgets
+        """
+        # Each widget goes after those of the items before it, which are
+        # the loaded pages and whatever was made ahead of them
+        placed = self.pagedStart + self.pagedCount
+        for n in range(self.pagedCount, len(self.pagedItems)):
+            if n in self.pagedAhead:
+                placed += 1
+            elif self.pagedItems[n] in items:
+                self.widgetArea.insertWidget(placed, self.makePagedWidget(self.pagedItems[n]))
+                self.pagedAhead.add(n)
+                placed += 1
+
     def addWidget(self, widget: QWidget) -> None:
         """
         Add a widget to the area under the label in the column.
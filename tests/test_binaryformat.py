@@ -0,0 +1,110 @@
+import struct
+
+import pytest
+
+from pykanban.binaryformat import BinaryBoardFile, MappedStrings
+from pykanban.kanban import KanbanBoard, KanbanItem, ItemState, Priority
+from pykanban.store import BoardStore
+from pykanban.taskcategory import CategoryData
+
+
+def make_board(tmp_path):
+    board = KanbanBoard()
+    a = KanbanItem("Café ☕", "first", board)
+    b = KanbanItem("b", "holds a \0 in the middle", board, Priority.HIGH)
+    c = KanbanItem("c", "", board, Priority.LOW)
+    # b is added before the item it depends on
+    b.depends_on = [a, c]
+    c.completed = True
+    board.add_items([b, a, c])
+    a.add_category("Backend")
+    b.add_category("Backend")
+    b.add_category("Frontend")
+    board.category_data["Backend"] = CategoryData((1, 2, 3, 255), None, b"\x89PNG")
+    board.category_data["Frontend"] = CategoryData(None, (4, 5, 6, 255), b"\x89PNG")
+    board.view_settings = [{'view': 'tree'}]
+    filename = str(tmp_path / "board.kbb")
+    board.save(filename)
+    return board, filename, a, b, c
+
+
+def describe(board):
+    return [(i.id, i.name, i.description, i.priority, i.completed, sorted(i.category),
+             [d.id for d in i.depends_on]) for i in board.items]
+
+
+def test_round_trip(tmp_path):
+    board, filename, a, b, c = make_board(tmp_path)
+    loaded = KanbanBoard.load(filename)
+    assert describe(loaded) == describe(board)
+    assert loaded.states()[loaded.get_item(b.id)] == ItemState.BLOCKED
+    assert loaded.categories == {"Backend", "Frontend"}
+    assert loaded.category_data["Backend"].foreground == (1, 2, 3, 255)
+    assert loaded.category_data["Frontend"].background == (4, 5, 6, 255)
+    assert loaded.category_data["Frontend"].icon == b"\x89PNG"
+    assert loaded.view_settings == [{'view': 'tree'}]
+
+
+def test_header_only_reads(tmp_path):
+    board, filename, a, b, c = make_board(tmp_path)
+    f = BinaryBoardFile(filename)
+    try:
+        assert len(f) == 3
+        assert list(f.names()) == ["b", "Café ☕", "c"]
+        assert f.item_id(1) == a.id
+        with pytest.raises(IndexError):
+            f.name(3)
+    finally:
+        f.close()
+
+
+def test_rejects_other_files(tmp_path):
+    board, filename, a, b, c = make_board(tmp_path)
+    with open(filename, 'rb') as f:
+        data = bytearray(f.read())
+    short = tmp_path / "short.kbb"
+    short.write_bytes(bytes(data[:10]))
+    with pytest.raises(ValueError):
+        BinaryBoardFile(str(short))
+    later = tmp_path / "later.kbb"
+    struct.pack_into('<H', data, 4, 99)
+    later.write_bytes(bytes(data))
+    with pytest.raises(ValueError):
+        KanbanBoard.load(str(later))
+    other = tmp_path / "other.kbb"
+    other.write_bytes(b'PK' + bytes(data[2:]))
+    with pytest.raises(ValueError):
+        BinaryBoardFile(str(other))
+
+
+def test_mapped_store(tmp_path):
+    board, filename, a, b, c = make_board(tmp_path)
+    store = BoardStore.load(filename, read_only=True)
+    # Only the numbers were read, the strings stay in the mapped file
+    assert isinstance(store.names, MappedStrings) and isinstance(store.descriptions, MappedStrings)
+    assert [i.id for i in store.items] == [b.id, a.id, c.id]
+    assert [i.name for i in store.items] == ["b", "Café ☕", "c"]
+    assert store.get_item(b.id).description == b.description
+    row = store.get_item(b.id)
+    assert [i.id for i in row.depends_on] == [a.id, c.id]
+    assert row.category == {"Backend", "Frontend"}
+    assert store.states()[row] == ItemState.BLOCKED
+    assert store.items_in_category("Backend") == {row, store.get_item(a.id)}
+    assert store.find_matching("cafe") == [store.get_item(a.id)]
+    data = store.category_data["Backend"]
+    assert data._load_icon is not None
+    assert data.icon == b"\x89PNG"
+    assert store.view_settings == [{'view': 'tree'}]
+    assert describe(store.to_board()) == describe(board)
+
+
+def test_mapped_store_is_read_only(tmp_path):
+    board, filename, a, b, c = make_board(tmp_path)
+    store = BoardStore.load(filename, read_only=True)
+    row = store.get_item(a.id)
+    for field, value in (('name', 'renamed'), ('description', 'changed'), ('completed', True),
+                         ('priority', Priority.LOW)):
+        with pytest.raises(ValueError):
+            setattr(row, field, value)
+    assert row.name == "Café ☕"
+    assert not row.completed
@@ -0,0 +1,95 @@
+from pykanban import database
+from pykanban.database import BoardDatabase
+from pykanban.kanban import KanbanBoard, KanbanItem, ItemState, Priority
+from pykanban.taskcategory import CategoryData
+
+
+def make_board(tmp_path):
+    board = KanbanBoard()
+    a = KanbanItem("a", "first", board)
+    b = KanbanItem("b", "second", board, Priority.HIGH)
+    b.depends_on = [a]
+    board.add_items([a, b])
+    b.add_category("Backend")
+    board.category_data["Backend"] = CategoryData((1, 2, 3, 255), None, b"\x89PNG")
+    filename = str(tmp_path / "board.kbdb")
+    board.save(filename)
+    return board, filename, a, b
+
+
+def describe(board):
+    return sorted((i.id, i.name, i.description, i.priority, i.completed, sorted(i.category),
+                   [d.id for d in i.depends_on]) for i in board.items)
+
+
+def test_round_trip(tmp_path):
+    board, filename, a, b = make_board(tmp_path)
+    loaded = KanbanBoard.load(filename)
+    assert describe(loaded) == describe(board)
+    assert loaded.states()[loaded.get_item(b.id)] == ItemState.BLOCKED
+    assert loaded.categories == {"Backend"}
+    assert loaded.category_data["Backend"].foreground == (1, 2, 3, 255)
+
+
+def test_descriptions_are_read_lazily(tmp_path):
+    board, filename, a, b = make_board(tmp_path)
+    loaded = KanbanBoard.load(filename)
+    assert all(i._description is None for i in loaded.items)
+    assert loaded.get_item(b.id).description == "second"
+    assert loaded.get_item(a.id)._description is None
+
+
+def test_icons_are_read_lazily(tmp_path):
+    board, filename, a, b = make_board(tmp_path)
+    loaded = KanbanBoard.load(filename)
+    data = loaded.category_data["Backend"]
+    assert data._load_icon is not None
+    assert data.icon == b"\x89PNG"
+    assert data._load_icon is None
+
+
+def test_unread_fields_survive_saving(tmp_path):
+    board, filename, a, b = make_board(tmp_path)
+    loaded = KanbanBoard.load(filename)
+    loaded.get_item(a.id).name = "renamed"
+    loaded.get_item(a.id).completed = True
+    loaded.category_data["Backend"].foreground = (4, 5, 6, 255)
+    loaded.category_styled(["Backend"])
+    loaded.save(filename)
+    again = KanbanBoard.load(filename)
+    assert again.get_item(a.id).description == "first"
+    assert again.get_item(a.id).name == "renamed"
+    assert again.states()[again.get_item(b.id)] == ItemState.AVAILABLE
+    assert again.category_data["Backend"].icon == b"\x89PNG"
+    assert again.category_data["Backend"].foreground == (4, 5, 6, 255)
+
+
+def test_changes_are_saved(tmp_path):
+    board, filename, a, b = make_board(tmp_path)
+    c = KanbanItem("c", "third", board)
+    board.add_item(c)
+    board.remove_item(a)
+    b.description = "changed"
+    board.save(filename)
+    loaded = KanbanBoard.load(filename)
+    assert describe(loaded) == describe(board)
+    assert loaded.get_item(a.id) is None
+
+
+def test_read_descriptions_in_batches(tmp_path, monkeypatch):
+    board = KanbanBoard()
+    items = [KanbanItem(f"item {i}", f"description {i}", board) for i in range(10)]
+    board.add_items(items)
+    filename = str(tmp_path / "board.kbdb")
+    board.save(filename)
+    monkeypatch.setattr(database, '_BATCH_SIZE', 3)
+    wanted = [i.id for i in items[1:]] + ["missing"]
+    assert BoardDatabase.read_descriptions(filename, wanted) == {i.id: i.description for i in items[1:]}
+
+
+def test_search_index_reads_descriptions_together(tmp_path, monkeypatch):
+    board, filename, a, b = make_board(tmp_path)
+    loaded = KanbanBoard.load(filename)
+    monkeypatch.setattr(BoardDatabase, 'description', None)
+    assert loaded.build_search_index()
+    assert set(loaded.search_candidates("second")) == {loaded.get_item(b.id)}
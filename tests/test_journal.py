@@ -0,0 +1,93 @@
+from pykanban.kanban import KanbanBoard, KanbanItem, ItemState
+
+
+def make_board():
+    board = KanbanBoard()
+    x = KanbanItem("x", "", board)
+    y = KanbanItem("y", "", board)
+    board.add_items([x, y])
+    board.journal.clear()
+    return board, x, y
+
+
+def test_field_edits_merge():
+    board, x, y = make_board()
+    for name in ("a", "ab", "abc"):
+        x.name = name
+    assert len(board.journal._undo) == 1
+    assert board.journal.undo()
+    assert x.name == "x"
+    assert not board.journal.can_undo()
+    assert board.journal.redo()
+    assert x.name == "abc"
+
+
+def test_field_edits_on_other_fields_do_not_merge():
+    board, x, y = make_board()
+    x.name = "a"
+    x.description = "b"
+    y.name = "c"
+    assert len(board.journal._undo) == 3
+
+
+def test_field_edits_cancelling_out_leave_no_step():
+    board, x, y = make_board()
+    x.name = "a"
+    x.name = "x"
+    assert not board.journal.can_undo()
+
+
+def test_no_merge_after_undo():
+    board, x, y = make_board()
+    x.name = "a"
+    y.name = "b"
+    board.journal.undo()
+    x.name = "c"
+    assert len(board.journal._undo) == 2
+    board.journal.undo()
+    assert x.name == "a"
+
+
+def test_depth_limit():
+    board, x, y = make_board()
+    board.journal.depth = 3
+    for i in range(5):
+        x.name = str(i)
+        y.name = str(i)
+    assert len(board.journal._undo) == 3
+    while board.journal.undo():
+        pass
+    # Only the last three of the ten steps are remembered
+    assert (x.name, y.name) == ("3", "2")
+    board.journal.depth = 2
+    assert len(board.journal._redo) == 2
+
+
+def test_undo_redo_batch():
+    board, x, y = make_board()
+    with board.batch():
+        z = KanbanItem("z", "", board)
+        board.add_item(z)
+        board.add_dependency(x, z)
+        y.completed = True
+        x.name = "renamed"
+    assert len(board.journal._undo) == 1
+    assert board.journal.undo()
+    assert z not in board.items
+    assert x.depends_on == []
+    assert (x.name, y.completed) == ("x", False)
+    assert not board.journal.can_undo()
+    assert board.journal.redo()
+    assert z in board.items
+    assert x.depends_on == [z]
+    assert board.states()[x] == ItemState.BLOCKED
+    assert (x.name, y.completed) == ("renamed", True)
+    assert not board.journal.can_redo()
+
+
+def test_new_edit_clears_redo():
+    board, x, y = make_board()
+    x.name = "a"
+    board.journal.undo()
+    y.name = "b"
+    assert not board.journal.can_redo()
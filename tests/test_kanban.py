@@ -0,0 +1,38 @@
+from pykanban.kanban import KanbanBoard, KanbanItem, ItemState
+
+
+def make_forward_reference():
+    board = KanbanBoard()
+    x = KanbanItem("x", "", board)
+    y = KanbanItem("y", "", board)
+    # x is added before the item it depends on
+    x.depends_on = [y]
+    board.add_items([x, y])
+    return board, x, y
+
+
+def test_forward_reference_is_indexed():
+    board, x, y = make_forward_reference()
+    assert board.dependents_of(y) == [x]
+    assert board.states()[x] == ItemState.BLOCKED
+
+
+def test_forward_reference_unblocks_on_completion():
+    board, x, y = make_forward_reference()
+    y.completed = True
+    assert board.states()[x] == ItemState.AVAILABLE
+    assert x in board.items_in_state(ItemState.AVAILABLE)
+
+
+def test_forward_reference_removed_with_dependency():
+    board, x, y = make_forward_reference()
+    board.remove_item(y)
+    assert x.depends_on == []
+    assert board.states()[x] == ItemState.AVAILABLE
+
+
+def test_forward_reference_cycle_check():
+    board, x, y = make_forward_reference()
+    assert board.would_create_cycle(y, x)
+    assert not board.would_create_cycle(x, y)
+    assert board.topological_order() == [y, x]
@@ -0,0 +1,88 @@
+import pytest
+
+from pykanban.kanban import KanbanBoard, KanbanItem, ItemState, Priority
+from pykanban.query import Query, Term, TextTerm, CategoryTerm, StateTerm, PriorityTerm
+
+
+def make_board():
+    board = KanbanBoard()
+    design = KanbanItem("Design the schema", "Tables for the items", board, Priority.HIGH)
+    build = KanbanItem("Build the café menu", "", board, Priority.LOW)
+    build.depends_on = [design]
+    done = KanbanItem("Write release notes", "done before launch", board)
+    done.completed = True
+    board.add_items([design, build, done])
+    design.add_category("Backend")
+    return board, design, build, done
+
+
+def test_term_is_abstract():
+    with pytest.raises(TypeError):
+        Term()
+
+
+def test_parse_words():
+    query = Query.parse("design  schema")
+    assert [type(i) for i in query.terms] == [TextTerm, TextTerm]
+    assert [i.text for i in query.terms] == ["design", "schema"]
+    assert not any(i.negated for i in query.terms)
+    assert Query.parse("   ").is_empty()
+
+
+def test_parse_quoted_value():
+    query = Query.parse('"the schema" -"release notes" category:"Front end"')
+    assert [i.text for i in query.terms[:2]] == ["the schema", "release notes"]
+    assert not query.terms[0].negated
+    assert query.terms[1].negated
+    assert isinstance(query.terms[2], CategoryTerm)
+    assert query.terms[2].category == "front end"
+
+
+def test_parse_unclosed_quote():
+    query = Query.parse('"the schema')
+    assert [i.text for i in query.terms] == ["the schema"]
+
+
+def test_parse_field_qualifiers():
+    category, state, priority = Query.parse("Category:backend state:TODO priority:high").terms
+    assert isinstance(category, CategoryTerm) and category.category == "backend"
+    assert isinstance(state, StateTerm) and state.state == ItemState.AVAILABLE
+    assert isinstance(priority, PriorityTerm) and priority.priority == Priority.HIGH
+
+
+def test_parse_unknown_field_is_text():
+    terms = Query.parse("owner:me -state:sleeping").terms
+    assert [type(i) for i in terms] == [TextTerm, TextTerm]
+    assert [i.text for i in terms] == ["owner:me", "state:sleeping"]
+    assert terms[1].negated
+
+
+def test_parse_negated_done():
+    # A bare -done excludes the word, only -state:done excludes by state
+    word, = Query.parse("-done").terms
+    assert isinstance(word, TextTerm) and word.negated and word.text == "done"
+    state, = Query.parse("-state:done").terms
+    assert isinstance(state, StateTerm) and state.negated and state.state == ItemState.COMPLETED
+
+
+def test_evaluate():
+    board, design, build, done = make_board()
+    assert Query.parse("the").evaluate(board) == {design, build}
+    assert Query.parse("-done").evaluate(board) == {design, build}
+    assert Query.parse("-state:done").evaluate(board) == {design, build}
+    assert Query.parse("state:blocked").evaluate(board) == {build}
+    assert Query.parse("category:BACKEND").evaluate(board) == {design}
+    assert Query.parse("priority:low cafe").evaluate(board) == {build}
+    assert Query.parse('"release notes" -priority:medium').evaluate(board) == set()
+
+
+def test_evaluate_follows_edits():
+    board, design, build, done = make_board()
+    query = Query.parse("state:available tables")
+    assert query.evaluate(board) == {design}
+    design.description = ""
+    assert query.evaluate(board) == set()
+    design.name = "Design the tables"
+    assert query.evaluate(board) == {design}
+    design.completed = True
+    assert query.evaluate(board) == set()
@@ -0,0 +1,86 @@
+import os
+
+from pykanban.kanban import KanbanBoard, KanbanItem, ItemState, Priority
+from pykanban.taskcategory import CategoryData
+
+
+def make_board(tmp_path):
+    board = KanbanBoard()
+    a = KanbanItem("a", "first", board)
+    b = KanbanItem("b", "second", board, Priority.HIGH)
+    b.depends_on = [a]
+    board.add_items([a, b])
+    # Enough of a snapshot that a few small saves are appended to it
+    board.add_items([KanbanItem(f"filler {i}", "", board) for i in range(20)])
+    b.add_category("Backend")
+    board.category_data["Backend"] = CategoryData((1, 2, 3, 255), None, b"\x89PNG")
+    filename = str(tmp_path / "board.kblog")
+    board.save(filename)
+    return board, filename, a, b
+
+
+def lines(filename):
+    with open(filename, 'rb') as f:
+        return f.read().count(b'\n')
+
+
+def describe(board):
+    return sorted((i.id, i.name, i.description, i.priority, i.completed, sorted(i.category),
+                   [d.id for d in i.depends_on]) for i in board.items)
+
+
+def test_round_trip(tmp_path):
+    board, filename, a, b = make_board(tmp_path)
+    loaded = KanbanBoard.load(filename)
+    assert describe(loaded) == describe(board)
+    assert loaded.categories == {"Backend"}
+    assert loaded.category_data["Backend"].foreground == (1, 2, 3, 255)
+    assert loaded.category_data["Backend"].icon == b"\x89PNG"
+    assert loaded.states()[loaded.get_item(b.id)] == ItemState.BLOCKED
+
+
+def test_saves_are_appended(tmp_path):
+    board, filename, a, b = make_board(tmp_path)
+    a.completed = True
+    board.save(filename)
+    c = KanbanItem("c", "third", board)
+    board.add_item(c)
+    board.remove_item(b)
+    board.save(filename)
+    assert lines(filename) == 3
+    loaded = KanbanBoard.load(filename)
+    assert describe(loaded) == describe(board)
+    # The loaded board keeps appending to the log
+    loaded.get_item(c.id).name = "renamed"
+    loaded.save(filename)
+    assert lines(filename) == 4
+    assert KanbanBoard.load(filename).get_item(c.id).name == "renamed"
+
+
+def test_compaction(tmp_path):
+    board, filename, a, b = make_board(tmp_path)
+    saves = 0
+    while lines(filename) > saves:
+        saves = lines(filename)
+        a.description += "more text "
+        board.save(filename)
+    # The appended saves outgrew the snapshot, so it was written afresh
+    assert lines(filename) == 1
+    assert not os.path.exists(filename + '.tmp')
+    log = board._savers[filename]
+    assert log._size == log._base_size == os.path.getsize(filename)
+    assert describe(KanbanBoard.load(filename)) == describe(board)
+
+
+def test_truncated_save_is_ignored(tmp_path):
+    board, filename, a, b = make_board(tmp_path)
+    a.name = "kept"
+    board.save(filename)
+    with open(filename, 'ab') as f:
+        f.write(b'{"__kanbanupdate__": true, "items": [')
+    loaded = KanbanBoard.load(filename)
+    assert loaded.get_item(a.id).name == "kept"
+    # The next save rewrites the file rather than appending after the damage
+    loaded.save(filename)
+    assert lines(filename) == 1
+    assert describe(KanbanBoard.load(filename)) == describe(board)
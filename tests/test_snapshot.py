@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from pykanban.kanban import KanbanBoard, KanbanItem, Priority
+from pykanban.snapshot import BoardSnapshot, save_snapshot
+from pykanban.taskcategory import CategoryData
+
+
+def make_board():
+    board = KanbanBoard()
+    a = KanbanItem("a", "first", board)
+    b = KanbanItem("b", "second", board, Priority.HIGH)
+    b.depends_on = [a]
+    board.add_items([a, b])
+    b.add_category("Backend")
+    board.category_data["Backend"] = CategoryData((1, 2, 3, 255), None, b"\x89PNG")
+    return board, a, b
+
+
+def describe(board):
+    return sorted((i.id, i.name, i.description, i.priority, i.completed, sorted(i.category),
+                   [d.id for d in i.depends_on]) for i in board.items)
+
+
+def test_snapshot_ignores_later_edits():
+    board, a, b = make_board()
+    before = describe(board)
+    snapshot = BoardSnapshot(board)
+    a.name = "renamed"
+    b.completed = True
+    board.add_item(KanbanItem("c", "third", board))
+    board.remove_item(a)
+    copy = snapshot.to_board()
+    assert describe(copy) == before
+    assert copy.category_data["Backend"].icon == b"\x89PNG"
+    assert describe(BoardSnapshot(board).to_board()) == describe(board)
+
+
+def test_snapshots_share_records():
+    board, a, b = make_board()
+    first = BoardSnapshot(board)
+    second = BoardSnapshot(board)
+    assert first.items is second.items
+    a.name = "renamed"
+    third = BoardSnapshot(board)
+    assert third.items is not first.items
+    assert first.items[a.id][1] == "a"
+    assert third.items[a.id][1] == "renamed"
+    # Records that didn't change are the same objects
+    assert third.items[b.id] is first.items[b.id]
+
+
+def test_replacing_items_starts_over():
+    board, a, b = make_board()
+    BoardSnapshot(board)
+    board.items = [a]
+    assert describe(BoardSnapshot(board).to_board()) == describe(board)
+
+
+@pytest.mark.parametrize('extension', ['.kb', '.kb.json', '.kblog', '.kbdb'])
+def test_save_snapshot(tmp_path, extension):
+    board, a, b = make_board()
+    filename = str(tmp_path / ("board" + extension + ".bak"))
+    save_snapshot(BoardSnapshot(board), filename)
+    assert os.listdir(str(tmp_path)) == [os.path.basename(filename)]
+    loaded = KanbanBoard.load(filename)
+    assert describe(loaded) == describe(board)
+    assert loaded.category_data["Backend"].icon == b"\x89PNG"
+    for i in loaded._savers.values():
+        i.close()
+
+
+def test_snapshot_of_database_reads_unread_descriptions(tmp_path):
+    board, a, b = make_board()
+    filename = str(tmp_path / "board.kbdb")
+    board.save(filename)
+    loaded = KanbanBoard.load(filename)
+    snapshot = BoardSnapshot(loaded)
+    assert set(snapshot.unread) == {a.id, b.id}
+    # The row is gone by the time the snapshot is written, the description
+    # read when it was removed is used instead
+    loaded.remove_item(loaded.get_item(a.id))
+    loaded.save(filename)
+    save_snapshot(snapshot, filename + '.bak')
+    assert describe(KanbanBoard.load(filename + '.bak')) == describe(board)
+    # Nothing was read into the board for the snapshot
+    assert loaded.get_item(b.id)._description is None
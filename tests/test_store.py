@@ -0,0 +1,36 @@
+import pytest
+
+from pykanban.kanban import KanbanBoard, KanbanItem, ItemState
+from pykanban.store import BoardStore
+
+
+def make_store(tmp_path, extension, read_only):
+    board = KanbanBoard()
+    a = KanbanItem("a", "first", board)
+    b = KanbanItem("b", "second", board)
+    b.depends_on = [a]
+    board.add_items([a, b])
+    filename = str(tmp_path / ("board" + extension))
+    board.save(filename)
+    return BoardStore.load(filename, read_only=read_only)
+
+
+@pytest.mark.parametrize('extension', ['.kbb', '.kb.json'])
+def test_read_only_store_rejects_edits(tmp_path, extension):
+    store = make_store(tmp_path, extension, True)
+    item = store.items[0]
+    for field, value in (('name', 'renamed'), ('description', 'changed'), ('completed', True)):
+        with pytest.raises(ValueError):
+            setattr(item, field, value)
+    assert item.name == 'a'
+    assert item.description == 'first'
+    assert store.states()[store.items[1]] == ItemState.BLOCKED
+
+
+def test_writable_store_accepts_edits(tmp_path):
+    store = make_store(tmp_path, '.kb.json', False)
+    store.items[0].completed = True
+    store.items[0].name = 'renamed'
+    assert store.states()[store.items[1]] == ItemState.AVAILABLE
+    assert store.find_matching('renamed') == [store.items[0]]
+    assert store.blockers_of(store.items[1]) == []